@@ -3175,6 +3175,10 @@ SOURCE=.\src\map\mapper\mapperRefs.c
 # End Source File
 # Begin Source File
 
+SOURCE=.\src\map\mapper\mapperScore.c
+# End Source File
+# Begin Source File
+
 SOURCE=.\src\map\mapper\mapperSuper.c
 # End Source File
 # Begin Source File
@@ -3927,6 +3931,14 @@ SOURCE=.\src\misc\util\utilNam.h
 # End Source File
 # Begin Source File
 
+SOURCE=.\src\misc\util\utilNpy.c
+# End Source File
+# Begin Source File
+
+SOURCE=.\src\misc\util\utilNpy.h
+# End Source File
+# Begin Source File
+
 SOURCE=.\src\misc\util\utilSignal.c
 # End Source File
 # Begin Source File
@@ -547,6 +547,7 @@ extern Abc_Ntk_t * Abc_NtkFromAigPhase( Aig_Man_t * pMan );
 extern int Abc_Command_Cunxi_Matrix               ( Abc_Frame_t * pAbc, int argc, char ** argv );
 static int Abc_CommandPrepareMap                  ( Abc_Frame_t * pAbc, int argc, char ** argv );
 static int Abc_CommandReadCuts                           ( Abc_Frame_t * pAbc, int argc, char ** argv );
+static int Abc_CommandMapScore                           ( Abc_Frame_t * pAbc, int argc, char ** argv );
 
 extern int Abc_Command_Cunxi_MatrixGia            ( Abc_Frame_t * pAbc, int argc, char ** argv );
 
@@ -1242,6 +1243,7 @@ void Abc_Init( Abc_Frame_t * pAbc )
     Cmd_CommandAdd( pAbc, "Cunxi's commands",     "edgelist",     Abc_Command_Cunxi_Matrix,              0 );
     Cmd_CommandAdd( pAbc, "SC mapping", "prepare_map", Abc_CommandPrepareMap, 0);
     Cmd_CommandAdd( pAbc, "SC mapping", "read_cuts",   Abc_CommandReadCuts, 0);
+    Cmd_CommandAdd( pAbc, "SC mapping", "ml_map",      Abc_CommandMapScore, 1);
     Cmd_CommandAdd( pAbc, "Cunxi's commands",     "&edgelist",     Abc_Command_Cunxi_MatrixGia,              0 );
     {
 //        extern Mf_ManTruthCount();
@@ -45362,8 +45364,10 @@ int Abc_CommandPrepareMap( Abc_Frame_t * pAbc, int argc, char ** argv ){
     char * nodesFile = "";
     int featFlag = 0; 
     int file = 0; 
+    int nSigDepth = 6;
+    int nThreads = 1;
     Extra_UtilGetoptReset();
-    while ( ( c = Extra_UtilGetopt( argc, argv, "hfFn" ) ) != EOF )
+    while ( ( c = Extra_UtilGetopt( argc, argv, "hfFnDP" ) ) != EOF )
     {
         switch ( c )
         {
@@ -45395,6 +45399,28 @@ int Abc_CommandPrepareMap( Abc_Frame_t * pAbc, int argc, char ** argv ){
                 nodesFile = argv[globalUtilOptind];
                 globalUtilOptind++;
                 break;
+            case 'D':
+                if ( globalUtilOptind >= argc )
+                {
+                    Abc_Print( -1, "Command line switch \"-D\" should be followed by an integer.\n" );
+                    goto usage;
+                }
+                nSigDepth = atoi(argv[globalUtilOptind]);
+                globalUtilOptind++;
+                if ( nSigDepth < 0 )
+                    goto usage;
+                break;
+            case 'P':
+                if ( globalUtilOptind >= argc )
+                {
+                    Abc_Print( -1, "Command line switch \"-P\" should be followed by an integer.\n" );
+                    goto usage;
+                }
+                nThreads = atoi(argv[globalUtilOptind]);
+                globalUtilOptind++;
+                if ( nThreads <= 0 )
+                    goto usage;
+                break;
             default:
                 goto usage;
         }
@@ -45416,15 +45442,18 @@ int Abc_CommandPrepareMap( Abc_Frame_t * pAbc, int argc, char ** argv ){
             }
         }
         // //Gia_EdgelistGraphSAGE(pAbc->pGia, Filename);
-        extern int Abc_prepareMap(Abc_Ntk_t * pNtk, char * filename, char *fileFeat, char *nodes);
-        int res = Abc_prepareMap(pNtk, Filename, featFile, nodesFile);
+        extern int Abc_prepareMap(Abc_Ntk_t * pNtk, char * filename, char *fileFeat, char *nodes, int nSigDepth, int nThreads);
+        int res = Abc_prepareMap(pNtk, Filename, featFile, nodesFile, nSigDepth, nThreads);
         if (res == 1) {
             return 1;
         }
         else return 0;
     }
 usage:
-    Abc_Print( -2, "usage: prepare_map <your_file>.csv:  Generates astructure\n" );
+    Abc_Print( -2, "usage: prepare_map -f <cut_table> -F <features> -n <node_embed> [-D num] [-P num]\n" );
+    Abc_Print( -2, "\t         dumps cuts, cut features and node embedding for ML-guided mapping\n" );
+    Abc_Print( -2, "\t-D num : depth of the fanin cone hashed into node signatures [default = %d]\n", nSigDepth );
+    Abc_Print( -2, "\t-P num : number of threads extracting features [default = %d]\n", nThreads );
     return 0;
 }   
 
@@ -45437,9 +45466,10 @@ int Abc_CommandReadCuts( Abc_Frame_t * pAbc, int argc, char ** argv ){
     }
     int c=0;
     char * Filename = "";
+    char * cutFile = NULL;
     int file = 0; 
     Extra_UtilGetoptReset();
-    while ( ( c = Extra_UtilGetopt( argc, argv, "hf" ) ) != EOF )
+    while ( ( c = Extra_UtilGetopt( argc, argv, "hfc" ) ) != EOF )
     {
         switch ( c )
         {
@@ -45454,6 +45484,14 @@ int Abc_CommandReadCuts( Abc_Frame_t * pAbc, int argc, char ** argv ){
                 globalUtilOptind++;
                 file = 1;
                 break;
+            case 'c':
+                if ( globalUtilOptind >= argc )
+                {
+                    goto usage;
+                }
+                cutFile = argv[globalUtilOptind];
+                globalUtilOptind++;
+                break;
             default:
                 goto usage;
         }
@@ -45475,8 +45513,8 @@ int Abc_CommandReadCuts( Abc_Frame_t * pAbc, int argc, char ** argv ){
             }
         }
         // //Gia_EdgelistGraphSAGE(pAbc->pGia, Filename);
-        extern int Abc_readCuts(Abc_Ntk_t * pNtk, char * filename);
-        Abc_Ntk_t * pNtkRes = Abc_readCuts(pNtk, Filename);
+        extern Abc_Ntk_t * Abc_readCuts(Abc_Ntk_t * pNtk, char * filename, char * cutFile);
+        Abc_Ntk_t * pNtkRes = Abc_readCuts(pNtk, Filename, cutFile);
         if ( pNtkRes == NULL )
         {
             Abc_Print( -1, "Mapping has failed.\n" );
@@ -45497,12 +45535,122 @@ int Abc_CommandReadCuts( Abc_Frame_t * pAbc, int argc, char ** argv ){
         // replace the current network
         Abc_FrameReplaceCurrentNetwork( pAbc, pNtkRes );
         //return 1;
+        return 0;
     } 
 usage:
-    //Abc_Print( -2, "usage: read_cuts <your_file>.txt: Reads cut to be used during tech-mapping\n" );
+    Abc_Print( -2, "usage: read_cuts -f <selected_cuts> [-c <cut_table>]\n" );
+    Abc_Print( -2, "\t         maps using the cuts selected for each node\n" );
+    Abc_Print( -2, "\t-c file : cut table dumped by prepare_map, prunes cut enumeration to the selected cuts\n" );
     return 0;
 }
 
+int Abc_CommandMapScore( Abc_Frame_t * pAbc, int argc, char ** argv ){
+    extern Abc_Ntk_t * Abc_NtkMapScore( Abc_Ntk_t * pNtk, char * pWeightFile, int nBatch, int GoodClass, int FairClass, int fPrune, int fVerbose );
+    Abc_Ntk_t * pNtk = Abc_FrameReadNtk(pAbc);
+    Abc_Ntk_t * pNtkRes;
+    char * pWeightFile = NULL;
+    int nBatch = 1024, GoodClass = 3, FairClass = 6, fPrune = 0, fVerbose = 0;
+    int c;
+    Extra_UtilGetoptReset();
+    while ( ( c = Extra_UtilGetopt( argc, argv, "wBGFpvh" ) ) != EOF )
+    {
+        switch ( c )
+        {
+            case 'w':
+                if ( globalUtilOptind >= argc )
+                {
+                    Abc_Print( -1, "Command line switch \"-w\" should be followed by a file name.\n" );
+                    goto usage;
+                }
+                pWeightFile = argv[globalUtilOptind];
+                globalUtilOptind++;
+                break;
+            case 'B':
+                if ( globalUtilOptind >= argc )
+                {
+                    Abc_Print( -1, "Command line switch \"-B\" should be followed by an integer.\n" );
+                    goto usage;
+                }
+                nBatch = atoi(argv[globalUtilOptind]);
+                globalUtilOptind++;
+                if ( nBatch <= 0 )
+                    goto usage;
+                break;
+            case 'G':
+                if ( globalUtilOptind >= argc )
+                {
+                    Abc_Print( -1, "Command line switch \"-G\" should be followed by an integer.\n" );
+                    goto usage;
+                }
+                GoodClass = atoi(argv[globalUtilOptind]);
+                globalUtilOptind++;
+                break;
+            case 'F':
+                if ( globalUtilOptind >= argc )
+                {
+                    Abc_Print( -1, "Command line switch \"-F\" should be followed by an integer.\n" );
+                    goto usage;
+                }
+                FairClass = atoi(argv[globalUtilOptind]);
+                globalUtilOptind++;
+                break;
+            case 'p':
+                fPrune ^= 1;
+                break;
+            case 'v':
+                fVerbose ^= 1;
+                break;
+            case 'h':
+                goto usage;
+            default:
+                goto usage;
+        }
+    }
+    if ( pNtk == NULL )
+    {
+        Abc_Print( -1, "Empty network.\n" );
+        return 1;
+    }
+    if ( pWeightFile == NULL )
+    {
+        Abc_Print( -1, "Need a file with CNN weights exported by step2_exportCNN.py.\n" );
+        goto usage;
+    }
+    if ( !Abc_NtkIsStrash(pNtk) )
+    {
+        pNtk = Abc_NtkStrash( pNtk, 0, 0, 0 );
+        if ( pNtk == NULL )
+        {
+            Abc_Print( -1, "Strashing before mapping has failed.\n" );
+            return 1;
+        }
+        pNtkRes = Abc_NtkMapScore( pNtk, pWeightFile, nBatch, GoodClass, FairClass, fPrune, fVerbose );
+        Abc_NtkDelete( pNtk );
+    }
+    else
+        pNtkRes = Abc_NtkMapScore( pNtk, pWeightFile, nBatch, GoodClass, FairClass, fPrune, fVerbose );
+    if ( pNtkRes == NULL )
+    {
+        Abc_Print( -1, "Mapping has failed.\n" );
+        return 1;
+    }
+    // replace the current network
+    Abc_FrameReplaceCurrentNetwork( pAbc, pNtkRes );
+    return 0;
+
+usage:
+    Abc_Print( -2, "usage: ml_map -w <weights> [-BGF num] [-pvh]\n" );
+    Abc_Print( -2, "\t         maps using the cuts selected by a CNN scored in memory\n" );
+    Abc_Print( -2, "\t-w file : CNN weights exported by step2_exportCNN.py\n" );
+    Abc_Print( -2, "\t-B num  : number of cuts scored in one batch [default = %d]\n", nBatch );
+    Abc_Print( -2, "\t-G num  : largest class of cuts always selected [default = %d]\n", GoodClass );
+    Abc_Print( -2, "\t-F num  : largest class of cuts selected while the node has at most one cut [default = %d]\n", FairClass );
+    Abc_Print( -2, "\t-p      : toggles pruning cut enumeration to the selected cuts [default = %s]\n", fPrune? "yes": "no" );
+    Abc_Print( -2, "\t-v      : toggles verbose output [default = %s]\n", fVerbose? "yes": "no" );
+    Abc_Print( -2, "\t-h      : print the command usage\n");
+    return 1;
+}
+
 int Abc_Command_Cunxi_MatrixGia( Abc_Frame_t * pAbc, int argc, char ** argv ){
     if (pAbc->pGia == NULL){
         printf("There is no AIG\n");
@@ -45514,8 +45662,9 @@ int Abc_Command_Cunxi_MatrixGia( Abc_Frame_t * pAbc, int argc, char ** argv ){
     int classFile=0;
     int featFile=0;
     char * Filename, * Filename2, *Filename3, *Filename4;
+    char * pCsrPrefix = NULL;
     Extra_UtilGetoptReset();
-    while ( ( c = Extra_UtilGetopt( argc, argv, "hfcF" ) ) != EOF )
+    while ( ( c = Extra_UtilGetopt( argc, argv, "hfcFC" ) ) != EOF )
     {
         switch ( c )
         {
@@ -45548,12 +45697,24 @@ int Abc_Command_Cunxi_MatrixGia( Abc_Frame_t * pAbc, int argc, char ** argv ){
                 Filename3 = argv[globalUtilOptind];
                 globalUtilOptind++;
                 break;
+            case 'C':
+                if ( globalUtilOptind >= argc )
+                {
+                    goto usage;
+                }
+                pCsrPrefix = argv[globalUtilOptind];
+                globalUtilOptind++;
+                break;
 
 
             default:
                 goto usage;
         }
     }
+    if ( pCsrPrefix && !Gia_EdgelistCsr(pAbc->pGia, pCsrPrefix) )
+        return 1;
+    if ( pCsrPrefix && matrixFile != 1 )
+        return 0;
     if(matrixFile != 1)
     {
         Abc_Print(-1, "Need a output file for dump edgelist.el\n");
@@ -45577,6 +45738,8 @@ int Abc_Command_Cunxi_MatrixGia( Abc_Frame_t * pAbc, int argc, char ** argv ){
     }
 usage:
     Abc_Print( -2, "usage: &edgelist -F test.el -c test-class_map.json -f test-feats.csv:  Generate dataset for GraphSAGE with Gia datastructure\n" );
+    Abc_Print( -2, "\t-C prefix : also writes the graph in CSR format as prefix_{offsets,indices,fanins,ids}.npy\n" );
+    Abc_Print( -2, "\t            (rows in the order of the mapper nodes; -C alone writes only the CSR graph)\n" );
 
 
     return 0;
@@ -45591,8 +45754,10 @@ int Abc_Command_Cunxi_Matrix( Abc_Frame_t * pAbc, int argc, char ** argv ){
     int featFile=0;
     char * Filename, * Filename2, *Filename3;
     int logic_netlist2edgelist = 0;
+    char * pCsrPrefix = NULL;
+    extern int Abc_NtkMapCsrWrite( Abc_Ntk_t * pNtk, char * pPrefix );
     Extra_UtilGetoptReset();
-    while ( ( c = Extra_UtilGetopt( argc, argv, "hfcFL" ) ) != EOF )
+    while ( ( c = Extra_UtilGetopt( argc, argv, "hfcFLC" ) ) != EOF )
     {
         switch ( c )
         {
@@ -45632,10 +45797,22 @@ int Abc_Command_Cunxi_Matrix( Abc_Frame_t * pAbc, int argc, char ** argv ){
                 }
                 logic_netlist2edgelist ^= 1;
                 break;
+            case 'C':
+                if ( globalUtilOptind >= argc )
+                {
+                    goto usage;
+                }
+                pCsrPrefix = argv[globalUtilOptind];
+                globalUtilOptind++;
+                break;
             default:
                 goto usage;
         }
     }
+    if ( pCsrPrefix && !Abc_NtkMapCsrWrite(pNtk, pCsrPrefix) )
+        return 1;
+    if ( pCsrPrefix && matrixFile != 1 )
+        return 0;
     if(logic_netlist2edgelist ==1){
         if(matrixFile!=1){
             Abc_Print(-1, "Need a el file for dump edgelist of logic netlist\n");
@@ -45673,12 +45850,16 @@ usage:
     Abc_Print( -2, "\t-c : Class map for corresponding edgelist (Only for GraphSAGE; must has -F -c -f all enabled)\n ");
     Abc_Print( -2, "\t-f : Features of nodes (Only for GraphSAGE; must has -F -c -f all enabled)\n ");
     Abc_Print( -2, "\t-L : Switch to logic netlist without labels (such as AIG and LUT-netlist)\n ");
+    Abc_Print( -2, "\t-C : Prefix of the graph in CSR format (prefix_offsets.npy, prefix_indices.npy, prefix_fanins.npy, prefix_ids.npy);\n ");
+    Abc_Print( -2, "\t     rows follow the mapper node order, so the rows of an AIG match the eid of prepare_map -n; -C alone writes only the CSR graph\n ");
     Abc_Print( -2, "\tExample 1 (GraphSAGE dataset)\n ");
     Abc_Print( -2, "\t\t read your.aig; edgelist -F test.el -c test-class-map.json -f test-feats.csv \n ");
     Abc_Print( -2, "\tExample 2 (Generate dataset for LUT-mapping netlist; unsupervised)\n ");
     Abc_Print( -2, "\t\t  read your.blif; strash; if -K 6; edgelist -L -F lut-test.el \n ");
     Abc_Print( -2, "\tExample 3 (Generate dataset for abstraction; supervised for FA/HA extraction  - GraphSAGE)\n ");
     Abc_Print( -2, "\t\t  read your.blif; strash; &get; &edgelist -F test.el -c test-class_map.json -f test-feats.csv\n ");
+    Abc_Print( -2, "\tExample 4 (Generate CSR graph aligned with the node embedding of prepare_map)\n ");
+    Abc_Print( -2, "\t\t  read your.blif; strash; edgelist -C graph; prepare_map -f cuts.csv -F feats.csv -n embed.csv\n ");
 
     return 0;
 
@@ -24,6 +24,7 @@
 #include "map/mapper/mapper.h"
 #include "map/mapper/mapperInt.h"
 #include "misc/util/utilNam.h"
+#include "misc/util/utilNpy.h"
 #include "map/scl/sclCon.h"
 #include <stdio.h>
 #include <stdlib.h>
@@ -46,6 +47,7 @@ static void         Abc_NodeSuperChoice( Abc_Ntk_t * pNtkNew, Abc_Obj_t * pNode
 static void         Abc_NodeFromMapCutPhase( Abc_Ntk_t * pNtkNew, Map_Cut_t * pCut, int fPhase );
 static Abc_Obj_t *  Abc_NodeFromMapSuperChoice_rec( Abc_Ntk_t * pNtkNew, Map_Super_t * pSuper, Abc_Obj_t * pNodePis[], int nNodePis );
 //static void         Abc_prepareMap ( Abc_Ntk_t * pNtk, char * filename, char * featFile );
+static Mio_Library_t * Abc_NtkMapPrepareLib( int fVerbose );
  
 ////////////////////////////////////////////////////////////////////////
 ///                     FUNCTION DEFINITIONS                         ///
@@ -1059,137 +1061,292 @@ void Abc_NtkSetAndGateDelay( Abc_Frame_t * pAbc, float Delay )
     pNtk->AndGateDelay = Delay;
 }
 
-int Abc_prepareMap ( Abc_Ntk_t * pNtk, char * filename, char * featFile, char * nodes ) 
+int Abc_prepareMap ( Abc_Ntk_t * pNtk, char * filename, char * featFile, char * nodes, int nSigDepth, int nThreads ) 
 {
-    static int fUseMulti = 0;
-    int fShowSwitching = 1;
-    int fVerbose = 0; 
-    float LogFan = 0;
-    float Slew = 0; // choose based on the library
-    float Gain = 250;
-    int nGatesMin = 0;
-    Abc_Ntk_t * pNtkNew;
     Map_Man_t * pMan;
-    Vec_Int_t * vSwitching = NULL;
-    float * pSwitching = NULL;
-    abctime clk, clkTotal = Abc_Clock();
-    Mio_Library_t * pLib = (Mio_Library_t *)Abc_FrameReadLibGen();
 
     assert( Abc_NtkIsStrash(pNtk) );
-    // derive library from SCL
-    // if the library is created here, it will be deleted when pSuperLib is deleted in Map_SuperLibFree()
-    if ( Abc_FrameReadLibScl() && Abc_SclHasDelayInfo( Abc_FrameReadLibScl() ) )
-    {
-        if ( pLib && Mio_LibraryHasProfile(pLib) )
-            pLib = Abc_SclDeriveGenlib( Abc_FrameReadLibScl(), pLib, Slew, Gain, nGatesMin, fVerbose );
-        else
-            pLib = Abc_SclDeriveGenlib( Abc_FrameReadLibScl(), NULL, Slew, Gain, nGatesMin, fVerbose );
-        if ( Abc_FrameReadLibGen() )
-        {
-            Mio_LibraryTransferDelays( (Mio_Library_t *)Abc_FrameReadLibGen(), pLib );
-            Mio_LibraryTransferProfile( pLib, (Mio_Library_t *)Abc_FrameReadLibGen() );
-        }
-        // remove supergate library
-        Map_SuperLibFree( (Map_SuperLib_t *)Abc_FrameReadLibSuper() );
-        Abc_FrameSetLibSuper( NULL );
-    }
-    // quit if there is no library
-    if ( pLib == NULL )
-    {
-        printf( "The current library is not available.\n" );
+    if ( Abc_NtkMapPrepareLib( 0 ) == NULL )
         return 0;
-    }
-    
-    // derive the supergate library
-    if ( fUseMulti || Abc_FrameReadLibSuper() == NULL )
+    // switching activity is not computed, the mapper is started without it
+    pMan = Abc_NtkToMap( pNtk, -1, 1, NULL, 0 );
+    if ( pMan == NULL )
+        return 0;
+    Map_CutDumpTable( pMan, filename, featFile, nodes, nSigDepth, nThreads ); 
+    Map_ManFree( pMan );
+    return 1; 
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Writes the network as a CSR graph aligned with the mapper.]
+
+  Description [Rows are numbered as the nodes of the mapper in
+  Abc_NtkToMap(): CIs first, then internal nodes in the DFS order of
+  Abc_AigDfsMap() (Abc_NtkDfs() for logic networks), then COs. For AIGs,
+  the row of a CI or an AND node is the node ID (eid) of the embedding
+  dumped by prepare_map. The constant node, latches and nodes not in the
+  DFS have no row. The ID of each row is the object ID used by edgelist
+  (Abc_ObjId()-1). See Abc_CsrWrite() for the files.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Abc_NtkMapCsrWrite( Abc_Ntk_t * pNtk, char * pPrefix )
+{
+    Vec_Ptr_t * vNodes;
+    Vec_Int_t * vRows, * vIds, * vEdges;
+    Abc_Obj_t * pObj, * pFanin;
+    int i, k, Id, RetValue;
+    if ( pNtk->nBarBufs )
     {
-        if ( fVerbose )
-            printf( "Converting \"%s\" into supergate library \"%s\".\n", 
-                Mio_LibraryReadName(pLib), Extra_FileNameGenericAppend(Mio_LibraryReadName(pLib), ".super") );
-        // compute supergate library to be used for mapping
-        if ( Mio_LibraryHasProfile(pLib) )
-            printf( "Abc_NtkMap(): Genlib library has profile.\n" );
-        Map_SuperLibDeriveFromGenlib( pLib, fVerbose );
+        printf( "Writing CSR graph is not supported for networks with barrier buffers.\n" );
+        return 0;
     }
+    vNodes = Abc_NtkIsStrash(pNtk) ? Abc_AigDfsMap( pNtk ) : Abc_NtkDfs( pNtk, 0 );
+    vRows  = Vec_IntStartFull( Abc_NtkObjNumMax(pNtk) );
+    vIds   = Vec_IntAlloc( Abc_NtkCiNum(pNtk) + Vec_PtrSize(vNodes) + Abc_NtkCoNum(pNtk) );
+    Abc_NtkForEachCi( pNtk, pObj, i )
+        Vec_IntPush( vIds, Abc_ObjId(pObj) );
+    Vec_PtrForEachEntry( Abc_Obj_t *, vNodes, pObj, i )
+        Vec_IntPush( vIds, Abc_ObjId(pObj) );
+    Abc_NtkForEachCo( pNtk, pObj, i )
+        Vec_IntPush( vIds, Abc_ObjId(pObj) );
+    Vec_PtrFree( vNodes );
+    // collect the edges between rows
+    Vec_IntForEachEntry( vIds, Id, i )
+        Vec_IntWriteEntry( vRows, Id, i );
+    vEdges = Vec_IntAlloc( 4 * Vec_IntSize(vIds) );
+    Vec_IntForEachEntry( vIds, Id, i )
+        Abc_ObjForEachFanin( Abc_NtkObj(pNtk, Id), pFanin, k )
+            if ( Vec_IntEntry(vRows, Abc_ObjId(pFanin)) >= 0 )
+                Vec_IntPushTwo( vEdges, Vec_IntEntry(vRows, Abc_ObjId(pFanin)), i );
+    // write the object IDs used by edgelist
+    Vec_IntForEachEntry( vIds, Id, i )
+        Vec_IntWriteEntry( vIds, i, Id - 1 );
+    RetValue = Abc_CsrWrite( pPrefix, Vec_IntSize(vIds), vEdges, vIds );
+    Vec_IntFree( vRows );
+    Vec_IntFree( vIds );
+    Vec_IntFree( vEdges );
+    return RetValue;
+}
 
-    // print a warning about choice nodes
-    if ( fVerbose && Abc_NtkGetChoiceNum( pNtk ) )
-        printf( "Performing mapping with choices.\n" );
+/**Function*************************************************************
 
-    // compute switching activity
-    fShowSwitching |= 0;
-    if ( fShowSwitching )
+  Synopsis    [Reads the cut table dumped by prepare_map.]
+
+  Description [Each line "root, leaf, leaf, ..." is one cut, in the order 
+  of cut indexes of the root. Returns, for each root, the cuts stored as 
+  MAP_CUTS_TABLE_STRIDE entries: the number of leaves and the leaves.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+#define MAP_CUTS_TABLE_STRIDE 7
+
+Vec_Wec_t * Abc_readCutTable( char * cutFile, int nObjs )
+{
+    Vec_Wec_t * vTable;
+    char line[4096], * tok;
+    int pLeaves[MAP_CUTS_TABLE_STRIDE-1];
+    int root, nLeaves, i;
+    FILE * fp = fopen( cutFile, "r" );
+    if ( fp == NULL )
     {
-        extern Vec_Int_t * Sim_NtkComputeSwitching( Abc_Ntk_t * pNtk, int nPatterns );
-        vSwitching = Sim_NtkComputeSwitching( pNtk, 4096 );
-        pSwitching = (float *)vSwitching->pArray;
-    }
-    // perform the mapping
-    // start the mapping manager and set its parameters
-    pMan = Map_ManCreate( Abc_NtkPiNum(pNtk) + Abc_NtkLatchNum(pNtk) - pNtk->nBarBufs, Abc_NtkPoNum(pNtk) + Abc_NtkLatchNum(pNtk) - pNtk->nBarBufs, fVerbose);
-    if ( pMan == NULL ){
+        printf( "Cannot open cut table \"%s\".\n", cutFile );
         return NULL;
     }
-    
-    assert(pMan!=NULL);
-    assert(pNtk!=NULL);
-
-    pMan = Abc_NtkToMap( pNtk, -1, 1, NULL, 0 );
-    Map_CutDumpTable( pMan, filename, featFile, nodes); 
-    Map_ManFree( pMan );
-    return 1; 
+    vTable = Vec_WecStart( nObjs );
+    while ( fgets(line, 4096, fp) )
+    {
+        tok = strtok( line, ", \t\r\n" );
+        if ( tok == NULL )
+            continue;
+        root = atoi( tok );
+        for ( nLeaves = 0; (tok = strtok(NULL, ", \t\r\n")) && nLeaves < MAP_CUTS_TABLE_STRIDE-1; nLeaves++ )
+            pLeaves[nLeaves] = atoi( tok );
+        if ( root < 0 || root >= nObjs )
+            continue;
+        Vec_WecPush( vTable, root, nLeaves );
+        for ( i = 0; i < MAP_CUTS_TABLE_STRIDE-1; i++ )
+            Vec_WecPush( vTable, root, i < nLeaves ? pLeaves[i] : -1 );
+    }
+    fclose( fp );
+    return vTable;
 }
 
-const void* getfield(char* line, Map_Man_t * pMan)
+/**Function*************************************************************
+
+  Synopsis    [Reads the cuts selected for one node.]
+
+  Description [The line is "nodeid, cut, cut, ...". Without the cut table, 
+  cut indexes are used at matching time. With the cut table, the leaves 
+  of the selected cuts are used to prune cut enumeration. Returns the 
+  number of selected cuts that were not found.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int getfield(char* line, Map_Man_t * pMan, Vec_Wec_t * vCutTable)
 {
+    Vec_Int_t * vChoices, * vCuts;
+    Map_Node_t * pNode;
     const char* tok;
+    int nodeIdx, cutIdx, i, nMissing = 0;
     tok = strtok(line, ",");
-    int first = 0;
-    int nodeIdx = 0; 
-    int cutCounter = 0;
-    while(tok != NULL)
+    if ( tok == NULL )
+        return 0;
+    nodeIdx = atoi(tok);
+    if ( nodeIdx < 0 || nodeIdx >= pMan->vMapObjs->nSize )
+        return 0;
+    vChoices = Vec_IntAlloc( 16 );
+    while ( (tok = strtok(NULL, ",")) != NULL )
+        if ( strspn(tok, " \t\r\n") < strlen(tok) )
+            Vec_IntPush( vChoices, atoi(tok) );
+    if ( vCutTable == NULL )
     {
-        if (first == 0) {
-            nodeIdx = atoi(tok); 
-            first = 1; 
-            //printf("Node is: %d ", nodeIdx);
-            tok = strtok(NULL, ",");
-            continue;
-        }
-        else {
-            //cuts[cutCounter] = atoi(tok);
-            pMan->vMapObjs->pArray[nodeIdx]->CutChoices[cutCounter] = atoi(tok);
-            cutCounter++;
+        pNode = pMan->vMapObjs->pArray[nodeIdx];
+        ABC_FREE( pNode->CutChoices );
+        pNode->CutCounter = Vec_IntSize( vChoices );
+        pNode->CutChoices = Vec_IntReleaseArray( vChoices );
+    }
+    else
+    {
+        vCuts = Vec_WecEntry( vCutTable, nodeIdx );
+        Vec_IntForEachEntry( vChoices, cutIdx, i )
+        {
+            if ( cutIdx < 0 || (cutIdx+1) * MAP_CUTS_TABLE_STRIDE > Vec_IntSize(vCuts) || 
+                !Map_ManPruneAddCut( pMan, nodeIdx, Vec_IntEntryP(vCuts, cutIdx * MAP_CUTS_TABLE_STRIDE + 1), Vec_IntEntry(vCuts, cutIdx * MAP_CUTS_TABLE_STRIDE) ) )
+                nMissing++;
         }
-        tok = strtok(NULL, ",");
     }
-    pMan->vMapObjs->pArray[nodeIdx]->CutCounter = cutCounter;
-    //return 1;
+    Vec_IntFree( vChoices );
+    return nMissing;
 }
 
-Abc_Ntk_t * Abc_readCuts ( Abc_Ntk_t * pNtk, char * featFile ) 
+Abc_Ntk_t * Abc_readCuts ( Abc_Ntk_t * pNtk, char * featFile, char * cutFile ) 
 {
     assert(pNtk != NULL); 
     FILE * fp; 
     fp = fopen(featFile, "r"); 
+    if ( fp == NULL )
+    {
+        printf( "Cannot open file \"%s\" with selected cuts.\n", featFile );
+        return NULL;
+    }
 
-    static int fUseMulti = 0;
-    int fShowSwitching = 1;
     int fVerbose = 0; 
     float LogFan = 0;
-    float Slew = 0; // choose based on the library
-    float Gain = 250;
-    int nGatesMin = 0;
     Abc_Ntk_t * pNtkNew;
     Map_Man_t * pMan;
-    Vec_Int_t * vSwitching = NULL;
-    float * pSwitching = NULL;
-    abctime clk, clkTotal = Abc_Clock();
-    Mio_Library_t * pLib = (Mio_Library_t *)Abc_FrameReadLibGen();
+    abctime clk;
+    Mio_Library_t * pLib;
 
     assert( Abc_NtkIsStrash(pNtk) );
+    pLib = Abc_NtkMapPrepareLib( fVerbose );
+    if ( pLib == NULL )
+    {
+        fclose( fp );
+        return NULL;
+    }
+
+    // print a warning about choice nodes
+    if ( fVerbose && Abc_NtkGetChoiceNum( pNtk ) )
+        printf( "Performing mapping with choices.\n" );
+
+    // perform the mapping
+    // switching activity is not computed, the mapper is started without it
+    pMan = Abc_NtkToMap( pNtk, -1, 1, NULL, 0 );
+    Vec_Wec_t * vCutTable = NULL;
+    if ( pMan && cutFile )
+    {
+        vCutTable = Abc_readCutTable( cutFile, pMan->vMapObjs->nSize );
+        if ( vCutTable == NULL )
+        {
+            fclose( fp );
+            Map_ManFree( pMan );
+            return NULL;
+        }
+    }
+    char line[4096];
+    int lineId = 0, nMissing = 0; 
+    while (pMan && fgets(line, 4096, fp))
+    {
+        //printf("Line is: %d\n", lineId); 
+        char* tmp = strdup(line);
+        nMissing += getfield(tmp, pMan, vCutTable);
+        //printf("\n");
+        free(tmp);
+        lineId++;
+    }
+    fclose( fp );
+    if ( vCutTable )
+        Vec_WecFree( vCutTable );
+    if ( nMissing )
+        printf( "Warning: %d selected cuts are not in the cut table.\n", nMissing );
+    if ( pMan == NULL )
+        return NULL;
+clk = Abc_Clock();
+    Map_ManSetSwitching( pMan, 0 );
+    Map_ManSetSkipFanout( pMan, 0 );
+    // if ( 0 )
+    //     Map_ManSetUseProfile( pMan );
+    if ( LogFan != 0 )
+        Map_ManCreateNodeDelays( pMan, LogFan );
+    if ( !Map_Mapping( pMan ) )
+    {
+        Map_ManFree( pMan );
+        return NULL;
+    }
+//    Map_ManPrintStatsToFile( pNtk->pSpec, Map_ManReadAreaFinal(pMan), Map_ManReadRequiredGlo(pMan), Abc_Clock()-clk );
+
+    // reconstruct the network after mapping
+    pNtkNew = Abc_NtkFromMap( pMan, pNtk );
+    if ( Mio_LibraryHasProfile(pLib) )
+        Mio_LibraryTransferProfile2( (Mio_Library_t *)Abc_FrameReadLibGen(), pLib );
+    Map_ManFree( pMan );
+    if ( pNtkNew == NULL )
+        return NULL;
+
+    if ( pNtk->pExdc )
+        pNtkNew->pExdc = Abc_NtkDup( pNtk->pExdc );
+    
+    // make sure that everything is okay
+    if ( !Abc_NtkCheck( pNtkNew ) )
+    {
+        printf( "Abc_NtkMap: The network check has failed.\n" );
+        Abc_NtkDelete( pNtkNew );
+        return NULL;
+    }
+    return pNtkNew;  
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Prepares the libraries for ML-guided mapping.]
+
+  Description [Derives the genlib library from SCL if needed and the 
+  supergate library, for prepare_map, read_cuts and ml_map. Returns the 
+  genlib library or NULL if there is no library.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+static Mio_Library_t * Abc_NtkMapPrepareLib( int fVerbose )
+{
+    float Slew = 0; // choose based on the library
+    float Gain = 250;
+    int nGatesMin = 0;
+    Mio_Library_t * pLib = (Mio_Library_t *)Abc_FrameReadLibGen();
     // derive library from SCL
-    // if the library is created here, it will be deleted when pSuperLib is deleted in Map_SuperLibFree()
     if ( Abc_FrameReadLibScl() && Abc_SclHasDelayInfo( Abc_FrameReadLibScl() ) )
     {
         if ( pLib && Mio_LibraryHasProfile(pLib) )
@@ -1205,76 +1362,82 @@ Abc_Ntk_t * Abc_readCuts ( Abc_Ntk_t * pNtk, char * featFile )
         Map_SuperLibFree( (Map_SuperLib_t *)Abc_FrameReadLibSuper() );
         Abc_FrameSetLibSuper( NULL );
     }
-    // quit if there is no library
     if ( pLib == NULL )
     {
         printf( "The current library is not available.\n" );
-        return 0;
+        return NULL;
     }
-    
     // derive the supergate library
-    if ( fUseMulti || Abc_FrameReadLibSuper() == NULL )
+    if ( Abc_FrameReadLibSuper() == NULL )
     {
         if ( fVerbose )
             printf( "Converting \"%s\" into supergate library \"%s\".\n", 
                 Mio_LibraryReadName(pLib), Extra_FileNameGenericAppend(Mio_LibraryReadName(pLib), ".super") );
-        // compute supergate library to be used for mapping
-        if ( Mio_LibraryHasProfile(pLib) )
-            printf( "Abc_NtkMap(): Genlib library has profile.\n" );
         Map_SuperLibDeriveFromGenlib( pLib, fVerbose );
     }
+    return pLib;
+}
 
-    // print a warning about choice nodes
-    if ( fVerbose && Abc_NtkGetChoiceNum( pNtk ) )
-        printf( "Performing mapping with choices.\n" );
+/**Function*************************************************************
 
-    // compute switching activity
-    fShowSwitching |= 0;
-    if ( fShowSwitching )
+  Synopsis    [Maps using the cuts selected by a CNN.]
+
+  Description [Does in one process what prepare_map, the inference 
+  scripts and read_cuts do through files: cut features are computed in 
+  memory, scored by the CNN read from pWeightFile (see Map_CnnRead) and 
+  the selected cuts are used for mapping. If fPrune is set, cut 
+  enumeration is pruned to the selected cuts, as in read_cuts -c.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+Abc_Ntk_t * Abc_NtkMapScore( Abc_Ntk_t * pNtk, char * pWeightFile, int nBatch, int GoodClass, int FairClass, int fPrune, int fVerbose )
+{
+    Abc_Ntk_t * pNtkNew;
+    Map_Man_t * pManScore, * pMan;
+    Map_Cnn_t * pCnn;
+    Mio_Library_t * pLib;
+
+    assert( Abc_NtkIsStrash(pNtk) );
+    pLib = Abc_NtkMapPrepareLib( fVerbose );
+    if ( pLib == NULL )
+        return NULL;
+    pCnn = Map_CnnRead( pWeightFile );
+    if ( pCnn == NULL )
+        return NULL;
+    // score the cuts
+    pManScore = Abc_NtkToMap( pNtk, -1, 1, NULL, 0 );
+    if ( pManScore == NULL )
     {
-        extern Vec_Int_t * Sim_NtkComputeSwitching( Abc_Ntk_t * pNtk, int nPatterns );
-        vSwitching = Sim_NtkComputeSwitching( pNtk, 4096 );
-        pSwitching = (float *)vSwitching->pArray;
-    }
-    // perform the mapping
-    // start the mapping manager and set its parameters
-    pMan = Map_ManCreate( Abc_NtkPiNum(pNtk) + Abc_NtkLatchNum(pNtk) - pNtk->nBarBufs, Abc_NtkPoNum(pNtk) + Abc_NtkLatchNum(pNtk) - pNtk->nBarBufs, fVerbose);
-    if ( pMan == NULL ){
+        Map_CnnFree( pCnn );
         return NULL;
     }
-    
-    assert(pMan!=NULL);
-    assert(pNtk!=NULL);
-
-    pMan = Abc_NtkToMap( pNtk, -1, 1, NULL, 0 );
-    char line[4096];
-    int lineId = 0; 
-    while (fgets(line, 4096, fp))
+    if ( !Map_MappingScoreCuts( pManScore, pCnn, nBatch, GoodClass, FairClass, fVerbose ) )
     {
-        //printf("Line is: %d\n", lineId); 
-        char* tmp = strdup(line);
-        getfield(tmp, pMan);
-        //printf("\n");
-        free(tmp);
-        lineId++;
+        printf( "Matching cuts before scoring has failed.\n" );
+        Map_ManFree( pManScore );
+        Map_CnnFree( pCnn );
+        return NULL;
     }
-    if ( pSwitching ) Vec_IntFree( vSwitching );
+    Map_CnnFree( pCnn );
+    // map with the selected cuts
+    pMan = Abc_NtkToMap( pNtk, -1, 1, NULL, 0 );
     if ( pMan == NULL )
+    {
+        Map_ManFree( pManScore );
         return NULL;
-clk = Abc_Clock();
+    }
+    Map_ManTransferChoices( pManScore, pMan, fPrune );
+    Map_ManFree( pManScore );
     Map_ManSetSwitching( pMan, 0 );
     Map_ManSetSkipFanout( pMan, 0 );
-    // if ( 0 )
-    //     Map_ManSetUseProfile( pMan );
-    if ( LogFan != 0 )
-        Map_ManCreateNodeDelays( pMan, LogFan );
     if ( !Map_Mapping( pMan ) )
     {
         Map_ManFree( pMan );
         return NULL;
     }
-//    Map_ManPrintStatsToFile( pNtk->pSpec, Map_ManReadAreaFinal(pMan), Map_ManReadRequiredGlo(pMan), Abc_Clock()-clk );
-
     // reconstruct the network after mapping
     pNtkNew = Abc_NtkFromMap( pMan, pNtk );
     if ( Mio_LibraryHasProfile(pLib) )
@@ -1282,18 +1445,16 @@ clk = Abc_Clock();
     Map_ManFree( pMan );
     if ( pNtkNew == NULL )
         return NULL;
-
     if ( pNtk->pExdc )
         pNtkNew->pExdc = Abc_NtkDup( pNtk->pExdc );
-    
     // make sure that everything is okay
     if ( !Abc_NtkCheck( pNtkNew ) )
     {
-        printf( "Abc_NtkMap: The network check has failed.\n" );
+        printf( "Abc_NtkMapScore: The network check has failed.\n" );
         Abc_NtkDelete( pNtkNew );
         return NULL;
     }
-    return pNtkNew;  
+    return pNtkNew;
 }
 ////////////////////////////////////////////////////////////////////////
 ///                       END OF FILE                                ///
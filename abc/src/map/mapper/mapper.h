@@ -47,6 +47,7 @@ typedef struct Map_SuperLibStruct_t_    Map_SuperLib_t;
 typedef struct Map_HashTableStruct_t_   Map_HashTable_t;
 typedef struct Map_HashEntryStruct_t_   Map_HashEntry_t;
 typedef struct Map_TimeStruct_t_        Map_Time_t;
+typedef struct Map_CnnStruct_t_         Map_Cnn_t;
 
 // the pair of rise/fall time parameters
 struct Map_TimeStruct_t_
@@ -164,7 +165,13 @@ extern int             Map_CanonComputeSlow( unsigned uTruths[][2], int nVarsMax
 extern int             Map_CanonComputeFast( Map_Man_t * p, int nVarsMax, int nVarsReal, unsigned uTruth[], unsigned char * puPhases, unsigned uTruthRes[] );
 /*=== mapperCut.c =============================================================*/
 extern Map_Cut_t *     Map_CutAlloc( Map_Man_t * p );
-extern int            Map_CutDumpTable ( Map_Man_t * pMan, char * filename, char * featFile, char * nodesFile);
+extern int            Map_CutDumpTable ( Map_Man_t * pMan, char * filename, char * featFile, char * nodesFile, int nSigDepth, int nThreads );
+extern int            Map_ManPruneAddCut( Map_Man_t * p, int RootNum, int * pLeaves, int nLeaves );
+/*=== mapperScore.c =============================================================*/
+extern Map_Cnn_t *     Map_CnnRead( char * pFileName );
+extern void            Map_CnnFree( Map_Cnn_t * p );
+extern int             Map_MappingScoreCuts( Map_Man_t * p, Map_Cnn_t * pCnn, int nBatch, int GoodClass, int FairClass, int fVerbose );
+extern void            Map_ManTransferChoices( Map_Man_t * pFrom, Map_Man_t * pTo, int fPrune );
 /*=== mapperCutUtils.c =============================================================*/
 extern void            Map_CutCreateFromNode( Map_Man_t * p, Map_Super_t * pSuper, int iRoot, unsigned uPhaseRoot, 
                            int * pLeaves, int nLeaves, unsigned uPhaseLeaves );
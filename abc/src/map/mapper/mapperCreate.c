@@ -246,10 +246,15 @@ Map_Man_t * Map_ManCreate( int nInputs, int nOutputs, int fVerbose )
 ***********************************************************************/
 void Map_ManFree( Map_Man_t * p )
 {
-//    int i;
+    int i;
 //    for ( i = 0; i < p->vMapObjs->nSize; i++ )
 //        Map_NodeVecFree( p->vMapObjs->pArray[i]->vFanouts );
 //    Map_NodeVecFree( p->pConst1->vFanouts );
+    for ( i = 0; i < p->vMapObjs->nSize; i++ )
+        ABC_FREE( p->vMapObjs->pArray[i]->CutChoices );
+    if ( p->vPruneCuts )    Vec_IntFree( p->vPruneCuts );
+    if ( p->vPruneOwn )     Vec_WecFree( p->vPruneOwn );
+    if ( p->vPruneTargets ) Vec_WecFree( p->vPruneTargets );
     Map_NodeVecFree( p->vMapObjs );
     Map_NodeVecFree( p->vMapBufs );
     Map_NodeVecFree( p->vVisited );
@@ -19,6 +19,17 @@
 #include "mapperInt.h"
 #include <sys/time.h>
 
+#ifdef ABC_USE_PTHREADS
+
+#ifdef _WIN32
+#include "../lib/pthread.h"
+#else
+#include <pthread.h>
+#include <unistd.h>
+#endif
+
+#endif
+
 ABC_NAMESPACE_IMPL_START
 
 
@@ -53,12 +64,31 @@ struct Map_CutTableStrutct_t
     Map_Cut_t ** pCuts2;       // the temporary array of cuts
 };
 
+// the number of nodes dumped by one thread at a time
+#define  MAP_DUMP_CHUNK         1024
+// the largest number of threads used for dumping
+#define  MAP_DUMP_PROC_MAX      64
+
+// the chunk of nodes dumped by one thread
+typedef struct Map_DumpThData_t_ Map_DumpThData_t;
+struct Map_DumpThData_t_
+{
+    Map_Man_t *  pMan;         // the mapping manager
+    word *       pSigs;        // the structural signatures of nodes
+    int          totalLevel;   // the number of levels
+    int          iStart;       // the first node of the chunk
+    int          iStop;        // the node after the last node of the chunk
+    Vec_Str_t *  vCuts;        // the lines of the cut table
+    Vec_Str_t *  vFeats;       // the lines of cut features
+    Vec_Str_t *  vEmbed;       // the lines of node embedding
+};
+
 // primes used to compute the hash key
 static int s_HashPrimes[10] = { 109, 499, 557, 619, 631, 709, 797, 881, 907, 991 };
 
 static Map_Cut_t *      Map_CutCompute( Map_Man_t * p, Map_CutTable_t * pTable, Map_Node_t * pNode );
 static void             Map_CutFilter( Map_Man_t * p, Map_Node_t * pNode );
-static Map_Cut_t *      Map_CutMergeLists( Map_Man_t * p, Map_CutTable_t * pTable, Map_Cut_t * pList1, Map_Cut_t * pList2, int fComp1, int fComp2 );
+static Map_Cut_t *      Map_CutMergeLists( Map_Man_t * p, Map_CutTable_t * pTable, Map_Node_t * pNode, Map_Cut_t * pList1, Map_Cut_t * pList2, int fComp1, int fComp2 );
 static int              Map_CutMergeTwo( Map_Cut_t * pCut1, Map_Cut_t * pCut2, Map_Node_t * ppNodes[], int nNodesMax );
 static Map_Cut_t *      Map_CutUnionLists( Map_Cut_t * pList1, Map_Cut_t * pList2 );
 static int              Map_CutBelongsToList( Map_Cut_t * pList, Map_Node_t * ppNodes[], int nNodes );
@@ -66,8 +96,14 @@ static int              Map_CutBelongsToList( Map_Cut_t * pList, Map_Node_t * pp
 static void             Map_CutListPrint( Map_Man_t * pMan, Map_Node_t * pRoot );
 static void             Map_CutListPrint2( Map_Man_t * pMan, Map_Node_t * pRoot );
 static void             Map_CutPrint_( Map_Man_t * pMan, Map_Cut_t * pCut, Map_Node_t * pRoot );
-static void             Map_CutPrint2_( Map_Man_t * pMan, Map_Cut_t * pCut, Map_Node_t * pRoot, FILE *fp );
-static void             Map_DumpCutFeatures( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, FILE * feat, int cutIdx);
+static void             Map_CutDumpNodes( Map_DumpThData_t * p );
+static void             Map_CutPrint2_( Map_Man_t * pMan, Map_Cut_t * pCut, Map_Node_t * pRoot, Vec_Str_t * vOut );
+static void             Map_DumpCutFeatures( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, Vec_Str_t * vFeat, int cutIdx, int totalLevel );
+static word *           Map_CutComputeSignatures( Map_Man_t * pMan, int nDepth );
+static int              Map_CutPruneMarkCone_rec( Map_Man_t * p, Map_Node_t * pNode, int iCut, int MinLevel, int fRoot );
+static int              Map_CutPruneCheck( Map_Man_t * p, Map_Node_t * pNode, Map_Node_t * ppNodes[], int nNodes );
+static int              Map_CutPruneEqual( Map_Cut_t * pCut, int * pLeaves, int nLeaves );
+static void             Map_CutPruneReorder( Map_Man_t * p );
 static Map_CutTable_t * Map_CutTableStart( Map_Man_t * pMan );
 static void             Map_CutTableStop( Map_CutTable_t * p );
 static unsigned         Map_CutTableHash( Map_Node_t * ppNodes[], int nNodes );
@@ -212,6 +248,9 @@ void Map_MappingCuts( Map_Man_t * p )
     }
     Extra_ProgressBarStop( pProgress );
     Map_CutTableStop( pTable );
+    // place the predicted cuts in front of the other cuts
+    if ( p->vPruneCuts )
+        Map_CutPruneReorder( p );
 
     // report the stats
     if ( p->fVerbose )
@@ -252,7 +291,7 @@ Map_Cut_t * Map_CutCompute( Map_Man_t * p, Map_CutTable_t * pTable, Map_Node_t *
     pList1 = Map_Regular(pNode->p1)->pCuts;
     pList2 = Map_Regular(pNode->p2)->pCuts;
     // merge the lists
-    pList = Map_CutMergeLists( p, pTable, pList1, pList2, 
+    pList = Map_CutMergeLists( p, pTable, pNode, pList1, pList2, 
         Map_IsComplement(pNode->p1), Map_IsComplement(pNode->p2) );
     // if there are functionally equivalent nodes, union them with this list
     assert( pList );
@@ -359,7 +398,7 @@ void Map_CutFilter( Map_Man_t * p, Map_Node_t * pNode )
   SeeAlso     []
 
 ***********************************************************************/
-Map_Cut_t * Map_CutMergeLists( Map_Man_t * p, Map_CutTable_t * pTable, 
+Map_Cut_t * Map_CutMergeLists( Map_Man_t * p, Map_CutTable_t * pTable, Map_Node_t * pNode,
     Map_Cut_t * pList1, Map_Cut_t * pList2, int fComp1, int fComp2 )
 {
     Map_Node_t * ppNodes[6];
@@ -415,6 +454,9 @@ Map_Cut_t * Map_CutMergeLists( Map_Man_t * p, Map_CutTable_t * pTable,
             nNodes = Map_CutMergeTwo( pTemp1, pTemp2, ppNodes, p->nVarsMax );
             if ( nNodes == 0 )
                 continue;
+            // skip the cut if it cannot contribute to a predicted cut
+            if ( p->vPruneCuts && !Map_CutPruneCheck( p, pNode, ppNodes, nNodes ) )
+                continue;
             // consider the cut for possible addition to the set of new cuts
             pCut = Map_CutTableConsider( p, pTable, ppNodes, nNodes );
             if ( pCut == NULL )
@@ -449,6 +491,9 @@ Map_Cut_t * Map_CutMergeLists( Map_Man_t * p, Map_CutTable_t * pTable,
             nNodes = Map_CutMergeTwo( pTemp1, pTemp2, ppNodes, p->nVarsMax );
             if ( nNodes == 0 )
                 continue;
+            // skip the cut if it cannot contribute to a predicted cut
+            if ( p->vPruneCuts && !Map_CutPruneCheck( p, pNode, ppNodes, nNodes ) )
+                continue;
             // consider the cut for possible addition to the set of new cuts
             pCut = Map_CutTableConsider( p, pTable, ppNodes, nNodes );
             if ( pCut == NULL )
@@ -486,6 +531,9 @@ Map_Cut_t * Map_CutMergeLists( Map_Man_t * p, Map_CutTable_t * pTable,
             nNodes = Map_CutMergeTwo( pTemp1, pTemp2, ppNodes, p->nVarsMax );
             if ( nNodes == 0 )
                 continue;
+            // skip the cut if it cannot contribute to a predicted cut
+            if ( p->vPruneCuts && !Map_CutPruneCheck( p, pNode, ppNodes, nNodes ) )
+                continue;
             // consider the cut for possible addition to the set of new cuts
             pCut = Map_CutTableConsider( p, pTable, ppNodes, nNodes );
             if ( pCut == NULL )
@@ -823,25 +871,38 @@ void Map_CutPrint_( Map_Man_t * pMan, Map_Cut_t * pCut, Map_Node_t * pRoot )
   SeeAlso     []
 
 ***********************************************************************/
-void Map_CutPrint2_( Map_Man_t * pMan, Map_Cut_t * pCut, Map_Node_t * pRoot, FILE *fp )
+void Map_CutPrint2_( Map_Man_t * pMan, Map_Cut_t * pCut, Map_Node_t * pRoot, Vec_Str_t * vOut )
 {
     int i;
-    fprintf( fp, "%3d,", pRoot->Num );
+    Vec_StrPrintF( vOut, "%3d,", pRoot->Num );
     for ( i = 0; i < pMan->nVarsMax; i++ )
         if ( pCut->ppLeaves[i] )
-            fprintf( fp,"%3d,", pCut->ppLeaves[i]->Num );
-    fprintf( fp, "\n" );
+            Vec_StrPrintF( vOut, "%3d,", pCut->ppLeaves[i]->Num );
+    Vec_StrPrintF( vOut, "\n" );
 }
 
-void Map_DumpCutFeatures( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, FILE * feat, int cutIdx)
+/**Function*************************************************************
+
+  Synopsis    [Computes the features of one cut.]
+
+  Description [Fills pFeats with MAP_FEAT_NUM values in the order of the 
+  columns dumped by prepare_map -F. The same values are used to score cuts 
+  in memory, so that a model sees the features it was trained on.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_CutComputeFeatures( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, int cutIdx, int totalLevel, int * pFeats )
 {
     Map_Node_t * pNodeR;
-    int fPhase, minLevel = 1000000, maxLevel = 0, cutLevel = 0, i;
+    int fPhase, minLevel = 1000000, maxLevel = 0, i;
     int minFo = 1000000, maxFo = 0, cutFo = 0; 
-    int leavesIdx[5] = { -1, -1, -1, -1, -1 };
     pNodeR = Map_Regular(pNode);
     fPhase = !Map_IsComplement(pNode);
-    int totalLevel = Map_MappingGetMaxLevel(pMan); 
+    for ( i = MAP_FEAT_L1ID; i <= MAP_FEAT_L5ID; i++ )
+        pFeats[i] = -1;
     for ( i = 0; i < pMan->nVarsMax; i++ ) {
         if ( pCut->ppLeaves[i] ) { 
             if (pCut->ppLeaves[i]->Level < minLevel)
@@ -853,12 +914,71 @@ void Map_DumpCutFeatures( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut
             if (pCut->ppLeaves[i]->nRefAct[2] > maxFo)
                 maxFo = pCut->ppLeaves[i]->nRefAct[2];  
             cutFo = pCut->ppLeaves[i]->nRefAct[2] + cutFo; 
-            leavesIdx[i] = pCut->ppLeaves[i]->Num; 
+            if ( MAP_FEAT_L1ID + i <= MAP_FEAT_L5ID )
+                pFeats[MAP_FEAT_L1ID + i] = pCut->ppLeaves[i]->Num; 
         }
     }
-    cutLevel = pNodeR->Level - minLevel; 
-    int relativeLevel = totalLevel - pNode->Level;
-    fprintf(feat, "%d,%d,%u,%u,%u,%u,%d,%u,%u,%d,%u,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d\n", pNodeR->Num, pNodeR->nRefs, pNodeR->Level, pNodeR->fInv, pNodeR->p1->fInv, pNodeR->p1->Level, pNodeR->p1->nRefAct[2], pNodeR->p2->fInv, pNodeR->p2->Level, pNodeR->p2->nRefAct[2], pCut->M[fPhase].pSuperBest->uTruth, fPhase, pCut->nLeaves, pCut->nVolume, minLevel, maxLevel, cutLevel, minFo, maxFo, cutFo, cutIdx, relativeLevel, leavesIdx[0], leavesIdx[1], leavesIdx[2], leavesIdx[3], leavesIdx[4]);
+    pFeats[MAP_FEAT_NODEID]      = pNodeR->Num;
+    pFeats[MAP_FEAT_FON]         = pNodeR->nRefs;
+    pFeats[MAP_FEAT_LVLN]        = pNodeR->Level;
+    pFeats[MAP_FEAT_INVN]        = pNodeR->fInv;
+    pFeats[MAP_FEAT_INVP1]       = pNodeR->p1->fInv;
+    pFeats[MAP_FEAT_LVLP1]       = pNodeR->p1->Level;
+    pFeats[MAP_FEAT_FOP1]        = pNodeR->p1->nRefAct[2];
+    pFeats[MAP_FEAT_INVP2]       = pNodeR->p2->fInv;
+    pFeats[MAP_FEAT_LVLP2]       = pNodeR->p2->Level;
+    pFeats[MAP_FEAT_FOP2]        = pNodeR->p2->nRefAct[2];
+    pFeats[MAP_FEAT_TT]          = pCut->M[fPhase].pSuperBest ? (int)pCut->M[fPhase].pSuperBest->uTruth[0] : 0;
+    pFeats[MAP_FEAT_INVC]        = fPhase;
+    pFeats[MAP_FEAT_LEAVESC]     = pCut->nLeaves;
+    pFeats[MAP_FEAT_VOLUMEC]     = pCut->nVolume;
+    pFeats[MAP_FEAT_MINCUTLVL]   = minLevel;
+    pFeats[MAP_FEAT_MAXCUTLVL]   = maxLevel;
+    pFeats[MAP_FEAT_CUTLVL]      = pNodeR->Level - minLevel;
+    pFeats[MAP_FEAT_CUTMINFO]    = minFo;
+    pFeats[MAP_FEAT_CUTMAXFO]    = maxFo;
+    pFeats[MAP_FEAT_CUTFO]       = cutFo;
+    pFeats[MAP_FEAT_CUTIDX]      = cutIdx;
+    pFeats[MAP_FEAT_RELATIVELVL] = totalLevel - pNode->Level;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Computes the embedding of one node.]
+
+  Description [Fills pEmbed with MAP_EMBED_NUM values in the order of the 
+  columns dumped by prepare_map -n.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_NodeComputeEmbed( Map_Node_t * pNode, int totalLevel, int * pEmbed )
+{
+    pEmbed[MAP_EMBED_EFO]    = pNode->nRefs;
+    pEmbed[MAP_EMBED_ELVL]   = pNode->Level;
+    pEmbed[MAP_EMBED_EINV]   = pNode->fInv;
+    pEmbed[MAP_EMBED_EC1INV] = pNode->p1->fInv;
+    pEmbed[MAP_EMBED_EC1LVL] = pNode->p1->Level;
+    pEmbed[MAP_EMBED_EC1FO]  = pNode->p1->nRefAct[2];
+    pEmbed[MAP_EMBED_EC2INV] = pNode->p2->fInv;
+    pEmbed[MAP_EMBED_EC2LVL] = pNode->p2->Level;
+    pEmbed[MAP_EMBED_EC2FO]  = pNode->p2->nRefAct[2];
+    pEmbed[MAP_EMBED_ERELVL] = totalLevel - pNode->Level;
+}
+
+void Map_DumpCutFeatures( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, Vec_Str_t * vFeat, int cutIdx, int totalLevel )
+{
+    int pFeats[MAP_FEAT_NUM], i;
+    Map_CutComputeFeatures( pMan, pNode, pCut, cutIdx, totalLevel, pFeats );
+    for ( i = 0; i < MAP_FEAT_NUM; i++ )
+    {
+        if ( i == MAP_FEAT_TT )
+            Vec_StrPrintF( vFeat, "%u,", (unsigned)pFeats[i] );
+        else
+            Vec_StrPrintF( vFeat, i < MAP_FEAT_NUM - 1 ? "%d," : "%d\n", pFeats[i] );
+    }
 } 
 
 /**Function*************************************************************
@@ -1333,10 +1453,382 @@ unsigned Map_CutComputeTruth( Map_Man_t * p, Map_Cut_t * pCut, Map_Cut_t * pTemp
     return uTruth;
 }
 
-int Map_CutDumpTable (Map_Man_t * pMan, char * filename, char *featFile, char * nodesFile)
+/**Function*************************************************************
+
+  Synopsis    [Adds a predicted cut used to prune cut enumeration.]
+
+  Description [The cut of the node with number RootNum is given by the 
+  numbers of its leaves, as dumped into the cut table by prepare_map. 
+  The cut becomes a target of the root and of all nodes that can have a 
+  cut contained in its leaves. Once any cut is added, the enumeration only 
+  keeps the cuts of a node whose leaves are contained in the leaves of one 
+  of its targets, because only such cuts can be merged into a predicted 
+  cut. Returns 0 if the leaves do not form a cut of the root.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Map_ManPruneAddCut( Map_Man_t * p, int RootNum, int * pLeaves, int nLeaves )
+{
+    Map_Node_t * pLeaf;
+    unsigned uSign = 0;
+    int i, iCut, MinLevel = ABC_INFINITY;
+    if ( p->vPruneCuts == NULL )
+    {
+        p->vPruneCuts    = Vec_IntAlloc( 1000 );
+        p->vPruneOwn     = Vec_WecStart( p->vMapObjs->nSize );
+        p->vPruneTargets = Vec_WecStart( p->vMapObjs->nSize );
+    }
+    if ( RootNum < 0 || RootNum >= p->vMapObjs->nSize || nLeaves < 1 || nLeaves > 6 )
+        return 0;
+    for ( i = 0; i < nLeaves; i++ )
+    {
+        if ( pLeaves[i] < 0 || pLeaves[i] >= p->vMapObjs->nSize )
+            return 0;
+        pLeaf = p->vMapObjs->pArray[pLeaves[i]];
+        MinLevel = Abc_MinInt( MinLevel, (int)pLeaf->Level );
+        uSign |= (1 << (pLeaf->Num & 31));
+    }
+    // save the cut
+    iCut = Vec_IntSize(p->vPruneCuts) / MAP_PRUNE_STRIDE;
+    Vec_IntPush( p->vPruneCuts, nLeaves );
+    Vec_IntPush( p->vPruneCuts, (int)uSign );
+    for ( i = 0; i < MAP_PRUNE_STRIDE - 2; i++ )
+        Vec_IntPush( p->vPruneCuts, i < nLeaves ? pLeaves[i] : -1 );
+    Vec_WecPush( p->vPruneOwn, RootNum, iCut );
+    // add the cut as a target of the nodes in its cone
+    // (nTravIds marks covered nodes, nTravIds-1 marks the other visited nodes)
+    p->nTravIds += 2;
+    return Map_CutPruneMarkCone_rec( p, p->vMapObjs->pArray[RootNum], iCut, MinLevel, 1 );
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Adds the target to the nodes covered by its leaves.]
+
+  Description [A node is covered if it is a leaf or if both of its fanins 
+  are covered. The mapper does not require cuts to be minimal, so a leaf 
+  may also be reached through other leaves, and such a leaf becomes a 
+  target node as well. Nodes not above the lowest leaf cannot be covered 
+  through their fanins. Returns 1 if the node is covered through its 
+  fanins (fRoot) or covered at all (otherwise).]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Map_CutPruneMarkCone_rec( Map_Man_t * p, Map_Node_t * pNode, int iCut, int MinLevel, int fRoot )
 {
-    int i = 0;
+    int * pTarget = Vec_IntEntryP( p->vPruneCuts, iCut * MAP_PRUNE_STRIDE );
+    int i, fLeaf = 0, fInner;
+    if ( pNode->TravId == p->nTravIds )
+        return 1;
+    if ( pNode->TravId == p->nTravIds - 1 )
+        return 0;
+    for ( i = 0; i < pTarget[0]; i++ )
+        fLeaf |= (pTarget[2+i] == pNode->Num);
+    fInner = Map_NodeIsAnd(pNode) && (int)pNode->Level > MinLevel && 
+        Map_CutPruneMarkCone_rec( p, Map_Regular(pNode->p1), iCut, MinLevel, 0 ) && 
+        Map_CutPruneMarkCone_rec( p, Map_Regular(pNode->p2), iCut, MinLevel, 0 );
+    if ( fInner )
+        Vec_WecPush( p->vPruneTargets, pNode->Num, iCut );
+    pNode->TravId = (fLeaf || fInner) ? p->nTravIds : p->nTravIds - 1;
+    return fRoot ? fInner : (fLeaf || fInner);
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Returns 1 if the cut of the node should be kept.]
+
+  Description [Keeps the cut made of the two fanins of the node, which is 
+  used when none of the predicted cuts of the node can be matched, and the 
+  cuts whose leaves are contained in the leaves of a target of the node.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Map_CutPruneCheck( Map_Man_t * p, Map_Node_t * pNode, Map_Node_t * ppNodes[], int nNodes )
+{
+    Vec_Int_t * vTargets;
+    unsigned uSign = 0;
+    int * pTarget;
+    int i, k, m, iCut;
+    if ( nNodes == 2 && ((ppNodes[0] == Map_Regular(pNode->p1) && ppNodes[1] == Map_Regular(pNode->p2)) || 
+                         (ppNodes[0] == Map_Regular(pNode->p2) && ppNodes[1] == Map_Regular(pNode->p1))) )
+        return 1;
+    for ( i = 0; i < nNodes; i++ )
+        uSign |= (1 << (ppNodes[i]->Num & 31));
+    vTargets = Vec_WecEntry( p->vPruneTargets, pNode->Num );
+    Vec_IntForEachEntry( vTargets, iCut, k )
+    {
+        pTarget = Vec_IntEntryP( p->vPruneCuts, iCut * MAP_PRUNE_STRIDE );
+        if ( nNodes > pTarget[0] || (uSign & ~(unsigned)pTarget[1]) )
+            continue;
+        for ( i = 0; i < nNodes; i++ )
+        {
+            for ( m = 0; m < pTarget[0]; m++ )
+                if ( ppNodes[i]->Num == pTarget[2+m] )
+                    break;
+            if ( m == pTarget[0] )
+                break;
+        }
+        if ( i == nNodes )
+            return 1;
+    }
+    return 0;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Returns 1 if the cut has the given leaves.]
+
+  Description []
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Map_CutPruneEqual( Map_Cut_t * pCut, int * pLeaves, int nLeaves )
+{
+    int i, m;
+    if ( pCut->nLeaves != nLeaves )
+        return 0;
+    for ( i = 0; i < nLeaves; i++ )
+    {
+        for ( m = 0; m < nLeaves; m++ )
+            if ( pCut->ppLeaves[m]->Num == pLeaves[i] )
+                break;
+        if ( m == nLeaves )
+            return 0;
+    }
+    return 1;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Places the predicted cuts of each node first.]
+
+  Description [After pruned enumeration, the cut indexes of the cut table 
+  no longer hold. The cuts of each node are reordered as the cut made of 
+  the fanins, followed by the predicted cuts and by the remaining cuts, 
+  and CutChoices is set to the new indexes of the predicted cuts. Truth 
+  tables and matching are only needed for the first CutCounter+1 cuts.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_CutPruneReorder( Map_Man_t * p )
+{
+    Vec_Ptr_t * vCuts;
+    Map_Node_t * pNode;
+    Map_Cut_t * pCut, * pPrev;
+    Map_Node_t * ppFanins[2];
+    int * pTarget;
+    int i, k, iCut, nMissing = 0;
+    vCuts = Vec_PtrAlloc( 100 );
+    for ( i = 0; i < p->vMapObjs->nSize; i++ )
+    {
+        pNode = p->vMapObjs->pArray[i];
+        if ( !Map_NodeIsAnd(pNode) || pNode->pCuts == NULL )
+            continue;
+        Vec_PtrClear( vCuts );
+        // the cut made of the fanins comes first
+        ppFanins[0] = Map_Regular(pNode->p1);
+        ppFanins[1] = Map_Regular(pNode->p2);
+        for ( pCut = pNode->pCuts->pNext; pCut; pCut = pCut->pNext )
+            if ( pCut->nLeaves == 2 && ((pCut->ppLeaves[0] == ppFanins[0] && pCut->ppLeaves[1] == ppFanins[1]) || 
+                                        (pCut->ppLeaves[0] == ppFanins[1] && pCut->ppLeaves[1] == ppFanins[0])) )
+            {
+                Vec_PtrPush( vCuts, pCut );
+                break;
+            }
+        // the predicted cuts come next
+        ABC_FREE( pNode->CutChoices );
+        pNode->CutCounter = 0;
+        if ( Vec_IntSize(Vec_WecEntry(p->vPruneOwn, i)) > 0 )
+            pNode->CutChoices = ABC_ALLOC( int, Vec_IntSize(Vec_WecEntry(p->vPruneOwn, i)) );
+        Vec_IntForEachEntry( Vec_WecEntry(p->vPruneOwn, i), iCut, k )
+        {
+            pTarget = Vec_IntEntryP( p->vPruneCuts, iCut * MAP_PRUNE_STRIDE );
+            for ( pCut = pNode->pCuts->pNext; pCut; pCut = pCut->pNext )
+                if ( Map_CutPruneEqual( pCut, pTarget + 2, pTarget[0] ) )
+                    break;
+            if ( pCut == NULL )
+            {
+                nMissing++;
+                continue;
+            }
+            if ( Vec_PtrFind( vCuts, pCut ) == -1 )
+                Vec_PtrPush( vCuts, pCut );
+            pNode->CutChoices[pNode->CutCounter++] = Vec_PtrFind( vCuts, pCut );
+        }
+        // the remaining cuts come last
+        for ( pCut = pNode->pCuts->pNext; pCut; pCut = pCut->pNext )
+            if ( Vec_PtrFind( vCuts, pCut ) == -1 )
+                Vec_PtrPush( vCuts, pCut );
+        // relink the cuts after the elementary cut
+        pPrev = pNode->pCuts;
+        Vec_PtrForEachEntry( Map_Cut_t *, vCuts, pCut, k )
+            pPrev = pPrev->pNext = pCut;
+        pPrev->pNext = NULL;
+    }
+    Vec_PtrFree( vCuts );
+    if ( nMissing )
+        printf( "Warning: %d predicted cuts were not found among the enumerated cuts.\n", nMissing );
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Mixes a value into a 64-bit structural signature.]
+
+  Description []
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+static inline word Map_CutSigMix( word Sig, word Value )
+{
+    Sig ^= Value + ABC_CONST(0x9E3779B97F4A7C15) + (Sig << 6) + (Sig >> 2);
+    Sig *= ABC_CONST(0xFF51AFD7ED558CCD);
+    Sig ^= Sig >> 33;
+    return Sig;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Computes structural signatures of all nodes.]
+
+  Description [The signature of a node hashes its fanin cone up to nDepth
+  levels: the node types, the complemented attributes of the edges and 
+  the fanout counts of the nodes in the cone. It does not depend on node 
+  numbers, so that the same cone has the same signature after the rest of 
+  the network was edited. Fanins are combined in a commutative way. 
+  Returns an array indexed by node number, to be freed by the caller.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+word * Map_CutComputeSignatures( Map_Man_t * pMan, int nDepth )
+{
+    Map_Node_t * pNode, * pFan0, * pFan1;
+    word * pSigs, * pSigsPrev, * pTemp, Sig0, Sig1;
+    int i, d, nObjs = pMan->vMapObjs->nSize;
+    pSigs     = ABC_CALLOC( word, nObjs );
+    pSigsPrev = ABC_CALLOC( word, nObjs );
+    for ( d = 0; d <= nDepth; d++ )
+    {
+        for ( i = 0; i < nObjs; i++ )
+        {
+            pNode = pMan->vMapObjs->pArray[i];
+            if ( Map_NodeIsVar(pNode) )
+                pSigs[i] = Map_CutSigMix( 1, pNode->nRefs );
+            else if ( d == 0 )
+                pSigs[i] = Map_CutSigMix( 2, pNode->nRefs );
+            else if ( Map_NodeIsBuf(pNode) )
+            {
+                pFan0 = Map_Regular(pNode->p1);
+                Sig0  = Map_NodeIsConst(pFan0) ? 4 : pSigsPrev[pFan0->Num];
+                pSigs[i] = Map_CutSigMix( Map_CutSigMix( 3, Sig0 ^ Map_IsComplement(pNode->p1) ), pNode->nRefs );
+            }
+            else
+            {
+                pFan0 = Map_Regular(pNode->p1);
+                pFan1 = Map_Regular(pNode->p2);
+                Sig0  = Map_CutSigMix( Map_NodeIsConst(pFan0) ? 4 : pSigsPrev[pFan0->Num], Map_IsComplement(pNode->p1) );
+                Sig1  = Map_CutSigMix( Map_NodeIsConst(pFan1) ? 4 : pSigsPrev[pFan1->Num], Map_IsComplement(pNode->p2) );
+                if ( Sig0 > Sig1 )
+                    Sig0 ^= Sig1, Sig1 ^= Sig0, Sig0 ^= Sig1;
+                pSigs[i] = Map_CutSigMix( Map_CutSigMix( Map_CutSigMix( 5, Sig0 ), Sig1 ), pNode->nRefs );
+            }
+        }
+        pTemp = pSigsPrev; pSigsPrev = pSigs; pSigs = pTemp;
+    }
+    ABC_FREE( pSigs );
+    return pSigsPrev;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Dumps the cut table, cut features and node embedding of a chunk of nodes.]
+
+  Description [Lines are appended to the buffers of the chunk, so that 
+  chunks can be processed in parallel and written in the order of nodes.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_CutDumpNodes( Map_DumpThData_t * p )
+{
+    Map_Node_t * pNode;
+    Map_Cut_t * pCut;
+    int pEmbed[MAP_EMBED_NUM], i, cutCounter;
+    Vec_StrClear( p->vCuts );
+    Vec_StrClear( p->vFeats );
+    Vec_StrClear( p->vEmbed );
+    for ( i = p->iStart; i < p->iStop; i++ )
+    {
+        pNode = p->pMan->vMapObjs->pArray[i];
+        // skip primary inputs and secondary nodes if mapping with choices
+        if ( !Map_NodeIsAnd( pNode ) || pNode->pRepr )
+            continue;
+        Map_NodeComputeEmbed( pNode, p->totalLevel, pEmbed );
+        Vec_StrPrintF( p->vEmbed, "%d,%d,%u,%u,%u,%u,%d,%u,%u,%d,%d,%llu\n", pNode->Num, pEmbed[MAP_EMBED_EFO], pEmbed[MAP_EMBED_ELVL], pEmbed[MAP_EMBED_EINV], pEmbed[MAP_EMBED_EC1INV], pEmbed[MAP_EMBED_EC1LVL], pEmbed[MAP_EMBED_EC1FO], pEmbed[MAP_EMBED_EC2INV], pEmbed[MAP_EMBED_EC2LVL], pEmbed[MAP_EMBED_EC2FO], pEmbed[MAP_EMBED_ERELVL], (unsigned long long)(p->pSigs[pNode->Num] >> 1) );
+        for ( pCut = pNode->pCuts->pNext, cutCounter = 0; pCut; pCut = pCut->pNext, cutCounter++ )
+        {
+            Map_CutPrint2_( p->pMan, pCut, pNode, p->vCuts );
+            Map_DumpCutFeatures( p->pMan, pNode, pCut, p->vFeats, cutCounter, p->totalLevel );
+        }
+    }
+}
+
+#ifdef ABC_USE_PTHREADS
+void * Map_CutDumpWorker( void * pArg )
+{
+    Map_CutDumpNodes( (Map_DumpThData_t *)pArg );
+    return NULL;
+}
+#endif
+
+/**Function*************************************************************
+
+  Synopsis    [Dumps the cut table, cut features and node embedding.]
+
+  Description [Node embedding includes the structural signature of each 
+  node computed with cones of nSigDepth levels. Once cuts and matches are 
+  computed, nodes are dumped independently: each round, nThreads threads 
+  dump consecutive chunks of MAP_DUMP_CHUNK nodes into their own buffers, 
+  which are then written in the order of chunks. The files do not depend 
+  on the number of threads.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Map_CutDumpTable (Map_Man_t * pMan, char * filename, char *featFile, char * nodesFile, int nSigDepth, int nThreads)
+{
+    Map_DumpThData_t ThData[MAP_DUMP_PROC_MAX];
     Map_Node_t * pNode; 
+    ProgressBar * pProgress;
+    FILE * feat; 
+    FILE * cutT; 
+    FILE * nodeEmbed; 
+    word * pSigs;
+    int i, t, iStart, totalLevel, nObjs = pMan->vMapObjs->nSize;
     Map_MappingSetChoiceLevels( pMan ); // should always be called before mapManping!
     // compute the cuts of nodes in the DFS order
     Map_MappingCuts( pMan );
@@ -1347,23 +1839,14 @@ int Map_CutDumpTable (Map_Man_t * pMan, char * filename, char *featFile, char *
         printf("ERROR while matching cuts!!\n");
         return 0;
     }
-    ProgressBar * pProgress;
-    FILE * feat; 
-    FILE * cutT; 
-    FILE * nodeEmbed; 
+#ifndef ABC_USE_PTHREADS
+    nThreads = 1;
+#endif
+    nThreads = Abc_MinInt( Abc_MaxInt(nThreads, 1), MAP_DUMP_PROC_MAX );
 
     if ( filename != "")
     {  
-        cutT = fopen(filename, "w+");
-        feat = fopen(featFile, "w+");
-        nodeEmbed = fopen(nodesFile, "w+");
-
-        fprintf(feat, "nodeid,fon,lvln,invn,invp1,lvlp1,fop1,invp2,lvlp2,fop2,tt,invc,leavesc,volumec,mincutlvl,maxcutlvl,cutlvl,cutminfo,cutmaxfo,cutfo,cutidx,relativelvl,l1id,l2id,l3id,l4id,l5id\n");
-        fprintf(nodeEmbed, "eid,efo,elvl,einv,ec1inv,ec1lvl,ec1fo,ec2inv,ec2lvl,ec2fo,erelvl\n");
-        pProgress = Extra_ProgressBarStart( stdout, pMan->vMapObjs->nSize );
-        int totalLevel = Map_MappingGetMaxLevel(pMan); 
-        // node features for aggregation
-        for ( i = 0; i < pMan->vMapObjs->nSize; i++ )
+        for ( i = 0; i < nObjs; i++ )
         {
             // for each node 
             pNode = pMan->vMapObjs->pArray[i];
@@ -1382,49 +1865,69 @@ int Map_CutDumpTable (Map_Man_t * pMan, char * filename, char *featFile, char *
             // make sure that at least one non-trival cut is present
             if ( pNode->pCuts->pNext == NULL )
             {
-                Extra_ProgressBarStop( pProgress );
                 printf( "\nError: A node in the mapping graph does not have feasible cuts.\n" );
                 return 0;
             }
-            int relativeLevel = totalLevel - pNode->Level;
-            fprintf(nodeEmbed, "%d,%d,%u,%u,%u,%u,%d,%u,%u,%d,%d\n", pNode->Num, pNode->nRefs, pNode->Level, pNode->fInv, pNode->p1->fInv, pNode->p1->Level, pNode->p1->nRefAct[2], pNode->p2->fInv, pNode->p2->Level, pNode->p2->nRefAct[2], relativeLevel);
         }
 
-        for ( i = 0; i < pMan->vMapObjs->nSize; i++ )
+        cutT = fopen(filename, "w+");
+        feat = fopen(featFile, "w+");
+        nodeEmbed = fopen(nodesFile, "w+");
+
+        fprintf(feat, "nodeid,fon,lvln,invn,invp1,lvlp1,fop1,invp2,lvlp2,fop2,tt,invc,leavesc,volumec,mincutlvl,maxcutlvl,cutlvl,cutminfo,cutmaxfo,cutfo,cutidx,relativelvl,l1id,l2id,l3id,l4id,l5id\n");
+        fprintf(nodeEmbed, "eid,efo,elvl,einv,ec1inv,ec1lvl,ec1fo,ec2inv,ec2lvl,ec2fo,erelvl,esig\n");
+        pSigs = Map_CutComputeSignatures( pMan, nSigDepth );
+        totalLevel = Map_MappingGetMaxLevel(pMan); 
+        for ( t = 0; t < nThreads; t++ )
         {
-            // for each node 
-            pNode = pMan->vMapObjs->pArray[i];
-            if ( Map_NodeIsBuf(pNode) )
+            ThData[t].pMan       = pMan;
+            ThData[t].pSigs      = pSigs;
+            ThData[t].totalLevel = totalLevel;
+            ThData[t].vCuts      = Vec_StrAlloc( 1 << 16 );
+            ThData[t].vFeats     = Vec_StrAlloc( 1 << 16 );
+            ThData[t].vEmbed     = Vec_StrAlloc( 1 << 16 );
+        }
+        pProgress = Extra_ProgressBarStart( stdout, nObjs );
+        for ( iStart = 0; iStart < nObjs; iStart += nThreads * MAP_DUMP_CHUNK )
+        {
+            for ( t = 0; t < nThreads; t++ )
             {
-                assert( pNode->p2 == NULL );
-                pNode->tArrival[0] = Map_Regular(pNode->p1)->tArrival[ Map_IsComplement(pNode->p1)];
-                pNode->tArrival[1] = Map_Regular(pNode->p1)->tArrival[!Map_IsComplement(pNode->p1)];
-                continue;
+                ThData[t].iStart = Abc_MinInt( iStart + t * MAP_DUMP_CHUNK, nObjs );
+                ThData[t].iStop  = Abc_MinInt( iStart + (t + 1) * MAP_DUMP_CHUNK, nObjs );
             }
-
-            // skip primary inputs and secondary nodes if mapping with choices
-            if ( !Map_NodeIsAnd( pNode ) || pNode->pRepr )
-                continue;
-
-            // make sure that at least one non-trival cut is present
-            if ( pNode->pCuts->pNext == NULL )
+#ifdef ABC_USE_PTHREADS
+            if ( nThreads > 1 )
             {
-                Extra_ProgressBarStop( pProgress );
-                printf( "\nError: A node in the mapping graph does not have feasible cuts.\n" );
-                return 0;
+                pthread_t WorkerThread[MAP_DUMP_PROC_MAX];
+                int status;
+                for ( t = 1; t < nThreads; t++ )
+                {
+                    status = pthread_create( WorkerThread + t, NULL, Map_CutDumpWorker, (void *)(ThData + t) );  assert( status == 0 );
+                }
+                Map_CutDumpNodes( ThData );
+                for ( t = 1; t < nThreads; t++ )
+                {
+                    status = pthread_join( WorkerThread[t], NULL );  assert( status == 0 );
+                }
             }
-
-            //printf("Counting cuts!\n"); 
-            int cutCounter = 0; 
-            Map_Cut_t * pCut;
-            int randIndex = 1; 
-            //printf("Printing cuts for node %d\n", pNode->Num); 
-            for ( pCut = pNode->pCuts->pNext; pCut; pCut = pCut->pNext )
+            else
+#endif
+            Map_CutDumpNodes( ThData );
+            // write the chunks in the order of nodes
+            for ( t = 0; t < nThreads; t++ )
             {
-                Map_CutPrint2_(pMan, pCut, pNode, cutT);
-                Map_DumpCutFeatures( pMan, pNode, pCut, feat, cutCounter); 
-                cutCounter++; 
+                fwrite( Vec_StrArray(ThData[t].vCuts),  1, Vec_StrSize(ThData[t].vCuts),  cutT );
+                fwrite( Vec_StrArray(ThData[t].vFeats), 1, Vec_StrSize(ThData[t].vFeats), feat );
+                fwrite( Vec_StrArray(ThData[t].vEmbed), 1, Vec_StrSize(ThData[t].vEmbed), nodeEmbed );
             }
+            Extra_ProgressBarUpdate( pProgress, ThData[nThreads-1].iStop, NULL );
+        }
+        Extra_ProgressBarStop( pProgress );
+        for ( t = 0; t < nThreads; t++ )
+        {
+            Vec_StrFree( ThData[t].vCuts );
+            Vec_StrFree( ThData[t].vFeats );
+            Vec_StrFree( ThData[t].vEmbed );
         }
         if (filename != "")
             fclose(cutT);
@@ -1432,6 +1935,7 @@ int Map_CutDumpTable (Map_Man_t * pMan, char * filename, char *featFile, char *
             fclose(feat);
         if (featFile != "")
             fclose(nodeEmbed);
+        ABC_FREE( pSigs );
     }   
     return 1;  
 }
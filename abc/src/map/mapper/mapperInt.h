@@ -61,6 +61,26 @@ ABC_NAMESPACE_HEADER_START
 #define MAP_FLOAT_LARGE          ((float)(FLT_MAX/10))
 #define MAP_FLOAT_SMALL          ((float)1.0e-03)
 
+// the number of entries per predicted cut: the number of leaves, the signature and the leaves
+#define MAP_PRUNE_STRIDE         8
+
+// the columns of cut features, in the order dumped by prepare_map -F
+enum {
+    MAP_FEAT_NODEID, MAP_FEAT_FON, MAP_FEAT_LVLN, MAP_FEAT_INVN, 
+    MAP_FEAT_INVP1, MAP_FEAT_LVLP1, MAP_FEAT_FOP1, MAP_FEAT_INVP2, MAP_FEAT_LVLP2, MAP_FEAT_FOP2, 
+    MAP_FEAT_TT, MAP_FEAT_INVC, MAP_FEAT_LEAVESC, MAP_FEAT_VOLUMEC, 
+    MAP_FEAT_MINCUTLVL, MAP_FEAT_MAXCUTLVL, MAP_FEAT_CUTLVL, MAP_FEAT_CUTMINFO, MAP_FEAT_CUTMAXFO, MAP_FEAT_CUTFO, 
+    MAP_FEAT_CUTIDX, MAP_FEAT_RELATIVELVL, MAP_FEAT_L1ID, MAP_FEAT_L2ID, MAP_FEAT_L3ID, MAP_FEAT_L4ID, MAP_FEAT_L5ID, 
+    MAP_FEAT_NUM
+};
+
+// the columns of node embedding, in the order dumped by prepare_map -n (without the node ID and signature)
+enum {
+    MAP_EMBED_EFO, MAP_EMBED_ELVL, MAP_EMBED_EINV, MAP_EMBED_EC1INV, MAP_EMBED_EC1LVL, MAP_EMBED_EC1FO, 
+    MAP_EMBED_EC2INV, MAP_EMBED_EC2LVL, MAP_EMBED_EC2FO, MAP_EMBED_ERELVL, 
+    MAP_EMBED_NUM
+};
+
 // generating random unsigned (#define RAND_MAX 0x7fff)
 #define MAP_RANDOM_UNSIGNED   ((((unsigned)rand()) << 24) ^ (((unsigned)rand()) << 12) ^ ((unsigned)rand()))
 
@@ -133,6 +153,11 @@ struct Map_ManStruct_t_
     int                 nCountsBest[32];// the counter of minterms
     Map_NodeVec_t *     vVisited;      // the visited cuts during cut computation
 
+    // predicted cuts used to prune cut enumeration
+    Vec_Int_t *         vPruneCuts;    // leaves of predicted cuts (MAP_PRUNE_STRIDE entries per cut)
+    Vec_Wec_t *         vPruneOwn;     // for each node, its own predicted cuts
+    Vec_Wec_t *         vPruneTargets; // for each node, predicted cuts whose cone contains the node
+
     // the memory managers
     Extra_MmFixed_t *   mmNodes;       // the memory manager for nodes
     Extra_MmFixed_t *   mmCuts;        // the memory manager for cuts
@@ -164,6 +189,22 @@ struct Map_ManStruct_t_
     abctime             time3;         // time to transfer to the mapping structure
 };
 
+// the CNN used to score cuts (see nn/src/CNN.py)
+struct Map_CnnStruct_t_
+{
+    int                 nRows;         // the number of rows of the feature tensor
+    int                 nCols;         // the number of columns of the feature tensor
+    int                 nFilters;      // the number of convolution filters
+    int                 nKernelR;      // the number of rows of the convolution kernel
+    int                 nKernelC;      // the number of columns of the convolution kernel
+    int                 nDense;        // the number of dense layers (the last one gives the classes)
+    int *               pSizes;        // the number of inputs of each dense layer, followed by the number of classes
+    float *             pConvW;        // the convolution kernel [nKernelR][nKernelC][nFilters]
+    float *             pConvB;        // the convolution bias [nFilters]
+    float **            ppDenseW;      // the dense kernels [pSizes[i]][pSizes[i+1]]
+    float **            ppDenseB;      // the dense biases [pSizes[i+1]]
+};
+
 // the supergate library
 struct Map_SuperLibStruct_t_
 {
@@ -220,7 +261,7 @@ struct Map_NodeStruct_t_
     float               nRefEst[3];    // actual fanout for previous covering phase, neg and pos and sum
     float               Switching;     // the probability of switching
     int                 CutCounter;    // number of cuts to consider from CutChoices
-    int                 CutChoices[5000];// vector with choices for mapping
+    int *               CutChoices;    // indexes of cuts to consider for mapping
 
     // connectivity
     Map_Node_t *        p1;            // the first child
@@ -361,6 +402,8 @@ struct Map_HashEntryStruct_t_
 /*=== mapperCanon.c =============================================================*/
 /*=== mapperCut.c ===============================================================*/
 extern void              Map_MappingCuts( Map_Man_t * p );
+extern void              Map_CutComputeFeatures( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, int cutIdx, int totalLevel, int * pFeats );
+extern void              Map_NodeComputeEmbed( Map_Node_t * pNode, int totalLevel, int * pEmbed );
 /*=== mapperCutUtils.c ===============================================================*/
 extern Map_Cut_t *       Map_CutAlloc( Map_Man_t * p );
 extern void              Map_CutFree( Map_Man_t * p, Map_Cut_t * pCut );
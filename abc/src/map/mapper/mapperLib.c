@@ -17,13 +17,18 @@
 ***********************************************************************/
 #define _BSD_SOURCE
 
-#ifndef WIN32
+#ifdef WIN32
+#include <io.h> 
+#else
 #include <unistd.h>
+#include <sys/stat.h>
 #endif
 
 #include "mapperInt.h"
 #include "map/super/super.h"
 #include "map/mapper/mapperInt.h"
+#include "base/cmd/cmd.h"
+#include "misc/util/utilSignal.h"
 
 ABC_NAMESPACE_IMPL_START
 
@@ -32,6 +37,12 @@ ABC_NAMESPACE_IMPL_START
 ///                        DECLARATIONS                              ///
 ////////////////////////////////////////////////////////////////////////
 
+// supergate libraries derived from genlib are cached in the directory given 
+// by ABC variable "super_cache" (e.g. "set super_cache ." in abc.rc), in 
+// files named by a hash of the genlib library and the derivation parameters;
+// the version is part of the hash and should be changed with the parameters
+#define MAP_SUPER_CACHE_VERSION 1
+
 ////////////////////////////////////////////////////////////////////////
 ///                     FUNCTION DEFINITIONS                         ///
 ////////////////////////////////////////////////////////////////////////
@@ -187,7 +198,7 @@ void Map_SuperLibFree( Map_SuperLib_t * p )
 
 /**Function*************************************************************
 
-  Synopsis    [Derives the library from the genlib library.]
+  Synopsis    [Adds data to the FNV-1a hash.]
 
   Description []
                
@@ -195,22 +206,199 @@ void Map_SuperLibFree( Map_SuperLib_t * p )
 
   SeeAlso     []
 
+***********************************************************************/
+static word Map_SuperLibHashAdd( word Hash, void * pData, int nBytes )
+{
+    unsigned char * pBytes = (unsigned char *)pData;
+    int i;
+    for ( i = 0; i < nBytes; i++ )
+        Hash = (Hash ^ pBytes[i]) * ABC_CONST(0x100000001B3);
+    return Hash;
+}
+static word Map_SuperLibHashStr( word Hash, char * pStr )
+{
+    return Map_SuperLibHashAdd( Hash, pStr, pStr ? strlen(pStr) + 1 : 0 );
+}
+static word Map_SuperLibHashNum( word Hash, double Num )
+{
+    return Map_SuperLibHashAdd( Hash, &Num, sizeof(double) );
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Returns the name of the cache file of the supergate library.]
+
+  Description [The name depends on the gates of the genlib library (names,
+  functions, areas, pins, delays and profile) and on the parameters of
+  the derivation given as a string. Returns NULL if the cache is not used.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+static char * Map_SuperLibCacheName( Mio_Library_t * pLib, char * pParams )
+{
+    char * pDir = Cmd_FlagReadByName( Abc_FrameGetGlobalFrame(), "super_cache" );
+    char * pFileName;
+    Mio_Gate_t * pGate;
+    Mio_Pin_t * pPin;
+    word Hash = ABC_CONST(0xCBF29CE484222325);
+    if ( pDir == NULL || pDir[0] == 0 )
+        return NULL;
+    Hash = Map_SuperLibHashNum( Hash, MAP_SUPER_CACHE_VERSION );
+    Hash = Map_SuperLibHashStr( Hash, pParams );
+    Hash = Map_SuperLibHashStr( Hash, Mio_LibraryReadName(pLib) );
+    Mio_LibraryForEachGate( pLib, pGate )
+    {
+        Hash = Map_SuperLibHashStr( Hash, Mio_GateReadName(pGate) );
+        Hash = Map_SuperLibHashStr( Hash, Mio_GateReadOutName(pGate) );
+        Hash = Map_SuperLibHashStr( Hash, Mio_GateReadForm(pGate) );
+        Hash = Map_SuperLibHashNum( Hash, Mio_GateReadArea(pGate) );
+        Hash = Map_SuperLibHashNum( Hash, Mio_GateReadProfile(pGate) );
+        Mio_GateForEachPin( pGate, pPin )
+        {
+            Hash = Map_SuperLibHashStr( Hash, Mio_PinReadName(pPin) );
+            Hash = Map_SuperLibHashNum( Hash, Mio_PinReadPhase(pPin) );
+            Hash = Map_SuperLibHashNum( Hash, Mio_PinReadInputLoad(pPin) );
+            Hash = Map_SuperLibHashNum( Hash, Mio_PinReadMaxLoad(pPin) );
+            Hash = Map_SuperLibHashNum( Hash, Mio_PinReadDelayBlockRise(pPin) );
+            Hash = Map_SuperLibHashNum( Hash, Mio_PinReadDelayFanoutRise(pPin) );
+            Hash = Map_SuperLibHashNum( Hash, Mio_PinReadDelayBlockFall(pPin) );
+            Hash = Map_SuperLibHashNum( Hash, Mio_PinReadDelayFanoutFall(pPin) );
+        }
+    }
+    pFileName = ABC_ALLOC( char, strlen(pDir) + 40 );
+    sprintf( pFileName, "%s/super_%016llx.super", pDir, (unsigned long long)Hash );
+    return pFileName;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Reads the cached supergate library in one read.]
+
+  Description [Returns NULL if the file does not exist or is incomplete.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+static Vec_Str_t * Map_SuperLibCacheRead( char * pFileName )
+{
+    Vec_Str_t * vStr;
+    int nSize;
+    FILE * pFile = fopen( pFileName, "rb" );
+    if ( pFile == NULL )
+        return NULL;
+    fseek( pFile, 0, SEEK_END );
+    nSize = ftell( pFile );
+    rewind( pFile );
+    vStr = Vec_StrStart( Abc_MaxInt(nSize, 1) );
+    if ( nSize <= 0 || (int)fread( Vec_StrArray(vStr), 1, nSize, pFile ) != nSize || Vec_StrEntryLast(vStr) != 0 )
+        Vec_StrFreeP( &vStr );
+    fclose( pFile );
+    return vStr;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Writes the supergate library into the cache.]
+
+  Description [The library is written into a temporary file, which is then 
+  renamed, so that processes sharing the cache never read a partial file.
+  The temporary file is created readable only by its owner, so it is made
+  readable by everybody, subject to umask, for other users of the cache.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+static void Map_SuperLibCacheWrite( char * pFileName, Vec_Str_t * vStr )
+{
+    char * pTempName;
+    FILE * pFile;
+    int fd, RetValue;
+#ifndef WIN32
+    mode_t Mask;
+#endif
+    fd = Util_SignalTmpFile( pFileName, ".tmp", &pTempName );
+    if ( fd == -1 )
+        return;
+#ifdef WIN32
+    _close( fd );
+#else
+    Mask = umask( 0 );
+    umask( Mask );
+    fchmod( fd, 0644 & ~Mask );
+    close( fd );
+#endif
+    pFile = fopen( pTempName, "wb" );
+    RetValue = pFile && (int)fwrite( Vec_StrArray(vStr), 1, Vec_StrSize(vStr), pFile ) == Vec_StrSize(vStr);
+    if ( pFile )
+        RetValue &= fclose( pFile ) == 0;
+    if ( !RetValue || rename( pTempName, pFileName ) != 0 )
+        remove( pTempName );
+    ABC_FREE( pTempName );
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Derives the library from the genlib library.]
+
+  Description [If ABC variable "super_cache" is set, the supergates are 
+  read from the cache, or computed and added to it.]
+               
+  SideEffects []
+
+  SeeAlso     []
+
 ***********************************************************************/
 int Map_SuperLibDeriveFromGenlib( Mio_Library_t * pLib, int fVerbose )
 {
     Map_SuperLib_t * pLibSuper;
-    Vec_Str_t * vStr;
-    char * pFileName;
+    Vec_Str_t * vStr = NULL;
+    char * pFileName, * pCacheName;
+    char pParams[200];
+    int nVarsMax = 5, nLevels = 1, nGatesMax = 100000000, TimeLimit = 100, fSkipInv = 1;
+    float tDelayMax = 10000000, tAreaMax = 10000000;
     if ( pLib == NULL )
         return 0;
+    pFileName = Extra_FileNameGenericAppend( Mio_LibraryReadName(pLib), ".super" );
+
+    // read supergates from the cache
+    sprintf( pParams, "%d %d %d %g %g %d %d", nVarsMax, nLevels, nGatesMax, tDelayMax, tAreaMax, TimeLimit, fSkipInv );
+    pCacheName = Map_SuperLibCacheName( pLib, pParams );
+    if ( pCacheName )
+        vStr = Map_SuperLibCacheRead( pCacheName );
+    if ( vStr )
+    {
+        pLibSuper = Map_SuperLibCreate( pLib, vStr, pFileName, NULL, 1, 0 );
+        Vec_StrFree( vStr );
+        if ( pLibSuper && fVerbose )
+            printf( "Read supergate library from cache \"%s\".\n", pCacheName );
+        if ( pLibSuper )
+        {
+            ABC_FREE( pCacheName );
+            Map_SuperLibFree( (Map_SuperLib_t *)Abc_FrameReadLibSuper() );
+            Abc_FrameSetLibSuper( pLibSuper );
+            return 1;
+        }
+    }
 
     // compute supergates
-    vStr = Super_PrecomputeStr( pLib, 5, 1, 100000000, 10000000, 10000000, 100, 1, 0 );
+    vStr = Super_PrecomputeStr( pLib, nVarsMax, nLevels, nGatesMax, tDelayMax, tAreaMax, TimeLimit, fSkipInv, 0 );
     if ( vStr == NULL )
+    {
+        ABC_FREE( pCacheName );
         return 0;
+    }
+    if ( pCacheName )
+        Map_SuperLibCacheWrite( pCacheName, vStr );
+    ABC_FREE( pCacheName );
 
     // create supergate library
-    pFileName = Extra_FileNameGenericAppend( Mio_LibraryReadName(pLib), ".super" );
     pLibSuper = Map_SuperLibCreate( pLib, vStr, pFileName, NULL, 1, 0 );
     Vec_StrFree( vStr );
 
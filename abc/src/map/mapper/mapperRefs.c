@@ -601,7 +601,7 @@ void Map_MappingPrintCuts_rec( Map_Man_t * pMan, Map_Node_t * pNode )
     cutLevel = pNodeR->Level - minLevel; 
     int relativeLevel = totalLevel - pNodeR->Level;
     //printf("%d,%d,%d,%d,%d,%d,-2,end\n", pNodeR->Num, leavesIdx[0], leavesIdx[1], leavesIdx[2], leavesIdx[3], leavesIdx[4]);
-    printf("%d,%d,%u,%u,%u,%u,%d,%u,%u,%d,%u,%d,%d,%d,%d,%d,%d,%d,%d,%d,1000000,%d,%d,%d,%d,%d,%d,%s\n", pNodeR->Num, pNodeR->nRefs, pNodeR->Level, pNodeR->fInv, pNodeR->p1->fInv, pNodeR->p1->Level, pNodeR->p1->nRefAct[2], pNodeR->p2->fInv, pNodeR->p2->Level, pNodeR->p2->nRefAct[2], pCut->M[fPhase].pSuperBest->uTruth, fPhase, pCut->nLeaves, pCut->nVolume, minLevel, maxLevel, cutLevel, minFo, maxFo, cutFo, relativeLevel, leavesIdx[0], leavesIdx[1], leavesIdx[2], leavesIdx[3], leavesIdx[4] , Mio_GateReadName( rootGate ));
+    printf("%d,%d,%u,%u,%u,%u,%d,%u,%u,%d,%u,%d,%d,%d,%d,%d,%d,%d,%d,%d,1000000,%d,%d,%d,%d,%d,%d,%s\n", pNodeR->Num, pNodeR->nRefs, pNodeR->Level, pNodeR->fInv, pNodeR->p1->fInv, pNodeR->p1->Level, pNodeR->p1->nRefAct[2], pNodeR->p2->fInv, pNodeR->p2->Level, pNodeR->p2->nRefAct[2], pCut->M[fPhase].pSuperBest->uTruth[0], fPhase, pCut->nLeaves, pCut->nVolume, minLevel, maxLevel, cutLevel, minFo, maxFo, cutFo, relativeLevel, leavesIdx[0], leavesIdx[1], leavesIdx[2], leavesIdx[3], leavesIdx[4] , Mio_GateReadName( rootGate ));
     // printf("%d,%u,%s,%d,%d,%d\n", 
     //     pNodeR->Num, Mio_GateReadTruthP( rootGate ), Mio_GateReadName( rootGate ), fPhase, pCut->nLeaves, pCut->nVolume); 
     
@@ -0,0 +1,427 @@
+/**CFile****************************************************************
+
+  FileName    [mapperScore.c]
+
+  PackageName [MVSIS 1.3: Multi-valued logic synthesis system.]
+
+  Synopsis    [Scoring cuts with a CNN to select the cuts used for mapping.]
+
+  Author      [MVSIS Group]
+
+  Affiliation [UC Berkeley]
+
+  Date        [Ver. 2.0. Started - June 1, 2004.]
+
+  Revision    [$Id: mapperScore.c,v 1.0 $]
+
+***********************************************************************/
+
+#include "mapperInt.h"
+
+ABC_NAMESPACE_IMPL_START
+
+
+////////////////////////////////////////////////////////////////////////
+///                        DECLARATIONS                              ///
+////////////////////////////////////////////////////////////////////////
+
+// the header of the weight file written by CNN.exportWeights() in nn/src/CNN.py
+#define MAP_CNN_MAGIC      0x4E4E434D  // "MCNN" read as a little-endian int
+#define MAP_CNN_VERSION    1
+
+// the shape of the feature tensor built by NodeCut.py
+#define MAP_CNN_ROWS       15
+#define MAP_CNN_COLS       10
+
+static void Map_CnnForward( Map_Cnn_t * p, float * pIn, int nBatch, float * pBuf0, float * pBuf1, int * pClasses );
+static void Map_CutComputeTensor( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, int cutIdx, int totalLevel, int * pEmbeds, float * pTensor );
+
+////////////////////////////////////////////////////////////////////////
+///                     FUNCTION DEFINITIONS                         ///
+////////////////////////////////////////////////////////////////////////
+
+/**Function*************************************************************
+
+  Synopsis    [Reads the CNN weights.]
+
+  Description [The file is little-endian. It starts with int32 values:
+  magic, version, rows and columns of the feature tensor, number of
+  filters, rows and columns of the convolution kernel, number of dense
+  layers and the number of units of each dense layer. It is followed by
+  float32 values: the convolution kernel and bias, then the kernel and
+  bias of each dense layer, all in the layout used by Keras.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+Map_Cnn_t * Map_CnnRead( char * pFileName )
+{
+    Map_Cnn_t * p;
+    FILE * pFile;
+    int pHeader[8], i, nConv, RetValue = 1;
+    pFile = fopen( pFileName, "rb" );
+    if ( pFile == NULL )
+    {
+        printf( "Cannot open CNN weight file \"%s\".\n", pFileName );
+        return NULL;
+    }
+    if ( fread( pHeader, sizeof(int), 8, pFile ) != 8 || pHeader[0] != MAP_CNN_MAGIC || pHeader[1] != MAP_CNN_VERSION )
+    {
+        printf( "File \"%s\" is not a CNN weight file of version %d.\n", pFileName, MAP_CNN_VERSION );
+        fclose( pFile );
+        return NULL;
+    }
+    if ( pHeader[2] != MAP_CNN_ROWS || pHeader[3] != MAP_CNN_COLS || pHeader[4] <= 0 ||
+         pHeader[5] <= 0 || pHeader[5] > pHeader[2] || pHeader[6] <= 0 || pHeader[6] > pHeader[3] || pHeader[7] <= 0 )
+    {
+        printf( "CNN in file \"%s\" does not take %d x %d cut features.\n", pFileName, MAP_CNN_ROWS, MAP_CNN_COLS );
+        fclose( pFile );
+        return NULL;
+    }
+    p = ABC_CALLOC( Map_Cnn_t, 1 );
+    p->nRows    = pHeader[2];
+    p->nCols    = pHeader[3];
+    p->nFilters = pHeader[4];
+    p->nKernelR = pHeader[5];
+    p->nKernelC = pHeader[6];
+    p->nDense   = pHeader[7];
+    p->pSizes   = ABC_ALLOC( int, p->nDense + 1 );
+    p->pSizes[0] = (p->nRows - p->nKernelR + 1) * (p->nCols - p->nKernelC + 1) * p->nFilters;
+    RetValue &= (fread( p->pSizes + 1, sizeof(int), p->nDense, pFile ) == (size_t)p->nDense);
+    for ( i = 1; RetValue && i <= p->nDense; i++ )
+        RetValue &= (p->pSizes[i] > 0);
+    // read the weights
+    if ( RetValue )
+    {
+        nConv = p->nKernelR * p->nKernelC * p->nFilters;
+        p->pConvW = ABC_ALLOC( float, nConv );
+        p->pConvB = ABC_ALLOC( float, p->nFilters );
+        RetValue &= (fread( p->pConvW, sizeof(float), nConv, pFile ) == (size_t)nConv);
+        RetValue &= (fread( p->pConvB, sizeof(float), p->nFilters, pFile ) == (size_t)p->nFilters);
+        p->ppDenseW = ABC_CALLOC( float *, p->nDense );
+        p->ppDenseB = ABC_CALLOC( float *, p->nDense );
+        for ( i = 0; RetValue && i < p->nDense; i++ )
+        {
+            p->ppDenseW[i] = ABC_ALLOC( float, p->pSizes[i] * p->pSizes[i+1] );
+            p->ppDenseB[i] = ABC_ALLOC( float, p->pSizes[i+1] );
+            RetValue &= (fread( p->ppDenseW[i], sizeof(float), p->pSizes[i] * p->pSizes[i+1], pFile ) == (size_t)(p->pSizes[i] * p->pSizes[i+1]));
+            RetValue &= (fread( p->ppDenseB[i], sizeof(float), p->pSizes[i+1], pFile ) == (size_t)p->pSizes[i+1]);
+        }
+    }
+    fclose( pFile );
+    if ( !RetValue )
+    {
+        printf( "CNN weight file \"%s\" is truncated or corrupted.\n", pFileName );
+        Map_CnnFree( p );
+        return NULL;
+    }
+    return p;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Deletes the CNN.]
+
+  Description []
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_CnnFree( Map_Cnn_t * p )
+{
+    int i;
+    for ( i = 0; p->ppDenseW && i < p->nDense; i++ )
+    {
+        ABC_FREE( p->ppDenseW[i] );
+        ABC_FREE( p->ppDenseB[i] );
+    }
+    ABC_FREE( p->ppDenseW );
+    ABC_FREE( p->ppDenseB );
+    ABC_FREE( p->pConvW );
+    ABC_FREE( p->pConvB );
+    ABC_FREE( p->pSizes );
+    ABC_FREE( p );
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Computes the classes of a batch of feature tensors.]
+
+  Description [Applies the convolution and the dense layers with ReLU,
+  as in the CNN used for training (dropout does nothing at inference).
+  The class is the largest output of the last layer, so its softmax is
+  skipped. The buffers hold nBatch times the largest layer.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_CnnForward( Map_Cnn_t * p, float * pIn, int nBatch, float * pBuf0, float * pBuf1, int * pClasses )
+{
+    int nOutR = p->nRows - p->nKernelR + 1;
+    int nOutC = p->nCols - p->nKernelC + 1;
+    int b, r, c, kr, kc, f, i, k, l, nIn, nOut;
+    float * pTensor, * pOut, * pW, * pTemp, Value;
+    // convolution, the output is flattened as rows x columns x filters
+    for ( b = 0; b < nBatch; b++ )
+    {
+        pTensor = pIn + b * p->nRows * p->nCols;
+        for ( r = 0; r < nOutR; r++ )
+        for ( c = 0; c < nOutC; c++ )
+        {
+            pOut = pBuf0 + b * p->pSizes[0] + (r * nOutC + c) * p->nFilters;
+            memcpy( pOut, p->pConvB, sizeof(float) * p->nFilters );
+            for ( kr = 0; kr < p->nKernelR; kr++ )
+            for ( kc = 0; kc < p->nKernelC; kc++ )
+            {
+                Value = pTensor[(r + kr) * p->nCols + c + kc];
+                if ( Value == 0 )
+                    continue;
+                pW = p->pConvW + (kr * p->nKernelC + kc) * p->nFilters;
+                for ( f = 0; f < p->nFilters; f++ )
+                    pOut[f] += Value * pW[f];
+            }
+            for ( f = 0; f < p->nFilters; f++ )
+                pOut[f] = Abc_MaxFloat( pOut[f], 0 );
+        }
+    }
+    // dense layers
+    for ( l = 0; l < p->nDense; l++ )
+    {
+        nIn  = p->pSizes[l];
+        nOut = p->pSizes[l+1];
+        for ( b = 0; b < nBatch; b++ )
+        {
+            pTensor = pBuf0 + b * nIn;
+            pOut = pBuf1 + b * nOut;
+            memcpy( pOut, p->ppDenseB[l], sizeof(float) * nOut );
+            for ( i = 0; i < nIn; i++ )
+            {
+                if ( pTensor[i] == 0 )
+                    continue;
+                pW = p->ppDenseW[l] + i * nOut;
+                for ( k = 0; k < nOut; k++ )
+                    pOut[k] += pTensor[i] * pW[k];
+            }
+            if ( l < p->nDense - 1 )
+                for ( k = 0; k < nOut; k++ )
+                    pOut[k] = Abc_MaxFloat( pOut[k], 0 );
+        }
+        pTemp = pBuf0; pBuf0 = pBuf1; pBuf1 = pTemp;
+    }
+    // the class is the largest output
+    nOut = p->pSizes[p->nDense];
+    for ( b = 0; b < nBatch; b++ )
+    {
+        pOut = pBuf0 + b * nOut;
+        pClasses[b] = 0;
+        for ( k = 1; k < nOut; k++ )
+            if ( pOut[k] > pOut[pClasses[b]] )
+                pClasses[b] = k;
+    }
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Builds the feature tensor of one cut.]
+
+  Description [Follows NodeCut.py: the first row holds the node features,
+  the next five rows hold the embedding of the leaves (zeros for leaves
+  without embedding), and each of the last nine rows repeats one cut
+  feature. pEmbeds holds MAP_EMBED_NUM values for each node, all zeros 
+  if the node has no embedding.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_CutComputeTensor( Map_Man_t * pMan, Map_Node_t * pNode, Map_Cut_t * pCut, int cutIdx, int totalLevel, int * pEmbeds, float * pTensor )
+{
+    static int pNodeCols[MAP_CNN_COLS] = {
+        MAP_FEAT_FON, MAP_FEAT_LVLN, MAP_FEAT_RELATIVELVL, MAP_FEAT_INVN, MAP_FEAT_INVP1,
+        MAP_FEAT_LVLP1, MAP_FEAT_FOP1, MAP_FEAT_INVP2, MAP_FEAT_LVLP2, MAP_FEAT_FOP2 };
+    static int pCutRows[MAP_CNN_ROWS - 6] = {
+        MAP_FEAT_INVC, MAP_FEAT_LEAVESC, MAP_FEAT_VOLUMEC, MAP_FEAT_MINCUTLVL, MAP_FEAT_MAXCUTLVL,
+        MAP_FEAT_CUTLVL, MAP_FEAT_CUTMINFO, MAP_FEAT_CUTMAXFO, MAP_FEAT_CUTFO };
+    int pFeats[MAP_FEAT_NUM], * pEmbed, i, k, Leaf;
+    Map_CutComputeFeatures( pMan, pNode, pCut, cutIdx, totalLevel, pFeats );
+    for ( k = 0; k < MAP_CNN_COLS; k++ )
+        pTensor[k] = (float)pFeats[pNodeCols[k]];
+    for ( i = 0; i < 5; i++ )
+    {
+        Leaf = pFeats[MAP_FEAT_L1ID + i];
+        pEmbed = Leaf >= 0 ? pEmbeds + Leaf * MAP_EMBED_NUM : NULL;
+        for ( k = 0; k < MAP_CNN_COLS; k++ )
+            pTensor[(1 + i) * MAP_CNN_COLS + k] = pEmbed ? (float)pEmbed[k] : 0;
+    }
+    for ( i = 0; i < MAP_CNN_ROWS - 6; i++ )
+        for ( k = 0; k < MAP_CNN_COLS; k++ )
+            pTensor[(6 + i) * MAP_CNN_COLS + k] = (float)pFeats[pCutRows[i]];
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Selects the cuts used for mapping by scoring them with a CNN.]
+
+  Description [Computes cuts and the initial matches as done by prepare_map
+  before dumping features, builds the feature tensor of each cut in memory
+  and classifies the cuts in batches of nBatch. Cuts are then selected as
+  in CutSelect.py: a cut is selected if its class is at most GoodClass,
+  and a cut with class at most FairClass is selected while its node has at
+  most one selected cut. Sets CutChoices of each node to the indexes of the
+  selected cuts. Returns 0 if matching has failed.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Map_MappingScoreCuts( Map_Man_t * p, Map_Cnn_t * pCnn, int nBatch, int GoodClass, int FairClass, int fVerbose )
+{
+    Map_Node_t * pNode;
+    Map_Cut_t * pCut;
+    Vec_Int_t * vClasses;
+    float * pTensors, * pBuf0, * pBuf1;
+    int * pEmbeds, * pClasses;
+    int i, k, nCuts, nFilled = 0, nSelected = 0, nBufSize = 0, totalLevel, Class, iCut;
+    abctime clk = Abc_Clock();
+    // compute the cuts and the initial matches as done by prepare_map
+    Map_MappingSetChoiceLevels( p );
+    Map_MappingCuts( p );
+    Map_MappingTruths( p );
+    Map_MappingEstimateRefsInit( p );
+    p->fMappingMode = 0;
+    if ( !Map_MappingMatches( p ) )
+        return 0;
+    // compute the embedding of the nodes dumped by prepare_map
+    totalLevel = Map_MappingGetMaxLevel( p );
+    pEmbeds = ABC_CALLOC( int, p->vMapObjs->nSize * MAP_EMBED_NUM );
+    for ( i = 0; i < p->vMapObjs->nSize; i++ )
+    {
+        pNode = p->vMapObjs->pArray[i];
+        if ( Map_NodeIsAnd(pNode) && !pNode->pRepr )
+            Map_NodeComputeEmbed( pNode, totalLevel, pEmbeds + i * MAP_EMBED_NUM );
+    }
+    // classify the cuts in batches
+    for ( k = 0; k <= pCnn->nDense; k++ )
+        nBufSize = Abc_MaxInt( nBufSize, pCnn->pSizes[k] );
+    pTensors = ABC_ALLOC( float, nBatch * MAP_CNN_ROWS * MAP_CNN_COLS );
+    pBuf0    = ABC_ALLOC( float, nBatch * nBufSize );
+    pBuf1    = ABC_ALLOC( float, nBatch * nBufSize );
+    pClasses = ABC_ALLOC( int, nBatch );
+    vClasses = Vec_IntAlloc( 1000 );
+    for ( i = 0; i < p->vMapObjs->nSize; i++ )
+    {
+        pNode = p->vMapObjs->pArray[i];
+        if ( !Map_NodeIsAnd(pNode) || pNode->pRepr )
+            continue;
+        for ( pCut = pNode->pCuts->pNext, k = 0; pCut; pCut = pCut->pNext, k++ )
+        {
+            Map_CutComputeTensor( p, pNode, pCut, k, totalLevel, pEmbeds, pTensors + nFilled * MAP_CNN_ROWS * MAP_CNN_COLS );
+            if ( ++nFilled < nBatch )
+                continue;
+            Map_CnnForward( pCnn, pTensors, nFilled, pBuf0, pBuf1, pClasses );
+            Vec_IntPushArray( vClasses, pClasses, nFilled );
+            nFilled = 0;
+        }
+    }
+    if ( nFilled > 0 )
+    {
+        Map_CnnForward( pCnn, pTensors, nFilled, pBuf0, pBuf1, pClasses );
+        Vec_IntPushArray( vClasses, pClasses, nFilled );
+    }
+    ABC_FREE( pTensors );
+    ABC_FREE( pBuf0 );
+    ABC_FREE( pBuf1 );
+    ABC_FREE( pClasses );
+    ABC_FREE( pEmbeds );
+    // select the cuts in the same order
+    iCut = 0;
+    for ( i = 0; i < p->vMapObjs->nSize; i++ )
+    {
+        pNode = p->vMapObjs->pArray[i];
+        if ( !Map_NodeIsAnd(pNode) || pNode->pRepr )
+            continue;
+        for ( pCut = pNode->pCuts->pNext, nCuts = 0; pCut; pCut = pCut->pNext )
+            nCuts++;
+        ABC_FREE( pNode->CutChoices );
+        pNode->CutCounter = 0;
+        if ( nCuts > 0 )
+            pNode->CutChoices = ABC_ALLOC( int, nCuts );
+        for ( k = 0; k < nCuts; k++ )
+        {
+            Class = Vec_IntEntry( vClasses, iCut++ );
+            if ( Class <= GoodClass || (Class <= FairClass && pNode->CutCounter <= 1) )
+                pNode->CutChoices[pNode->CutCounter++] = k;
+        }
+        nSelected += pNode->CutCounter;
+    }
+    assert( iCut == Vec_IntSize(vClasses) );
+    if ( fVerbose )
+    {
+        printf( "Scored %d cuts and selected %d cuts.  ", Vec_IntSize(vClasses), nSelected );
+        ABC_PRT( "Time", Abc_Clock() - clk );
+    }
+    Vec_IntFree( vClasses );
+    return 1;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Transfers the selected cuts to another manager.]
+
+  Description [Both managers should be derived from the same network, so
+  that nodes have the same numbers and cuts are enumerated in the same
+  order. If fPrune is set, the leaves of the selected cuts are used to
+  prune cut enumeration in pTo (see Map_ManPruneAddCut), otherwise the
+  cut indexes are copied.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+void Map_ManTransferChoices( Map_Man_t * pFrom, Map_Man_t * pTo, int fPrune )
+{
+    Map_Node_t * pNode, * pNodeTo;
+    Map_Cut_t * pCut;
+    int pLeaves[6], i, k, c;
+    assert( pFrom->vMapObjs->nSize == pTo->vMapObjs->nSize );
+    for ( i = 0; i < pFrom->vMapObjs->nSize; i++ )
+    {
+        pNode   = pFrom->vMapObjs->pArray[i];
+        pNodeTo = pTo->vMapObjs->pArray[i];
+        if ( pNode->CutCounter == 0 )
+            continue;
+        if ( !fPrune )
+        {
+            ABC_FREE( pNodeTo->CutChoices );
+            pNodeTo->CutChoices = ABC_ALLOC( int, pNode->CutCounter );
+            memcpy( pNodeTo->CutChoices, pNode->CutChoices, sizeof(int) * pNode->CutCounter );
+            pNodeTo->CutCounter = pNode->CutCounter;
+            continue;
+        }
+        for ( pCut = pNode->pCuts->pNext, k = c = 0; pCut && c < pNode->CutCounter; pCut = pCut->pNext, k++ )
+        {
+            if ( k != pNode->CutChoices[c] )
+                continue;
+            for ( c++, k = 0; k < pCut->nLeaves; k++ )
+                pLeaves[k] = pCut->ppLeaves[k]->Num;
+            Map_ManPruneAddCut( pTo, i, pLeaves, pCut->nLeaves );
+            k = pNode->CutChoices[c-1];
+        }
+    }
+}
+
+////////////////////////////////////////////////////////////////////////
+///                       END OF FILE                                ///
+////////////////////////////////////////////////////////////////////////
+
+
+ABC_NAMESPACE_IMPL_END
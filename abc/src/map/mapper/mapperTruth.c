@@ -49,7 +49,7 @@ void Map_MappingTruths( Map_Man_t * pMan )
     ProgressBar * pProgress;
     Map_Node_t * pNode;
     Map_Cut_t * pCut;
-    int nNodes, i;
+    int nNodes, nCuts, i, k;
     // compute the cuts for the POs
     nNodes = pMan->vMapObjs->nSize;
     pProgress = Extra_ProgressBarStart( stdout, nNodes );
@@ -72,8 +72,9 @@ void Map_MappingTruths( Map_Man_t * pMan )
         pNode->pCuts->M[1].uPhaseBest = 1;
         pNode->pCuts->M[1].pSuperBest = pMan->pSuperLib->pSuperInv;
 
-        // match the rest of the cuts
-        for ( pCut = pNode->pCuts->pNext; pCut; pCut = pCut->pNext )
+        // match the rest of the cuts (only the fanin cut and predicted cuts when pruning)
+        nCuts = pMan->vPruneCuts ? pNode->CutCounter + 1 : ABC_INFINITY;
+        for ( pCut = pNode->pCuts->pNext, k = 0; pCut && k < nCuts; pCut = pCut->pNext, k++ )
              Map_TruthsCut( pMan, pCut );
         Extra_ProgressBarUpdate( pProgress, i, "Tables ..." );
     }
@@ -0,0 +1,163 @@
+/**CFile****************************************************************
+
+  FileName    [utilNpy.c]
+
+  SystemName  [ABC: Logic synthesis and verification system.]
+
+  PackageName [Writing arrays in NumPy format.]
+
+  Synopsis    [Writes arrays and CSR graphs as .npy files.]
+
+  Author      [Alan Mishchenko]
+
+  Affiliation [UC Berkeley]
+
+  Date        [Ver. 1.0. Started - June 20, 2005.]
+
+  Revision    [$Id: utilNpy.c,v 1.0 $]
+
+***********************************************************************/
+
+#include <stdio.h>
+#include <string.h>
+#include <stdlib.h>
+#include <assert.h>
+
+#include "abc_global.h"
+#include "misc/vec/vec.h"
+#include "utilNpy.h"
+
+ABC_NAMESPACE_IMPL_START
+
+
+////////////////////////////////////////////////////////////////////////
+///                        DECLARATIONS                              ///
+////////////////////////////////////////////////////////////////////////
+
+// the files are in NPY format version 1.0, which numpy.load() can memory-map:
+// magic string, version, header length, header dictionary padded with spaces
+// so that the data is aligned to 64 bytes, then the raw data of a
+// one-dimensional array in the byte order of this machine
+
+////////////////////////////////////////////////////////////////////////
+///                     FUNCTION DEFINITIONS                         ///
+////////////////////////////////////////////////////////////////////////
+
+/**Function*************************************************************
+
+  Synopsis    [Writes a one-dimensional array into a .npy file.]
+
+  Description [Type is the NumPy kind of the items ('i' for signed
+  integers, 'u' for unsigned integers, 'f' for floats) and nItemSize
+  is their size in bytes. Returns 1 on success.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Abc_NpyWrite( char * pFileName, char Type, int nItemSize, void * pData, int nItems )
+{
+    char pHeader[128];
+    int One = 1, nHeader, RetValue;
+    FILE * pFile = fopen( pFileName, "wb" );
+    if ( pFile == NULL )
+    {
+        printf( "Cannot open file \"%s\" for writing.\n", pFileName );
+        return 0;
+    }
+    nHeader = sprintf( pHeader, "{'descr': '%c%c%d', 'fortran_order': False, 'shape': (%d,), }",
+        *(char *)&One ? '<' : '>', Type, nItemSize, nItems );
+    // pad the header with spaces and end it with a new line
+    while ( (10 + nHeader + 1) % 64 )
+        pHeader[nHeader++] = ' ';
+    pHeader[nHeader++] = '\n';
+    fwrite( "\x93NUMPY\x01\x00", 1, 8, pFile );
+    fputc( nHeader & 0xFF, pFile );
+    fputc( nHeader >> 8, pFile );
+    fwrite( pHeader, 1, nHeader, pFile );
+    RetValue = (int)fwrite( pData, nItemSize, nItems, pFile ) == nItems;
+    fclose( pFile );
+    if ( !RetValue )
+        printf( "Cannot write data into file \"%s\".\n", pFileName );
+    return RetValue;
+}
+
+/**Function*************************************************************
+
+  Synopsis    [Writes a graph in CSR format as .npy files.]
+
+  Description [The graph has nRows nodes. Each pair (Fanin, Fanout) of
+  vEdges is a directed edge between two rows. The neighbors of each row
+  are its fanins, in the order of the edges, followed by its fanouts.
+  Writes <pPrefix>_offsets.npy (int64, nRows+1 entries; the neighbors of
+  row r are indices[offsets[r]:offsets[r+1]]), <pPrefix>_indices.npy
+  (int32), <pPrefix>_fanins.npy (int32, the number of fanins of each row)
+  and, if vIds is given, <pPrefix>_ids.npy (int32, an ID of each row).
+  Returns 1 on success.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Abc_CsrWrite( char * pPrefix, int nRows, Vec_Int_t * vEdges, Vec_Int_t * vIds )
+{
+    char * pFileName = ABC_ALLOC( char, strlen(pPrefix) + 20 );
+    word * pOffsets  = ABC_CALLOC( word, nRows + 1 );
+    int * pFanins    = ABC_CALLOC( int, nRows );
+    int * pFill      = ABC_CALLOC( int, nRows );
+    int * pIndices   = ABC_ALLOC( int, Vec_IntSize(vEdges) );
+    int i, iFanin, iFanout, RetValue = 1;
+    assert( Vec_IntSize(vEdges) % 2 == 0 );
+    assert( vIds == NULL || Vec_IntSize(vIds) == nRows );
+    // count the neighbors
+    for ( i = 0; i + 1 < Vec_IntSize(vEdges); i += 2 )
+    {
+        iFanin  = Vec_IntEntry( vEdges, i );
+        iFanout = Vec_IntEntry( vEdges, i+1 );
+        assert( iFanin >= 0 && iFanin < nRows && iFanout >= 0 && iFanout < nRows );
+        pFanins[iFanout]++;
+        pOffsets[iFanin+1]++;
+        pOffsets[iFanout+1]++;
+    }
+    for ( i = 0; i < nRows; i++ )
+        pOffsets[i+1] += pOffsets[i];
+    // place fanins first, fanouts after them
+    for ( i = 0; i + 1 < Vec_IntSize(vEdges); i += 2 )
+    {
+        iFanout = Vec_IntEntry( vEdges, i+1 );
+        pIndices[pOffsets[iFanout] + pFill[iFanout]++] = Vec_IntEntry( vEdges, i );
+    }
+    for ( i = 0; i + 1 < Vec_IntSize(vEdges); i += 2 )
+    {
+        iFanin = Vec_IntEntry( vEdges, i );
+        pIndices[pOffsets[iFanin] + pFill[iFanin]++] = Vec_IntEntry( vEdges, i+1 );
+    }
+    // write the arrays
+    sprintf( pFileName, "%s_offsets.npy", pPrefix );
+    RetValue &= Abc_NpyWrite( pFileName, 'i', sizeof(word), pOffsets, nRows + 1 );
+    sprintf( pFileName, "%s_indices.npy", pPrefix );
+    RetValue &= Abc_NpyWrite( pFileName, 'i', sizeof(int), pIndices, Vec_IntSize(vEdges) );
+    sprintf( pFileName, "%s_fanins.npy", pPrefix );
+    RetValue &= Abc_NpyWrite( pFileName, 'i', sizeof(int), pFanins, nRows );
+    if ( vIds )
+    {
+        sprintf( pFileName, "%s_ids.npy", pPrefix );
+        RetValue &= Abc_NpyWrite( pFileName, 'i', sizeof(int), Vec_IntArray(vIds), nRows );
+    }
+    ABC_FREE( pFileName );
+    ABC_FREE( pOffsets );
+    ABC_FREE( pFanins );
+    ABC_FREE( pFill );
+    ABC_FREE( pIndices );
+    return RetValue;
+}
+
+////////////////////////////////////////////////////////////////////////
+///                       END OF FILE                                ///
+////////////////////////////////////////////////////////////////////////
+
+
+ABC_NAMESPACE_IMPL_END
+
@@ -0,0 +1,51 @@
+/**CFile****************************************************************
+
+  FileName    [utilNpy.h]
+
+  SystemName  [ABC: Logic synthesis and verification system.]
+
+  PackageName [Writing arrays in NumPy format.]
+
+  Synopsis    [External declarations.]
+
+  Author      [Alan Mishchenko]
+  
+  Affiliation [UC Berkeley]
+
+  Date        [Ver. 1.0. Started - June 20, 2005.]
+
+  Revision    [$Id: utilNpy.h,v 1.0 $]
+
+***********************************************************************/
+
+#ifndef ABC__misc__util__utilNpy_h
+#define ABC__misc__util__utilNpy_h
+
+
+////////////////////////////////////////////////////////////////////////
+///                          INCLUDES                                ///
+////////////////////////////////////////////////////////////////////////
+
+////////////////////////////////////////////////////////////////////////
+///                         PARAMETERS                               ///
+////////////////////////////////////////////////////////////////////////
+
+ABC_NAMESPACE_HEADER_START
+
+////////////////////////////////////////////////////////////////////////
+///                    FUNCTION DECLARATIONS                         ///
+////////////////////////////////////////////////////////////////////////
+
+/*=== utilNpy.c ===============================================================*/
+extern int             Abc_NpyWrite( char * pFileName, char Type, int nItemSize, void * pData, int nItems );
+extern int             Abc_CsrWrite( char * pPrefix, int nRows, Vec_Int_t * vEdges, Vec_Int_t * vIds );
+
+
+ABC_NAMESPACE_HEADER_END
+
+#endif
+
+////////////////////////////////////////////////////////////////////////
+///                       END OF FILE                                ///
+////////////////////////////////////////////////////////////////////////
+
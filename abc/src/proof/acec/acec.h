@@ -86,6 +86,7 @@ extern void          Ree_ManPrintAdders( Vec_Int_t * vAdds, int fVerbose );
 /*=== acecTree.c ========================================================*/
 extern Gia_Man_t *   Acec_Normalize( Gia_Man_t * pGia, int fBooth, int fVerbose );
 extern void Gia_EdgelistGraphSAGE( Gia_Man_t * pGia, char *f0, char *f1, char *f2);
+extern int  Gia_EdgelistCsr( Gia_Man_t * p, char * pPrefix );
 
 ABC_NAMESPACE_HEADER_END
 
@@ -21,6 +21,7 @@
 #include "acecInt.h"
 #include "misc/vec/vecWec.h"
 #include "misc/extra/extra.h"
+#include "misc/util/utilNpy.h"
 
 ABC_NAMESPACE_IMPL_START
 
@@ -416,6 +417,59 @@ void Gia_edgelist(Gia_Man_t * p, char *f0, char *f1, char *f2)
 
 }
 
+/**Function*************************************************************
+
+  Synopsis    [Writes the AIG as a CSR graph aligned with the mapper.]
+
+  Description [Rows are CIs, then AND nodes in the DFS order from the
+  COs, then COs, which is the order of the nodes of the mapper for the
+  same AIG (see Abc_NtkMapCsrWrite()). The constant node and dangling
+  nodes have no row. The ID of each row is the object ID used by
+  &edgelist (Gia_ObjId()-1). See Abc_CsrWrite() for the files.]
+
+  SideEffects []
+
+  SeeAlso     []
+
+***********************************************************************/
+int Gia_EdgelistCsr( Gia_Man_t * p, char * pPrefix )
+{
+    Vec_Int_t * vRows = Vec_IntStartFull( Gia_ManObjNum(p) );
+    Vec_Int_t * vAnds = Vec_IntAlloc( Gia_ManAndNum(p) );
+    Vec_Int_t * vIds, * vEdges;
+    Gia_Obj_t * pObj;
+    int i, Id, RetValue;
+    Gia_ManIncrementTravId( p );
+    Gia_ManCollectAnds( p, Vec_IntArray(p->vCos), Vec_IntSize(p->vCos), vAnds, NULL );
+    vIds = Vec_IntAlloc( Gia_ManCiNum(p) + Vec_IntSize(vAnds) + Gia_ManCoNum(p) );
+    Vec_IntAppend( vIds, p->vCis );
+    Vec_IntAppend( vIds, vAnds );
+    Vec_IntAppend( vIds, p->vCos );
+    Vec_IntFree( vAnds );
+    // collect the edges between rows
+    Vec_IntForEachEntry( vIds, Id, i )
+        Vec_IntWriteEntry( vRows, Id, i );
+    vEdges = Vec_IntAlloc( 4 * Vec_IntSize(vIds) );
+    Vec_IntForEachEntry( vIds, Id, i )
+    {
+        pObj = Gia_ManObj( p, Id );
+        if ( Gia_ObjIsCi(pObj) )
+            continue;
+        if ( Vec_IntEntry(vRows, Gia_ObjFaninId0(pObj, Id)) >= 0 )
+            Vec_IntPushTwo( vEdges, Vec_IntEntry(vRows, Gia_ObjFaninId0(pObj, Id)), i );
+        if ( Gia_ObjIsAnd(pObj) && Vec_IntEntry(vRows, Gia_ObjFaninId1(pObj, Id)) >= 0 )
+            Vec_IntPushTwo( vEdges, Vec_IntEntry(vRows, Gia_ObjFaninId1(pObj, Id)), i );
+    }
+    // write the object IDs used by &edgelist
+    Vec_IntForEachEntry( vIds, Id, i )
+        Vec_IntWriteEntry( vIds, i, Id - 1 );
+    RetValue = Abc_CsrWrite( pPrefix, Vec_IntSize(vIds), vEdges, vIds );
+    Vec_IntFree( vRows );
+    Vec_IntFree( vIds );
+    Vec_IntFree( vEdges );
+    return RetValue;
+}
+
 int isAdds(int id, Vec_Int_t * vAdds)
 {
     int i;
@@ -27,6 +27,10 @@ my $model = "cnn";
 my $infModel = "rc16b";
 my $classes = 10; 
 my $inference = 0; 
+my $jobs = 1;         # ABC rounds run in parallel
+my $queue = 16;       # finished rounds waiting to be ingested, including running ones
+my $shard_rounds = 10; # rounds per dataset shard
+my $min_shards = 0;   # shards needed to start training, 0 waits for all rounds
 
 # change your path here
 my $csv_data = '/home/walterl/cleanLearning/data/csv/'; 
@@ -56,9 +60,23 @@ while ( scalar(@ARGV) != 0 ) { #While non-empty
   elsif ( $token eq "-inference" ) {
 		$inference = shift(@ARGV);
   }
+  elsif ( $token eq "-jobs" ) {
+		$jobs = shift(@ARGV);
+  }
+  elsif ( $token eq "-queue" ) {
+		$queue = shift(@ARGV);
+  }
+  elsif ( $token eq "-shard_rounds" ) {
+		$shard_rounds = shift(@ARGV);
+  }
+  elsif ( $token eq "-min_shards" ) {
+		$min_shards = shift(@ARGV);
+  }
 }
+# the queue must hold a full shard besides the running rounds
+$queue = $shard_rounds + $jobs if ( $queue < $shard_rounds + $jobs );
 
-print "parameters: $ckt $lib_file $rounds $epochs $train $validation $model\n";
+print "parameters: $ckt $lib_file $rounds $epochs $train $validation $model $jobs $queue $shard_rounds $min_shards\n";
 
 # set-up filenames 
 my @name = split('\.', $ckt);
@@ -70,64 +88,191 @@ my $cktName = $name[0];
 my $filename = $cktName . '_train_hashed.csv'; 
 my %visited;
 open(FH, '>', $filename) or die $!; 
+# forked children must not flush output buffered by the parent again
+select((select(FH), $| = 1)[0]);
+$| = 1;
 
 my $feat = $cktName . '_feat_sweep.csv'; 
 my $embed = $cktName . '_node_embed.csv'; 
 my $cut_table = $cktName . '_cut_table.csv'; 
 
-for ( my $i = 1; $i <= $rounds ; $i++ )
-{
-  my @output = `./abc-train -c "read_lib -v $lib_file; r $ckt; st; map; topo; stime; q"`;
+# Sweep runs as a pipeline: ABC rounds (producers) put their output in
+# $round_dir, genShards.py (consumer) ingests it into CutStore shards while
+# ABC is still running, and training starts as soon as $min_shards shards
+# are ready, then runs again on all shards after the sweep. The queue of
+# rounds not yet ingested holds at most $queue rounds, counting the running
+# ones.
+my $round_dir = $cktName . '_rounds'; 
+my $shard_dir = $cktName . '_shards'; 
+my $store = $cktName . '_store.npz'; 
+my $target_store = $csv_work . $store; 
+my $target_train = $csv_data . $filename;
+my $target_embed = $csv_work . $embed; 
+my $target_feat = $csv_work . $feat; 
+system("rm -rf $round_dir $shard_dir"); 
+mkdir($round_dir) or die "$!";
+
+my $consumer_pid = fork(); 
+die "$!" unless defined $consumer_pid;
+if ( $consumer_pid == 0 ) {
+  exec("python", $csv_work . "genShards.py", $round_dir, $shard_dir, $shard_rounds) or die "$!";
+}
+
+my %running;        # pid of each running round
+my $queued = 0;     # rounds put in the queue
+my @round_points;   # data points of each queued round
+my $train_pid = 0; 
+my $trained_shards = 0; # shards used by the last training
+
+# number of rounds in the queue
+sub queue_size {
+  my @files = glob("$round_dir/round_*.log");
+  return scalar(@files);
+}
+
+# shards ready to be used
+sub ready_shards {
+  return sort(glob("$shard_dir/shard_*.npz"));
+}
+
+# moves a finished round to the queue unless its QoR was already seen
+sub finish_round {
+  my ($i) = @_;
+  my $out = "$round_dir/.round_$i.out";
+  open(my $fh, '<', $out) or die "$!";
+  my @output = <$fh>;
+  close($fh);
   #print "dbg: $output[$#output]";
   my @fields = split(', ', $output[$#output]);
-  #print "dbg: @fields";
-  #print "dbg: $fields[2], $fields[3]";
   my $toHash = $fields[2] * $fields[3];
-  #print "to hash value is $toHash\n";
   if (exists $visited{$toHash}) {
     print "QoR already seen $toHash\n";
+    unlink($out);
   }
   else {
-      $visited{$toHash} = 1;
-      print FH @output; 
-    }
-    print "$ckt iteration $i/$rounds\n";
+    $visited{$toHash} = 1;
+    print FH @output; 
+    $round_points[$queued] = scalar(grep { /^[0-9]+,[0-9]+,/ } @output);
+    rename($out, sprintf("%s/round_%06d.log", $round_dir, $queued)) or die "$!";
+    $queued++;
   }
+  print "$ckt iteration $i/$rounds\n";
+}
 
-  my $target_train = $csv_data . $filename;
-  my $target_embed = $csv_work . $embed; 
-  my $target_feat = $csv_work . $feat; 
-  my $train_file = $csv_work . $filename; 
+# trains on the given shards in a child process
+sub start_training {
+  my @shards = @_;
+  my $dataPoints = 0;
+  my $shard_points = scalar(@shards) * $shard_rounds;
+  $shard_points = $queued if ( $shard_points > $queued );
+  $dataPoints += $round_points[$_] for ( 0 .. $shard_points - 1 );
+  print "Training on " . scalar(@shards) . " shards\n";
+  $trained_shards = scalar(@shards);
+  $train_pid = fork(); 
+  die "$!" unless defined $train_pid;
+  return if ( $train_pid != 0 );
 
-  system("cp $filename $target_train"); 
+  system("python", $csv_work . "genStore.py", @shards, $target_store) == 0 or die "Merging shards has failed\n";
   system("cp $embed $target_embed"); 
   system("cp $feat $target_feat"); 
 
-  chdir($csv_work) or die "$!";
-  my @genCSV = `./genCSV.sh $target_train $train_file`;
-
   chdir($nn_work) or die "$!";
-  print "Train file is $train_file\n";
+  print "Train file is $target_store\n";
 
-  my $dataPoints = `wc -l < $train_file`;
   my $trainPoints = floor($train * $dataPoints);
   my $valPoints = floor($validation * $dataPoints); 
 
   print "Training points are $trainPoints, validation points are $valPoints\n";
 
+  my $status = 0;
   if ( $model eq "cnn") { 
     # set configurations on the shell script
-    `sed -i 's|##train_path##|$train_file|g' run-cnn-train.sh`;
+    `sed -i 's|##train_path##|$target_store|g' run-cnn-train.sh`;
     `sed -i 's/##classes##/$classes/g' run-cnn-train.sh`;
     `sed -i 's/##train_points##/$trainPoints/g' run-cnn-train.sh`;
     `sed -i 's/##validation_points##/$valPoints/g' run-cnn-train.sh`;
     `sed -i 's/##epochs##/$epochs/g' run-cnn-train.sh`;
     # calls the shell script
-    system("sh", "run-cnn-train.sh");
+    $status = system("sh", "run-cnn-train.sh");
     # reverts configuration
     `sed -i 's/$classes/##classes##/g' run-cnn-train.sh`;
     `sed -i 's/$trainPoints/##train_points##/g' run-cnn-train.sh`;
     `sed -i 's/$valPoints/##validation_points##/g' run-cnn-train.sh`;
     `sed -i 's/$epochs/##epochs##/g' run-cnn-train.sh`;
-    `sed -i 's|$train_file|##train_path##|g' run-cnn-train.sh`;
+    `sed -i 's|$target_store|##train_path##|g' run-cnn-train.sh`;
   }
+  exit($status == 0 ? 0 : 1);
+}
+
+# stops the consumer and running rounds before dying, so that the consumer
+# does not wait for rounds forever; training is left to restore its script
+sub stop_children {
+  my ($message) = @_;
+  my @pids = grep { $_ > 0 } ($consumer_pid, keys %running);
+  kill('TERM', @pids) if ( scalar(@pids) > 0 );
+  die $message;
+}
+
+# waits for a child process and handles it
+sub wait_child {
+  my $pid = waitpid(-1, WNOHANG);
+  if ( $pid <= 0 ) {
+    sleep(1);
+  }
+  elsif ( exists $running{$pid} ) {
+    finish_round($running{$pid});
+    delete $running{$pid};
+  }
+  elsif ( $pid == $consumer_pid ) {
+    $consumer_pid = 0;
+    stop_children("Shard generation has failed\n") if ( $? != 0 );
+  }
+  elsif ( $pid == $train_pid ) {
+    $train_pid = -1;
+    stop_children("Training has failed\n") if ( $? != 0 );
+    print "Training is done\n";
+  }
+  if ( $train_pid == 0 && $min_shards > 0 ) {
+    my @shards = ready_shards();
+    start_training(@shards[0 .. $min_shards - 1]) if ( scalar(@shards) >= $min_shards );
+  }
+}
+
+for ( my $i = 1; $i <= $rounds ; $i++ )
+{
+  while ( scalar(keys %running) >= $jobs || queue_size() + scalar(keys %running) >= $queue ) {
+    wait_child();
+  }
+  my $pid = fork(); 
+  die "$!" unless defined $pid;
+  if ( $pid == 0 ) {
+    exec("sh", "-c", "./abc-train -c \"read_lib -v $lib_file; r $ckt; st; map; topo; stime; q\" > $round_dir/.round_$i.out") or die "$!";
+  }
+  $running{$pid} = $i;
+}
+while ( scalar(keys %running) > 0 ) {
+  wait_child();
+}
+close(FH);
+
+# lets the consumer flush the last shard
+open(my $done, '>', "$round_dir/DONE") or die "$!";
+close($done);
+while ( $consumer_pid != 0 ) {
+  wait_child();
+}
+unlink("$round_dir/DONE");
+rmdir($round_dir);
+
+system("cp $filename $target_train"); 
+
+# training started early saw only part of the shards, so it is run again on
+# all of them once it is done
+while ( $train_pid > 0 ) {
+  wait_child();
+}
+my @shards = ready_shards();
+start_training(@shards) if ( $trained_shards < scalar(@shards) );
+while ( $train_pid > 0 ) {
+  wait_child();
+}
@@ -0,0 +1,49 @@
+import sys
+import os
+import glob
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../nn/src"))
+from CutStore import CutStore
+################################################################################
+## Configs
+# Usage: python genShards.py <round dir> <shard dir> <rounds per shard>
+# Consumer side of the sweep of train.pl: every round finished by ABC is
+# moved to roundDir as round_<seq>.log, and a file named DONE is created in
+# roundDir once all rounds are done. Rounds are ingested in order into CutStore
+# shards of roundsPerShard rounds, written as shardDir/shard_<idx>.npz, and
+# their files are removed so that train.pl can bound the number of queued
+# rounds. The last shard may hold fewer rounds.
+roundDir=str(sys.argv[1])
+shardDir=str(sys.argv[2])
+roundsPerShard=int(sys.argv[3])
+pollSeconds=1
+print("################################################################################")
+print("Starting shard generation with following variables:")
+print("  roundDir       = %s" % roundDir)
+print("  shardDir       = %s" % shardDir)
+print("  roundsPerShard = %s" % str(roundsPerShard))
+################################################################################
+## Ingests rounds until producer is done and queue is empty
+if not os.path.exists(shardDir):
+	os.makedirs(shardDir)
+shardIdx=len(glob.glob(os.path.join(shardDir, "shard_*.npz")))
+while True:
+	done=os.path.exists(os.path.join(roundDir, "DONE"))
+	roundFiles=sorted(glob.glob(os.path.join(roundDir, "round_*.log")))
+	if len(roundFiles) < roundsPerShard and not (done and roundFiles):
+		if done:
+			break
+		time.sleep(pollSeconds)
+		continue
+	roundFiles=roundFiles[:roundsPerShard]
+	cs=CutStore.merge([CutStore.fromSweepLog(roundFile) for roundFile in roundFiles])
+	# Written under a hidden name first, so that readers only see complete shards
+	shardFile=os.path.join(shardDir, "shard_%04d.npz" % shardIdx)
+	tmpFile=os.path.join(shardDir, ".shard_%04d.npz" % shardIdx)
+	cs.save(tmpFile)
+	os.rename(tmpFile, shardFile)
+	for roundFile in roundFiles:
+		os.remove(roundFile)
+	print("  Saved %s with %d rounds and %d distinct cuts" % (shardFile, cs.numRounds, len(cs.features)))
+	shardIdx=shardIdx+1
+print("  Saved %d shards" % shardIdx)
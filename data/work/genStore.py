@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../nn/src"))
+from CutStore import CutStore
+################################################################################
+## Configs
+# Usage: python genStore.py <sweep file, flat csv or stores...> <store>.npz
+# Input is either the raw sweep output of train.pl (same input as genCSV.sh),
+# a flat CSV already generated by genCSV.sh (detected by its header) or one or
+# more stores, such as the shards written by genShards.py, to be merged.
+inputFiles=sys.argv[1:-1]
+outputFile=str(sys.argv[-1])
+print("################################################################################")
+print("Starting CutStore generation with following variables:")
+print("  inputFiles = %s" % " ".join(inputFiles))
+print("  outputFile = %s" % outputFile)
+################################################################################
+## Read input
+if all(inputFile.endswith(".npz") for inputFile in inputFiles):
+	print("  Merging %d stores" % len(inputFiles))
+	cs=CutStore.merge([CutStore.load(inputFile) for inputFile in inputFiles])
+elif len(inputFiles) != 1:
+	raise ValueError("Only stores can be merged, got %s" % " ".join(inputFiles))
+else:
+	with open(inputFiles[0], 'r') as f:
+		header=f.readline()
+	if header.startswith(",".join(CutStore.featureColumns)):
+		print("  Reading flat CSV")
+		cs=CutStore.fromCSV(inputFiles[0])
+	else:
+		print("  Reading sweep output")
+		cs=CutStore.fromSweepLog(inputFiles[0])
+print("  Read %d rounds with %d distinct cuts" % (cs.numRounds, len(cs.features)))
+################################################################################
+# Save store
+print("  Saving CutStore to %s" % outputFile)
+cs.save(outputFile)
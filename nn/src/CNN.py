@@ -1,7 +1,22 @@
+import numpy as np
 import tensorflow as tf
 
 class CNN():
 
+	# Header of weight files read by ml_map in ABC
+	weightMagic=0x4E4E434D
+	weightVersion=1
+
+	# Default architecture, used for any key missing from a config
+	defaultConfig={
+		"convFilters" : 128,
+		"convKernel" : [15,1],
+		"denseLayers" : [128,128,128,128],
+		"dropout" : 0.1,
+		"optimizer" : "adam",
+		"learningRate" : None
+	}
+
 	## Constructor
 	#
 	# Creates object and model.
@@ -9,37 +24,52 @@ class CNN():
 	# \param self
 	# \param featureShape is a list with shape of input features
 	# \param numClasses is an integer with the number of classes to be classified
+	# \param config is an optional dictionary overriding keys of defaultConfig
 	# \return CNN model
-	def __init__(self, featureShape, numClasses):
+	def __init__(self, featureShape, numClasses, config=None):
+		# Merges config with defaults
+		self.__config=dict(CNN.defaultConfig)
+		if config is not None:
+			unknownKeys=set(config)-set(CNN.defaultConfig)-{"name"}
+			if unknownKeys:
+				raise ValueError("Unknown CNN config keys: %s" % ", ".join(sorted(unknownKeys)))
+			self.__config.update(config)
+		config=self.__config
 		# Clearup everything before running
 		tf.keras.backend.clear_session()
 		# Create model
 		model = tf.keras.models.Sequential()
 		# Add layers
-		model.add(tf.keras.layers.Conv2D(128, (15,1), activation='relu', input_shape=featureShape))
-		model.add(tf.keras.layers.Dropout(0.1))
+		model.add(tf.keras.layers.Conv2D(config["convFilters"], tuple(config["convKernel"]), activation='relu', input_shape=featureShape))
+		model.add(tf.keras.layers.Dropout(config["dropout"]))
 		#model.add(tf.keras.layers.MaxPooling2D(pool_size=(1, 10)))
 		# model.add(tf.keras.layers.Conv2D(128, (1,10), activation='relu'))
 		# model.add(tf.keras.layers.Dropout(0.1))
 		model.add(tf.keras.layers.Flatten())
-		model.add(tf.keras.layers.Dense(128, activation='relu'))
-		model.add(tf.keras.layers.Dropout(0.1))
-		model.add(tf.keras.layers.Dense(128, activation='relu'))
-		model.add(tf.keras.layers.Dropout(0.1))
-		model.add(tf.keras.layers.Dense(128, activation='relu'))
-		model.add(tf.keras.layers.Dropout(0.1))
-		model.add(tf.keras.layers.Dense(128, activation='relu'))
-		model.add(tf.keras.layers.Dropout(0.1))
+		for units in config["denseLayers"]:
+			model.add(tf.keras.layers.Dense(units, activation='relu'))
+			model.add(tf.keras.layers.Dropout(config["dropout"]))
 		model.add(tf.keras.layers.Dense(numClasses, activation='softmax'))
 		# lossFunction = 'binary_crossentropy'
 		# lossFunction = 'mean_squared_logarithmic_error'
 		# lossFunction = 'mean_squared_error'
 		# lossFunction = 'mean_absolute_error'
 		lossFunction = 'sparse_categorical_crossentropy'
-		model.compile(optimizer='adam', loss=lossFunction, metrics=["accuracy"])
+		optimizer = config["optimizer"]
+		if config["learningRate"] is not None:
+			optimizer = tf.keras.optimizers.get({"class_name" : optimizer, "config" : {"learning_rate" : config["learningRate"]}})
+		model.compile(optimizer=optimizer, loss=lossFunction, metrics=["accuracy"])
 		# Stores model
 		self.__model = model
 
+	## Access the config
+	#
+	# \param self
+	# \return dictionary with the config used to build the model
+	@property
+	def config(self):
+		return self.__config
+
 	## Access the model
 	#
 	# \param self Instance of PathDataset class.
@@ -47,3 +77,32 @@ class CNN():
 	@property
 	def model(self):
 		return self.__model
+
+	## Exports weights to be read by ml_map in ABC
+	#
+	# The file is little-endian. It holds int32 values: magic, version,
+	# rows and columns of features, number of filters, rows and columns of
+	# the convolution kernel, number of dense layers and units of each dense
+	# layer, including the output layer. Then float32 values: convolution
+	# kernel and bias, then kernel and bias of each dense layer, all in the
+	# layout used by Keras.
+	#
+	# \param self
+	# \param fileName is a string with name of file to write
+	def exportWeights(self, fileName):
+		conv=[layer for layer in self.__model.layers if isinstance(layer, tf.keras.layers.Conv2D)]
+		dense=[layer for layer in self.__model.layers if isinstance(layer, tf.keras.layers.Dense)]
+		inputShape=self.__model.input_shape
+		if len(conv) != 1 or inputShape[3] != 1:
+			raise ValueError("Only a single convolution over one channel can be exported")
+		convKernel, convBias=conv[0].get_weights()
+		header=[CNN.weightMagic, CNN.weightVersion, inputShape[1], inputShape[2], convKernel.shape[3],
+			convKernel.shape[0], convKernel.shape[1], len(dense)]+[layer.units for layer in dense]
+		with open(fileName, "wb") as f:
+			f.write(np.asarray(header, dtype="<i4").tobytes())
+			f.write(np.asarray(convKernel, dtype="<f4").tobytes())
+			f.write(np.asarray(convBias, dtype="<f4").tobytes())
+			for layer in dense:
+				kernel, bias=layer.get_weights()
+				f.write(np.asarray(kernel, dtype="<f4").tobytes())
+				f.write(np.asarray(bias, dtype="<f4").tobytes())
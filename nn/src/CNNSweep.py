@@ -0,0 +1,145 @@
+## \file CNNSweep.py
+#  \brief Parallel sweep of CNN configurations over a shared data set.
+#
+# Training and validation arrays are written once as .npy files to a data
+# directory and every worker process memory-maps them, so that all workers
+# share one copy of the prepared data. Each worker limits TensorFlow to a
+# given number of intra-op threads, trains one config at a time and reports
+# validation accuracy, training time and inference latency.
+#
+# To prepare data from a step1 dictionary:
+# * CNNSweep.prepareData(dataDict, "myPath/sweepData")
+# To run a sweep with 4 workers of 2 threads each:
+# * sweep=CNNSweep("myPath/sweepData", epochs=20, numWorkers=4, numThreads=2)
+# * resultDf=sweep.run([{"name" : "base"}, {"name" : "small", "denseLayers" : [64,64]}])
+#
+
+import os
+import json
+import time
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+class CNNSweep():
+
+	# Array names stored in data directory
+	dataArrays=["trainFeatures","trainLabels","valFeatures","valLabels"]
+
+	## Constructor
+	#
+	# \param self
+	# \param dataDir is a string with directory prepared by prepareData
+	# \param epochs is int defining number of epochs to train each config
+	# \param numWorkers is int defining number of parallel worker processes
+	# \param numThreads is int defining intra-op threads of each worker
+	# \param latencyBatch is int defining batch size used to measure inference latency
+	def __init__(self, dataDir, epochs, numWorkers=1, numThreads=1, latencyBatch=1):
+		self.__dataDir=dataDir
+		self.__epochs=epochs
+		self.__numWorkers=numWorkers
+		self.__numThreads=numThreads
+		self.__latencyBatch=latencyBatch
+
+	## Returns size and modification time of a data file
+	#
+	# \param fileName is a string with name of data pkl file
+	# \return dictionary identifying the version of the file
+	@staticmethod
+	def dataSource(fileName):
+		stat=os.stat(fileName)
+		return {"size" : stat.st_size, "mtime" : stat.st_mtime_ns}
+
+	## Checks if a data directory was prepared from the current data file
+	#
+	# \param dataDir is a string with directory prepared by prepareData
+	# \param source is a dictionary returned by dataSource
+	# \return bool
+	@staticmethod
+	def isPrepared(dataDir, source):
+		configFile=os.path.join(dataDir, "config.json")
+		if not os.path.exists(configFile):
+			return False
+		with open(configFile, "r") as f:
+			return json.load(f).get("source") == source
+
+	## Writes data arrays to be memory-mapped by workers
+	#
+	# config.json is written last, so an interrupted preparation is redone.
+	#
+	# \param dataDict is a data dictionary as saved by step1
+	# \param dataDir is a string with directory to write to
+	# \param source is optional dictionary returned by dataSource for the data file
+	@staticmethod
+	def prepareData(dataDict, dataDir, source=None):
+		os.makedirs(dataDir, exist_ok=True)
+		if os.path.exists(os.path.join(dataDir, "config.json")):
+			os.remove(os.path.join(dataDir, "config.json"))
+		np.save(os.path.join(dataDir, "trainFeatures.npy"), np.asarray(dataDict["train"]["features"], dtype=np.float32))
+		np.save(os.path.join(dataDir, "trainLabels.npy"), np.asarray(dataDict["train"]["labels"]))
+		np.save(os.path.join(dataDir, "valFeatures.npy"), np.asarray(dataDict["val"]["features"], dtype=np.float32))
+		np.save(os.path.join(dataDir, "valLabels.npy"), np.asarray(dataDict["val"]["labels"]))
+		with open(os.path.join(dataDir, "config.json"), "w") as f:
+			json.dump({"featureShape" : list(dataDict["config"]["featureShape"]),
+			           "numClasses" : int(dataDict["config"]["numClasses"]),
+			           "source" : source}, f)
+
+	## Runs all configs
+	#
+	# \param self
+	# \param configList is a list of CNN config dictionaries, optionally with a "name" key
+	# \return Pandas Dataframe with one row per config, ranked by validation accuracy
+	def run(self, configList):
+		jobs=[(idx, config, self.__dataDir, self.__epochs, self.__latencyBatch) for idx, config in enumerate(configList)]
+		# TensorFlow is not fork safe, workers are started from scratch
+		ctx=multiprocessing.get_context("spawn")
+		with ctx.Pool(processes=self.__numWorkers, initializer=_initWorker, initargs=(self.__numThreads,)) as pool:
+			resultList=pool.map(_trainWorker, jobs, chunksize=1)
+		df=pd.DataFrame(resultList)
+		df=df.sort_values(by=["valAccuracy","inferLatencyMs"], ascending=[False,True]).reset_index(drop=True)
+		df.insert(0, "rank", range(1, len(df.index)+1))
+		return df
+
+## Sets thread limits of a worker before TensorFlow runs any op
+#
+# \param numThreads is int defining intra-op threads
+def _initWorker(numThreads):
+	os.environ["OMP_NUM_THREADS"]=str(numThreads)
+	import tensorflow as tf
+	tf.config.threading.set_intra_op_parallelism_threads(numThreads)
+	tf.config.threading.set_inter_op_parallelism_threads(1)
+
+## Trains and measures one config
+#
+# \param job is a tuple (config index, config, data directory, epochs, latency batch size)
+# \return dictionary with results
+def _trainWorker(job):
+	idx, config, dataDir, epochs, latencyBatch = job
+	from CNN import CNN
+	with open(os.path.join(dataDir, "config.json"), "r") as f:
+		dataConfig=json.load(f)
+	data={name : np.load(os.path.join(dataDir, name+".npy"), mmap_mode="r") for name in CNNSweep.dataArrays}
+	cnn=CNN(featureShape=dataConfig["featureShape"], numClasses=dataConfig["numClasses"], config=config)
+	# Train
+	start=time.time()
+	cnn.model.fit(data["trainFeatures"], data["trainLabels"], epochs=epochs, verbose=0)
+	trainSeconds=time.time()-start
+	# Validate
+	valLoss, valAccuracy=cnn.model.evaluate(data["valFeatures"], data["valLabels"], verbose=0)
+	# Inference latency of a small batch, first call is warm-up
+	batch=np.array(data["valFeatures"][:latencyBatch])
+	cnn.model(batch, training=False)
+	latencyList=[]
+	for _ in range(20):
+		start=time.time()
+		cnn.model(batch, training=False)
+		latencyList.append(time.time()-start)
+	return {
+		"name" : config.get("name", "config%d" % idx),
+		"valAccuracy" : float(valAccuracy),
+		"valLoss" : float(valLoss),
+		"trainSeconds" : trainSeconds,
+		"inferLatencyMs" : 1000*float(np.median(latencyList)),
+		"params" : int(cnn.model.count_params()),
+		"config" : json.dumps({key : value for key, value in cnn.config.items() if key != "name"})
+	}
@@ -0,0 +1,58 @@
+## \file CutSelect.py
+#  \brief Selection of cuts to be used by read_cuts from inferred classes.
+#
+# Cuts are visited in the order they were dumped by prepare_map. A cut is
+# selected if its class is at most goodClass. A cut with class at most
+# fairClass is only selected while its node has at most one selected cut.
+# Selected cuts are written as one line per node: "nodeid, cut, cut, ...".
+#
+# To select cuts and write them:
+# * nodeDict, used, total=CutSelect.select(idList, cutIdList, classList)
+# * CutSelect.write(nodeDict, "ckt_inf.txt")
+#
+
+class CutSelect():
+
+	## Selects cuts from inferred classes
+	#
+	# \param idList is a list of node IDs
+	# \param cutIdList is a list of cut indexes
+	# \param classList is a list of inferred classes
+	# \param goodClass is int with largest class always selected
+	# \param fairClass is int with largest class selected while node has at most one cut
+	# \return tuple with dictionary of selected cuts per node, number of selected cuts and total number of cuts
+	@staticmethod
+	def select(idList, cutIdList, classList, goodClass=3, fairClass=6):
+		nodeDict = {}
+		used = 0
+		total = 0
+		for infId, infCutId, infClass in zip(idList, cutIdList, classList):
+			if infClass <= goodClass:
+				used = used + 1
+				if infId in nodeDict:
+					nodeDict[infId].append(infCutId)
+				else:
+					nodeDict[infId] = [infCutId]
+			elif infId not in nodeDict and infClass <= fairClass:
+				used = used + 1
+				nodeDict[infId] = [infCutId]
+				continue
+			elif infId in nodeDict and len(nodeDict[infId]) == 1 and infClass <= fairClass:
+				used = used + 1
+				nodeDict[infId].append(infCutId)
+			total = total + 1
+		return nodeDict, used, total
+
+	## Writes selected cuts to be read by read_cuts
+	#
+	# \param nodeDict is a dictionary with list of selected cuts per node
+	# \param fileName is a string with name of file to write
+	@staticmethod
+	def write(nodeDict, fileName):
+		with open(fileName, "w") as f:
+			for key in nodeDict:
+				nodeId = str(key)
+				for element in nodeDict[key]:
+					nodeId += ", " + str(element)
+				nodeId += "\n"
+				f.write("%s" % nodeId)
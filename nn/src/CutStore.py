@@ -0,0 +1,259 @@
+## \file CutStore.py
+#  \brief Normalized storage of the cut features and per-round labels of a circuit.
+#
+# The flat training CSV generated by genCSV.sh repeats every feature row of a
+# circuit once per mapping round, only to append the QoR of that round. A
+# CutStore keeps a single table of distinct feature rows per circuit, and for
+# each round only the indexes of the rows that were used in it plus the QoR
+# values of the round. Adding a round costs 4 bytes per cut, plus a feature row
+# for every cut whose features differ from all rounds before it.
+#
+# Store is saved as a single npz file containing:
+# * features: int64 matrix with one row per distinct cut
+# * featureColumns: column names of features
+# * roundOffsets: int64 vector, rows of round r are roundRows[roundOffsets[r]:roundOffsets[r+1]]
+# * roundRows: int32 vector with indexes into features
+# * qor: float64 matrix with one row per round
+# * qorColumns: column names of qor
+#
+# To create a store from the raw sweep output of train.pl:
+# * cs=CutStore.fromSweepLog("myPath/ckt_train_hashed.csv")
+# To create a store from an existing flat CSV generated by genCSV.sh:
+# * cs=CutStore.fromCSV("myPath/new_nn_ckt_hashed.csv")
+# To save and load it:
+# * cs.save("myPath/ckt_store.npz")
+# * cs=CutStore.load("myPath/ckt_store.npz")
+# To merge stores of the same circuit, such as shards written while sweeping:
+# * cs=CutStore.merge([CutStore.load(f) for f in shardFiles])
+#
+
+import re
+import numpy as np
+import pandas as pd
+
+class CutStore():
+
+	# Feature columns as dumped by prepare_map and the training binary
+	featureColumns=["nodeid","fon","lvln","invn","invp1","lvlp1","fop1","invp2","lvlp2","fop2","tt","invc","leavesc","volumec","mincutlvl","maxcutlvl","cutlvl","cutminfo","cutmaxfo","cutfo","cutidx","relativelvl","l1id","l2id","l3id","l4id","l5id"]
+	# QoR columns reported by stime for each round
+	qorColumns=["numgates","cap","area","delay"]
+
+	## Constructor
+	#
+	# \param self
+	# \param features is int64 Numpy matrix with one row per distinct cut
+	# \param roundOffsets is int64 Numpy vector with offsets of each round in roundRows
+	# \param roundRows is int32 Numpy vector with feature row indexes used by each round
+	# \param qor is float64 Numpy matrix with QoR values of each round
+	def __init__(self, features, roundOffsets, roundRows, qor):
+		if features.shape[1] != len(CutStore.featureColumns):
+			raise ValueError("Expected %d feature columns, got %d" % (len(CutStore.featureColumns), features.shape[1]))
+		if len(roundOffsets) != len(qor)+1:
+			raise ValueError("Number of round offsets does not match number of rounds")
+		self.__features=features
+		self.__roundOffsets=roundOffsets
+		self.__roundRows=roundRows
+		self.__qor=qor
+
+	## Access the feature matrix
+	#
+	# \param self
+	# \return int64 Numpy matrix with one row per distinct cut
+	@property
+	def features(self):
+		return self.__features
+
+	## Access the QoR matrix
+	#
+	# \param self
+	# \return float64 Numpy matrix with one row per round
+	@property
+	def qor(self):
+		return self.__qor
+
+	## Access the number of rounds
+	#
+	# \param self
+	# \return int with number of rounds
+	@property
+	def numRounds(self):
+		return len(self.__qor)
+
+	## Returns the feature rows used by a round
+	#
+	# \param self
+	# \param roundIdx is int defining the round
+	# \return int32 Numpy vector with feature row indexes
+	def roundRows(self, roundIdx):
+		return self.__roundRows[self.__roundOffsets[roundIdx]:self.__roundOffsets[roundIdx+1]]
+
+	## Iterates over rounds
+	#
+	# \param self
+	# \return generator of tuples (int64 feature matrix, QoR list), as taken by fromRounds
+	def rounds(self):
+		for roundIdx in range(self.numRounds):
+			yield self.__features[self.roundRows(roundIdx)], self.__qor[roundIdx].tolist()
+
+	## Returns feature table as Pandas Dataframe
+	#
+	# \param self
+	# \return Pandas Dataframe with one row per distinct cut
+	def featureDf(self):
+		return pd.DataFrame(self.__features, columns=CutStore.featureColumns)
+
+	## Returns the flat (round, row) label table as Pandas Dataframe
+	#
+	# Each line of the returned table references one feature row and carries the
+	# QoR of the round it was used in. Columns are "round", "row" and the QoR
+	# columns.
+	#
+	# \param self
+	# \return Pandas Dataframe with one line per cut per round
+	def labelDf(self):
+		roundSizes=np.diff(self.__roundOffsets)
+		roundIdx=np.repeat(np.arange(self.numRounds, dtype=np.int32), roundSizes)
+		df=pd.DataFrame({"round" : roundIdx, "row" : self.__roundRows})
+		for colIdx, col in enumerate(CutStore.qorColumns):
+			df[col]=self.__qor[roundIdx, colIdx]
+		return df
+
+	## Saves the store to a npz file
+	#
+	# \param self
+	# \param fileName is a string defining the name of file to write
+	def save(self, fileName):
+		np.savez(fileName,
+		         features=self.__features,
+		         featureColumns=np.array(CutStore.featureColumns),
+		         roundOffsets=self.__roundOffsets,
+		         roundRows=self.__roundRows,
+		         qor=self.__qor,
+		         qorColumns=np.array(CutStore.qorColumns))
+
+	## Loads a store from a npz file
+	#
+	# \param fileName is a string defining the name of file to read
+	# \return CutStore object
+	@staticmethod
+	def load(fileName):
+		with np.load(fileName) as data:
+			if list(data["featureColumns"]) != CutStore.featureColumns:
+				raise ValueError("Feature columns of %s do not match the expected layout" % fileName)
+			return CutStore(data["features"], data["roundOffsets"], data["roundRows"], data["qor"])
+
+	## Builds a store from a sequence of rounds
+	#
+	# Feature rows are deduplicated across rounds on all of their columns, so
+	# a cut whose features differ between rounds (for example in the fanout
+	# columns) gets one row per distinct set of values and no information is
+	# lost. Rows of the store are in the order they were first seen.
+	#
+	# Rounds are buffered and merged into the distinct rows seen so far with
+	# np.unique, once the buffer is as large as the feature table (and at
+	# least minMergeRows), which bounds both memory and the number of sorts.
+	#
+	# \param rounds is an iterable of tuples (int64 feature matrix, QoR list)
+	# \param minMergeRows is optional int with minimum number of buffered rows merged at once
+	# \return CutStore object
+	@staticmethod
+	def fromRounds(rounds, minMergeRows=1<<20):
+		features=np.zeros((0, len(CutStore.featureColumns)), dtype=np.int64)
+		roundOffsets=[0]
+		roundRowList=[]
+		qorList=[]
+		pendingList=[]
+		numPending=0
+		def mergePending(features, pendingList):
+			stacked=np.ascontiguousarray(np.vstack([features]+pendingList))
+			# Rows viewed as single byte strings sort much faster than with axis=0
+			keys=stacked.view(np.dtype((np.void, stacked.shape[1]*stacked.itemsize))).ravel()
+			_, first, inverse=np.unique(keys, return_index=True, return_inverse=True)
+			# Distinct rows in first-seen order keep the rows already stored in place
+			order=np.argsort(first, kind="stable")
+			rank=np.empty(len(order), dtype=np.int64)
+			rank[order]=np.arange(len(order))
+			rows=rank[inverse.ravel()][len(features):].astype(np.int32)
+			return stacked[first[order]], np.split(rows, np.cumsum([len(f) for f in pendingList])[:-1])
+		for roundFeatures, qor in rounds:
+			roundFeatures=np.asarray(roundFeatures, dtype=np.int64).reshape(-1, len(CutStore.featureColumns))
+			pendingList.append(roundFeatures)
+			numPending+=len(roundFeatures)
+			roundOffsets.append(roundOffsets[-1]+len(roundFeatures))
+			qorList.append(qor)
+			if numPending >= max(len(features), minMergeRows):
+				features, rowsList=mergePending(features, pendingList)
+				roundRowList.extend(rowsList)
+				pendingList=[]
+				numPending=0
+		if len(pendingList) > 0:
+			features, rowsList=mergePending(features, pendingList)
+			roundRowList.extend(rowsList)
+		if len(roundRowList) > 0:
+			roundRows=np.concatenate(roundRowList)
+		else:
+			roundRows=np.zeros(0, dtype=np.int32)
+		return CutStore(features,
+		                np.array(roundOffsets, dtype=np.int64),
+		                roundRows,
+		                np.array(qorList, dtype=np.float64).reshape(-1, len(CutStore.qorColumns)))
+
+	## Merges stores of the same circuit
+	#
+	# Rounds are kept in the order of stores and feature rows are deduplicated
+	# across stores as in fromRounds.
+	#
+	# \param stores is a list of CutStore objects
+	# \return CutStore object
+	@staticmethod
+	def merge(stores):
+		return CutStore.fromRounds(r for store in stores for r in store.rounds())
+
+	## Builds a store from the raw sweep output of train.pl
+	#
+	# Follows the same parsing as genCSV.sh: each round starts at a line
+	# beginning with "ABC", feature lines are the ones starting with two
+	# integers (their trailing field is dropped) and QoR is read from the
+	# "stime:" line.
+	#
+	# \param fileName is a string defining the name of sweep file to read
+	# \return CutStore object
+	@staticmethod
+	def fromSweepLog(fileName):
+		featureRe=re.compile(r"^[0-9]+,[0-9]+,")
+		def parseRounds():
+			features=None
+			qor=None
+			with open(fileName, "r") as f:
+				for line in f:
+					if line.startswith("ABC"):
+						if features and qor is not None:
+							yield np.array(features, dtype=np.int64), qor
+						features=[]
+						qor=None
+					elif features is None:
+						continue
+					elif featureRe.match(line):
+						features.append([int(v) for v in re.sub(r"\s+", "", line).split(",")[:-1]])
+					elif "stime:" in line:
+						qor=[float(v) for v in re.sub(r"\s+", "", line.split("stime:")[1]).split(",")]
+			if features and qor is not None:
+				yield np.array(features, dtype=np.int64), qor
+		return CutStore.fromRounds(parseRounds())
+
+	## Builds a store from a flat CSV generated by genCSV.sh
+	#
+	# Rounds are recovered as consecutive blocks of rows sharing the same QoR.
+	#
+	# \param fileName is a string defining the name of CSV file to read
+	# \return CutStore object
+	@staticmethod
+	def fromCSV(fileName):
+		df=pd.read_csv(fileName)
+		qor=df[CutStore.qorColumns]
+		newRound=(qor!=qor.shift()).any(axis=1)
+		roundIdx=newRound.cumsum()
+		def csvRounds():
+			for _, roundDf in df.groupby(roundIdx, sort=False):
+				yield roundDf[CutStore.featureColumns].to_numpy(dtype=np.int64), roundDf[CutStore.qorColumns].iloc[0].tolist()
+		return CutStore.fromRounds(csvRounds())
@@ -0,0 +1,221 @@
+## \file DataProfile.py
+#  \brief Profile of features per label class, built in a single pass.
+#
+# For each feature, the number of rows of each (value, class) pair is counted
+# chunk by chunk, which is vectorized and keeps memory proportional to the
+# number of distinct values rather than to the number of rows. Histograms,
+# quantiles and summary statistics per class are exact and derived from these
+# counts when the report is written. Features are expected to be discrete, as
+# the ones dumped by prepare_map.
+#
+# Labels are normalized QoR values between 0 and 1, binned into classes as in
+# NodeCut: class=min(numClasses-1, int(label*numClasses)).
+#
+# To profile data in chunks and write the report:
+# * dp=DataProfile(["fon", "lvln"], numClasses=10)
+# * dp.add(featureDf, labelSeries)
+# * dp.writeJSON("ckt_profile.json")
+# * dp.writeHTML("ckt_profile.html")
+#
+
+import json
+import html
+import numpy as np
+import pandas as pd
+
+class DataProfile():
+
+	# Quantile levels reported for each feature and class
+	quantileLevels=[0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]
+
+	## Constructor
+	#
+	# \param self
+	# \param featureList is a list with names of features to profile
+	# \param numClasses is an integer with the number of label classes
+	# \param numBins is optional int with number of histogram bins for features with more distinct values
+	def __init__(self, featureList, numClasses, numBins=10):
+		self.__featureList=list(featureList)
+		self.__numClasses=numClasses
+		self.__numBins=numBins
+		self.__numRows=0
+		self.__missingLabels=0
+		self.__classCounts=np.zeros(numClasses, dtype=np.int64)
+		self.__missing={feature : 0 for feature in self.__featureList}
+		# Per feature, Series of counts indexed by (value, class)
+		self.__counts={feature : None for feature in self.__featureList}
+		self.__info={}
+
+	## Access the number of profiled rows
+	#
+	# \param self
+	# \return int with number of rows with a label
+	@property
+	def numRows(self):
+		return self.__numRows
+
+	## Sets information reported as is, such as sampling parameters
+	#
+	# \param self
+	# \param key is a string
+	# \param value is a JSON serializable value
+	def setInfo(self, key, value):
+		self.__info[key]=value
+
+	## Adds a chunk of rows
+	#
+	# \param self
+	# \param featureDf is a Pandas Dataframe with the profiled features
+	# \param labels is a Pandas Series or Numpy array with normalized labels, aligned with featureDf
+	def add(self, featureDf, labels):
+		labels=np.asarray(labels, dtype=np.float64)
+		hasLabel=~np.isnan(labels)
+		self.__missingLabels+=int((~hasLabel).sum())
+		classes=np.minimum(self.__numClasses-1, (labels[hasLabel]*self.__numClasses).astype(np.int64))
+		self.__classCounts+=np.bincount(classes, minlength=self.__numClasses)
+		self.__numRows+=len(classes)
+		for feature in self.__featureList:
+			values=featureDf[feature].to_numpy(dtype=np.float64)[hasLabel]
+			hasValue=~np.isnan(values)
+			self.__missing[feature]+=int((~hasValue).sum())
+			counts=pd.DataFrame({"value" : values[hasValue], "cls" : classes[hasValue]}).value_counts()
+			if self.__counts[feature] is None:
+				self.__counts[feature]=counts
+			else:
+				self.__counts[feature]=self.__counts[feature].add(counts, fill_value=0)
+
+	## Returns the matrix of counts of a feature
+	#
+	# Private method.
+	#
+	# \param self
+	# \param feature is a string with feature name
+	# \return tuple with sorted Numpy array of distinct values and int64 matrix of counts per value and class
+	def __countMatrix(self, feature):
+		counts=self.__counts[feature]
+		if counts is None or len(counts)==0:
+			return np.zeros(0), np.zeros((0, self.__numClasses), dtype=np.int64)
+		matrix=counts.unstack("cls", fill_value=0).reindex(columns=range(self.__numClasses), fill_value=0).sort_index()
+		return matrix.index.to_numpy(dtype=np.float64), matrix.to_numpy(dtype=np.int64)
+
+	## Returns quantiles from counts of sorted values
+	#
+	# Private method. Quantile q is the smallest value whose cumulative count
+	# reaches q of the total count.
+	#
+	# \param values is sorted Numpy array of distinct values
+	# \param counts is Numpy array of counts of each value
+	# \return list of quantiles, None if there are no values
+	@staticmethod
+	def __quantiles(values, counts):
+		total=counts.sum()
+		if total==0:
+			return None
+		cumCounts=np.cumsum(counts)
+		return [float(values[min(len(values)-1, np.searchsorted(cumCounts, max(1, np.ceil(q*total))))]) for q in DataProfile.quantileLevels]
+
+	## Returns the histogram of a feature
+	#
+	# Private method. Features with at most numBins*2 distinct values get one bin
+	# per value, others get numBins bins of equal width.
+	#
+	# \param self
+	# \param values is sorted Numpy array of distinct values
+	# \param matrix is int64 matrix of counts per value and class
+	# \return tuple with list of bin labels and int64 matrix of counts per bin and class
+	def __histogram(self, values, matrix):
+		if len(values) <= self.__numBins*2:
+			return ["%g" % value for value in values], matrix
+		edges=np.linspace(values[0], values[-1], self.__numBins+1)
+		binIdx=np.minimum(self.__numBins-1, np.searchsorted(edges, values, side="right")-1)
+		binMatrix=np.zeros((self.__numBins, self.__numClasses), dtype=np.int64)
+		np.add.at(binMatrix, binIdx, matrix)
+		binLabels=["[%g, %g%s" % (edges[idx], edges[idx+1], "]" if idx==self.__numBins-1 else ")") for idx in range(self.__numBins)]
+		return binLabels, binMatrix
+
+	## Returns the report as a dictionary
+	#
+	# \param self
+	# \return dictionary with summary, histogram and quantiles per class of each feature
+	def report(self):
+		report={
+			"info" : self.__info,
+			"numRows" : self.__numRows,
+			"missingLabels" : self.__missingLabels,
+			"numClasses" : self.__numClasses,
+			"classCounts" : self.__classCounts.tolist(),
+			"quantileLevels" : DataProfile.quantileLevels,
+			"features" : {}
+		}
+		for feature in self.__featureList:
+			values, matrix=self.__countMatrix(feature)
+			totals=matrix.sum(axis=1)
+			count=int(totals.sum())
+			featureReport={"count" : count, "missing" : self.__missing[feature], "distinct" : len(values)}
+			if count > 0:
+				mean=float((values*totals).sum()/count)
+				featureReport["min"]=float(values[0])
+				featureReport["max"]=float(values[-1])
+				featureReport["mean"]=mean
+				featureReport["std"]=float(np.sqrt((((values-mean)**2)*totals).sum()/count))
+			featureReport["quantiles"]=DataProfile.__quantiles(values, totals)
+			featureReport["classQuantiles"]=[DataProfile.__quantiles(values, matrix[:, classIdx]) for classIdx in range(self.__numClasses)]
+			binLabels, binMatrix=self.__histogram(values, matrix)
+			featureReport["histogram"]={"bins" : binLabels, "counts" : binMatrix.tolist()}
+			report["features"][feature]=featureReport
+		return report
+
+	## Writes the report as JSON
+	#
+	# \param self
+	# \param fileName is a string with name of file to write
+	def writeJSON(self, fileName):
+		with open(fileName, "w") as f:
+			json.dump(self.report(), f, indent=1)
+
+	## Writes the report as a static HTML page
+	#
+	# The page has no script or external resource. Histogram cells are shaded
+	# by the share of their class, so the distribution of a feature can be
+	# compared across classes.
+	#
+	# \param self
+	# \param fileName is a string with name of file to write
+	def writeHTML(self, fileName):
+		report=self.report()
+		classHeader="".join("<th>%d</th>" % classIdx for classIdx in range(self.__numClasses))
+		def number(value):
+			return "-" if value is None else "%.4g" % value
+		lines=["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\"><title>Data profile</title>",
+			"<style>body{font-family:sans-serif;font-size:13px}table{border-collapse:collapse;margin:6px 0 18px}"
+			"td,th{border:1px solid #ccc;padding:2px 6px;text-align:right}th{background:#eee}</style></head><body>",
+			"<h1>Data profile</h1>"]
+		info=dict(report["info"], rows=report["numRows"], missingLabels=report["missingLabels"])
+		lines.append("<p>%s</p>" % ", ".join("%s = %s" % (html.escape(str(key)), html.escape(str(value))) for key, value in info.items()))
+		lines.append("<h2>Classes</h2><table><tr><th>class</th>%s</tr>" % classHeader)
+		lines.append("<tr><th>rows</th>%s</tr></table>" % "".join("<td>%d</td>" % count for count in report["classCounts"]))
+		lines.append("<h2>Features</h2><table><tr><th>feature</th><th>count</th><th>missing</th><th>distinct</th><th>min</th><th>max</th><th>mean</th><th>std</th></tr>")
+		for feature, featureReport in report["features"].items():
+			lines.append("<tr><th><a href=\"#%s\">%s</a></th><td>%d</td><td>%d</td><td>%d</td>%s</tr>" % (html.escape(feature), html.escape(feature),
+				featureReport["count"], featureReport["missing"], featureReport["distinct"],
+				"".join("<td>%s</td>" % number(featureReport.get(key)) for key in ["min", "max", "mean", "std"])))
+		lines.append("</table>")
+		for feature, featureReport in report["features"].items():
+			lines.append("<h3 id=\"%s\">%s</h3>" % (html.escape(feature), html.escape(feature)))
+			# Histogram with cells shaded by share of the class
+			counts=np.array(featureReport["histogram"]["counts"], dtype=np.int64).reshape(-1, self.__numClasses)
+			classTotals=np.maximum(1, counts.sum(axis=0))
+			lines.append("<table><tr><th>value \\ class</th>%s</tr>" % classHeader)
+			for binLabel, binCounts in zip(featureReport["histogram"]["bins"], counts):
+				lines.append("<tr><th>%s</th>%s</tr>" % (html.escape(binLabel), "".join(
+					"<td style=\"background:rgba(31,119,180,%.2f)\">%d</td>" % (count/classTotal, count) for count, classTotal in zip(binCounts, classTotals))))
+			lines.append("</table>")
+			# Quantiles per class
+			lines.append("<table><tr><th>class \\ quantile</th>%s</tr>" % "".join("<th>%g</th>" % q for q in DataProfile.quantileLevels))
+			rows=[("all", featureReport["quantiles"])]+[(str(classIdx), quantiles) for classIdx, quantiles in enumerate(featureReport["classQuantiles"])]
+			for rowLabel, quantiles in rows:
+				lines.append("<tr><th>%s</th>%s</tr>" % (rowLabel, "".join("<td>%s</td>" % number(q) for q in (quantiles or [None]*len(DataProfile.quantileLevels)))))
+			lines.append("</table>")
+		lines.append("</body></html>")
+		with open(fileName, "w") as f:
+			f.write("\n".join(lines))
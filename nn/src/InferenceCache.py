@@ -0,0 +1,125 @@
+## \file InferenceCache.py
+#  \brief Cache of inferred cut classes keyed by node structural signature.
+#
+# prepare_map writes a structural signature for every node (esig column of
+# node embedding), a hash of its fanin cone that does not depend on node
+# numbers. After a small edit of a design most nodes keep their signature and
+# level, so their cuts and inferred classes can be taken from a previous run
+# instead of being featurized and inferred again.
+#
+# Cut indices and leaf numbers change when an edit renumbers the AIG, so a cut
+# is found in the cache by its node key (signature, level, relative level),
+# its structural features and the signatures of its leaves, in leaf order. A
+# node is reused when every one of its cuts is found in the cache. Other nodes
+# are reported as changed.
+#
+# To split a new run into reused and changed rows:
+# * cache=InferenceCache.load("ckt_cache.pkl")
+# * reuseDf, changedDf=cache.split(featDf, embedDf)
+# To save classes of the new run for the next one:
+# * InferenceCache.fromRun(featDf, embedDf, classList).save("ckt_cache.pkl")
+#
+
+import os
+import numpy as np
+import pandas as pd
+from NodeCut import NodeCut
+
+class InferenceCache():
+
+	# Columns of the cache table
+	lSig="sig"
+	lClass="cls"
+	lLeafSigs=["l1sig", "l2sig", "l3sig", "l4sig", "l5sig"]
+	# Signature of a missing leaf and of a leaf without embedding (primary input)
+	noLeafSig=-1
+	inputLeafSig=-2
+	# Cut features that do not depend on node numbers
+	cutColumns=[NodeCut.lCutTruthTable, NodeCut.lCutIsInverted, NodeCut.lCutNumLeaves, NodeCut.lCutVolume, NodeCut.lCutMinLvl, NodeCut.lCutMaxLvl, NodeCut.lCutLvl, NodeCut.lCutMinFo, NodeCut.lCutMaxFo, NodeCut.lCutFo]
+	keyColumns=[lSig, NodeCut.lNodeLevel, NodeCut.lNodeRelativeLvl]+cutColumns+lLeafSigs
+	leafColumns=[NodeCut.l1id, NodeCut.l2id, NodeCut.l3id, NodeCut.l4id, NodeCut.l5id]
+
+	## Constructor
+	#
+	# \param self
+	# \param df is a Pandas Dataframe with keyColumns and class columns
+	def __init__(self, df=None):
+		if df is None:
+			df=pd.DataFrame(columns=InferenceCache.keyColumns+[InferenceCache.lClass])
+		elif not set(InferenceCache.keyColumns).issubset(df.columns):
+			# Caches keyed by cut index are not valid after renumbering
+			df=pd.DataFrame(columns=InferenceCache.keyColumns+[InferenceCache.lClass])
+		# One class per key, cuts with identical key are interchangeable
+		self.__df=df[InferenceCache.keyColumns+[InferenceCache.lClass]].drop_duplicates(subset=InferenceCache.keyColumns).reset_index(drop=True)
+
+	## Access the cache table
+	#
+	# \param self
+	# \return Pandas Dataframe
+	@property
+	def df(self):
+		return self.__df
+
+	## Loads a cache, returning an empty one if file does not exist
+	#
+	# \param fileName is a string with name of pkl file
+	# \return InferenceCache object
+	@staticmethod
+	def load(fileName):
+		if not os.path.exists(fileName):
+			return InferenceCache()
+		return InferenceCache(pd.read_pickle(fileName))
+
+	## Saves the cache
+	#
+	# \param self
+	# \param fileName is a string with name of pkl file
+	def save(self, fileName):
+		self.__df.to_pickle(fileName)
+
+	## Adds the signature of each node and of its cut leaves to a feature table
+	#
+	# \param featDf is a Pandas Dataframe with features as dumped by prepare_map
+	# \param embedDf is a Pandas Dataframe with node embedding as dumped by prepare_map
+	# \return Pandas Dataframe with features and signatures, in the order of featDf
+	@staticmethod
+	def addSignature(featDf, embedDf):
+		if NodeCut.lEmbedSig not in embedDf.columns:
+			raise ValueError("Node embedding has no %s column, regenerate it with prepare_map" % NodeCut.lEmbedSig)
+		sigSeries=embedDf.set_index(NodeCut.lEmbedId)[NodeCut.lEmbedSig]
+		df=featDf.copy()
+		df[InferenceCache.lSig]=df[NodeCut.lNodeId].map(sigSeries)
+		for leafColumn, sigColumn in zip(InferenceCache.leafColumns, InferenceCache.lLeafSigs):
+			leafSig=df[leafColumn].map(sigSeries).fillna(InferenceCache.inputLeafSig).astype(np.int64)
+			df[sigColumn]=leafSig.where(df[leafColumn] >= 0, InferenceCache.noLeafSig)
+		return df
+
+	## Builds a cache from the classes of a full run
+	#
+	# \param featDf is a Pandas Dataframe with features as dumped by prepare_map
+	# \param embedDf is a Pandas Dataframe with node embedding as dumped by prepare_map
+	# \param classList is a list of inferred classes, in the order of featDf
+	# \return InferenceCache object
+	@staticmethod
+	def fromRun(featDf, embedDf, classList):
+		df=InferenceCache.addSignature(featDf, embedDf)
+		df[InferenceCache.lClass]=np.asarray(classList)
+		return InferenceCache(df[InferenceCache.keyColumns+[InferenceCache.lClass]])
+
+	## Splits rows of a new run into reused and changed nodes
+	#
+	# \param self
+	# \param featDf is a Pandas Dataframe with features as dumped by prepare_map
+	# \param embedDf is a Pandas Dataframe with node embedding as dumped by prepare_map
+	# \return tuple with Dataframe of reused rows (with class column) and Dataframe of changed rows, both indexed as featDf
+	def split(self, featDf, embedDf):
+		df=InferenceCache.addSignature(featDf, embedDf)
+		df.index=featDf.index
+		df[InferenceCache.lClass]=df[InferenceCache.keyColumns].merge(
+			self.__df, on=InferenceCache.keyColumns, how="left", sort=False)[InferenceCache.lClass].to_numpy()
+		# A node is reused only if all of its cuts were found
+		missingNodes=df.loc[df[InferenceCache.lClass].isna(), NodeCut.lNodeId].unique()
+		changed=df[NodeCut.lNodeId].isin(missingNodes)
+		reuseDf=df[~changed]
+		reuseDf=reuseDf.assign(**{InferenceCache.lClass : reuseDf[InferenceCache.lClass].astype(np.int64)})
+		return reuseDf, featDf[changed]
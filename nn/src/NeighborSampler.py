@@ -0,0 +1,188 @@
+## \file NeighborSampler.py
+#  \brief Vectorized k-hop neighbor sampling on the CSR graph of a circuit.
+#
+# The graph is written by "edgelist -C prefix" or "&edgelist -C prefix" in ABC
+# as .npy files, which are memory-mapped rather than read:
+# * prefix_offsets.npy: int64 vector, neighbors of row r are indices[offsets[r]:offsets[r+1]]
+# * prefix_indices.npy: int32 vector with neighbor rows, fanins first then fanouts
+# * prefix_fanins.npy: int32 vector with number of fanins of each row
+# * prefix_ids.npy: int32 vector with edgelist ID of each row
+#
+# Rows follow the node order of the mapper, so row r of a CI or AND node is the
+# node with eid r in the node embedding and nodeid/l1id..l5id r in the cut
+# features dumped by prepare_map. Sampling works on arrays of nodes at once:
+# each hop draws up to fanout neighbors of every node of the previous hop with
+# offset arithmetic, and missing neighbors are -1.
+#
+# To build wider context of cuts from the node embedding:
+# * ns=NeighborSampler("myPath/ckt_graph")
+# * embed=ns.embedMatrix(pd.read_csv("myPath/ckt_node_embed.csv"))
+# * context=ns.cutFeatures(featureDf, embed, numHops=2, fanout=4)
+#
+
+import numpy as np
+from NodeCut import NodeCut
+
+class NeighborSampler():
+
+	# Directions of sampled edges
+	directionFanin="fanin"
+	directionFanout="fanout"
+	directionBoth="both"
+	# Embedding columns, in the order used by NodeCut features
+	embedColumns=[NodeCut.lEmbedFo, NodeCut.lEmbedLvl, NodeCut.lEmbedInv, NodeCut.lEmbedC1Inv, NodeCut.lEmbedC1Lvl, NodeCut.lEmbedC1Fo, NodeCut.lEmbedC2Inv, NodeCut.lEmbedC2Lvl, NodeCut.lEmbedC2Fo, NodeCut.lEmbedRLvl]
+	# Cut columns with leaves
+	leafColumns=[NodeCut.l1id, NodeCut.l2id, NodeCut.l3id, NodeCut.l4id, NodeCut.l5id]
+
+	## Constructor
+	#
+	# \param self
+	# \param prefix is a string with the prefix of the .npy files of the graph
+	# \param mmap is optional bool defining if files are memory-mapped instead of read
+	def __init__(self, prefix, mmap=True):
+		mode="r" if mmap else None
+		self.__offsets=np.load(prefix+"_offsets.npy", mmap_mode=mode)
+		self.__indices=np.load(prefix+"_indices.npy", mmap_mode=mode)
+		self.__fanins=np.load(prefix+"_fanins.npy", mmap_mode=mode)
+		self.__ids=np.load(prefix+"_ids.npy", mmap_mode=mode)
+		if len(self.__offsets) != len(self.__fanins)+1 or self.__offsets[-1] != len(self.__indices):
+			raise ValueError("Inconsistent CSR graph with prefix \"%s\"" % prefix)
+
+	## Access the number of nodes
+	#
+	# \param self
+	# \return int with number of rows of the graph
+	@property
+	def numNodes(self):
+		return len(self.__fanins)
+
+	## Access the edgelist IDs of rows
+	#
+	# \param self
+	# \return Numpy array with edgelist ID of each row
+	@property
+	def ids(self):
+		return self.__ids
+
+	## Returns the first neighbor and the number of neighbors of nodes
+	#
+	# Private method. Nodes equal to -1 have no neighbors.
+	#
+	# \param self
+	# \param nodes is int64 Numpy array of rows
+	# \param direction is a string with direction of edges
+	# \return tuple with int64 Numpy arrays of positions in indices and counts
+	def __neighborRange(self, nodes, direction):
+		valid=nodes >= 0
+		rows=np.where(valid, nodes, 0)
+		start=np.asarray(self.__offsets[rows], dtype=np.int64)
+		stop=np.asarray(self.__offsets[rows+1], dtype=np.int64)
+		fanins=np.asarray(self.__fanins[rows], dtype=np.int64)
+		if direction == NeighborSampler.directionFanin:
+			stop=start+fanins
+		elif direction == NeighborSampler.directionFanout:
+			start=start+fanins
+		elif direction != NeighborSampler.directionBoth:
+			raise ValueError("Unknown direction \"%s\"" % direction)
+		return start, np.where(valid, stop-start, 0)
+
+	## Samples neighbors of nodes
+	#
+	# Nodes with at most fanout neighbors get all of them, in CSR order,
+	# others get fanout neighbors drawn uniformly with replacement.
+	#
+	# \param self
+	# \param nodes is a Numpy array of rows, -1 for no node
+	# \param fanout is int with number of neighbors sampled per node
+	# \param direction is optional string with direction of edges (directionFanin, directionFanout or directionBoth)
+	# \param rng is optional Numpy random Generator
+	# \return int64 Numpy matrix with fanout neighbors per node, -1 for missing neighbors
+	def neighbors(self, nodes, fanout, direction=directionBoth, rng=None):
+		nodes=np.asarray(nodes, dtype=np.int64).ravel()
+		rng=np.random.default_rng() if rng is None else rng
+		start, count=self.__neighborRange(nodes, direction)
+		cols=np.arange(fanout, dtype=np.int64)
+		pos=np.where(count[:, None] <= fanout, cols, (rng.random((len(nodes), fanout))*count[:, None]).astype(np.int64))
+		valid=cols < count[:, None]
+		if len(self.__indices) == 0:
+			return np.full((len(nodes), fanout), -1, dtype=np.int64)
+		picked=np.asarray(self.__indices[np.where(valid, start[:, None]+pos, 0)], dtype=np.int64)
+		return np.where(valid, picked, -1)
+
+	## Samples k-hop neighborhoods of nodes
+	#
+	# Hop h has fanout**h samples per node, drawn from the samples of hop h-1,
+	# so the sampled neighborhood is a tree and may revisit nodes.
+	#
+	# \param self
+	# \param nodes is a Numpy array of rows, -1 for no node
+	# \param numHops is int with number of hops
+	# \param fanout is int with number of neighbors sampled per node and hop
+	# \param direction is optional string with direction of edges
+	# \param seed is optional int with seed of sampling
+	# \return list with one int64 Numpy matrix per hop, of shape (len(nodes), fanout**hop)
+	def sample(self, nodes, numHops, fanout, direction=directionBoth, seed=None):
+		nodes=np.asarray(nodes, dtype=np.int64).ravel()
+		rng=np.random.default_rng(seed)
+		hops=[]
+		frontier=nodes
+		for hop in range(numHops):
+			frontier=self.neighbors(frontier, fanout, direction, rng).ravel()
+			hops.append(frontier.reshape(len(nodes), -1))
+		return hops
+
+	## Returns the node embedding as a matrix aligned with rows
+	#
+	# \param self
+	# \param embedDf is a Pandas Dataframe with node embedding dumped by prepare_map
+	# \param columns is optional list of embedding columns
+	# \return float32 Numpy matrix with one row per node, zeros for nodes without embedding
+	def embedMatrix(self, embedDf, columns=embedColumns):
+		eids=embedDf[NodeCut.lEmbedId].to_numpy(dtype=np.int64)
+		if len(eids) > 0 and (eids.min() < 0 or eids.max() >= self.numNodes):
+			raise ValueError("Node embedding does not match the graph")
+		matrix=np.zeros((self.numNodes, len(columns)), dtype=np.float32)
+		matrix[eids]=embedDf[columns].to_numpy(dtype=np.float32)
+		return matrix
+
+	## Returns the mean embedding of k-hop neighborhoods of nodes
+	#
+	# \param self
+	# \param nodes is a Numpy array of rows, -1 for no node
+	# \param embed is a Numpy matrix with one row per node, see embedMatrix
+	# \param numHops is int with number of hops
+	# \param fanout is int with number of neighbors sampled per node and hop
+	# \param direction is optional string with direction of edges
+	# \param seed is optional int with seed of sampling
+	# \return float32 Numpy array of shape (len(nodes), numHops, embed.shape[1]), zeros for empty hops
+	def aggregate(self, nodes, embed, numHops, fanout, direction=directionBoth, seed=None):
+		nodes=np.asarray(nodes, dtype=np.int64).ravel()
+		result=np.zeros((len(nodes), numHops, embed.shape[1]), dtype=np.float32)
+		for hop, sampled in enumerate(self.sample(nodes, numHops, fanout, direction, seed)):
+			valid=sampled >= 0
+			total=(embed[np.where(valid, sampled, 0)]*valid[:, :, None]).sum(axis=1)
+			result[:, hop]=total/np.maximum(1, valid.sum(axis=1))[:, None]
+		return result
+
+	## Returns neighborhood features of cuts
+	#
+	# For each hop, one row has the mean embedding of the sampled neighborhood
+	# of the root and one row has the mean over the sampled neighborhoods of
+	# the leaves. Rows have the embedding columns in the order of NodeCut
+	# features, so they can be stacked to the feature matrix of a cut.
+	#
+	# \param self
+	# \param featureDf is a Pandas Dataframe with cut features dumped by prepare_map
+	# \param embed is a Numpy matrix with one row per node, see embedMatrix
+	# \param numHops is optional int with number of hops
+	# \param fanout is optional int with number of neighbors sampled per node and hop
+	# \param direction is optional string with direction of edges
+	# \param seed is optional int with seed of sampling
+	# \return float32 Numpy array of shape (len(featureDf), 2*numHops, embed.shape[1])
+	def cutFeatures(self, featureDf, embed, numHops=2, fanout=4, direction=directionBoth, seed=None):
+		nodes=featureDf[[NodeCut.lNodeId]+NeighborSampler.leafColumns].to_numpy(dtype=np.int64)
+		context=self.aggregate(nodes.ravel(), embed, numHops, fanout, direction, seed).reshape(len(nodes), nodes.shape[1], numHops, -1)
+		# Leaves are averaged over the existing ones
+		numLeaves=np.maximum(1, (nodes[:, 1:] >= 0).sum(axis=1))
+		leaves=context[:, 1:].sum(axis=1)/numLeaves[:, None, None]
+		return np.stack([context[:, 0], leaves], axis=2).reshape(len(nodes), 2*numHops, -1)
@@ -21,6 +21,12 @@
 # To add data, use readCSV method, providing a CSV file name:
 # * nc.readCSV("myPath/data.csv")
 #
+# Alternatively, data can be added from a normalized CutStore file (see
+# CutStore.py), which keeps one feature table per circuit and only row indexes
+# and QoR per round. Features are then joined to labels only when features
+# are collected:
+# * nc.readStore("myPath/data_store.npz", cktId)
+#
 # To prepare, use prepare method, providing number of training and validation
 # points:
 # * nc.prepare(numTrainPoints=300, numValPoints=700)
@@ -31,10 +37,15 @@
 # To collect validation data, use the getValFeatureLabelTuple method:
 # * featureList, labelList=nc.getValFeatureLabelTuple()
 #
+# To check data quality, write a profile of features per class of training
+# rows, optionally on a sample:
+# * nc.profile("myPath/ckt_profile", sampleFraction=0.1)
+#
 
 import pandas as pd
 import numpy as np
-import plotly.express as px
+from CutStore import CutStore
+from DataProfile import DataProfile
 
 class NodeCut():
 
@@ -70,6 +81,7 @@ class NodeCut():
 	l5id="l5id"
 	lCutDelay="delay"
 	lDataType="dataType"
+	lStoreRow="row"
 	# Data type labels
 	lDataTypeTrain="train"
 	lDataTypeVal="val"
@@ -85,6 +97,9 @@ class NodeCut():
 	lEmbedC2Lvl="ec2lvl"
 	lEmbedC2Fo="ec2fo"
 	lEmbedRLvl="erelvl"
+	lEmbedSig="esig"
+	# Features written by the profile method
+	profileFeatures=[lNumFanout, lNodeLevel, lNodeHasInversion, lChild1HasInversion, lChild1Level, lChild2HasInversion, lChild2Level, lCutIsInverted, lCutNumLeaves, lCutVolume, lCutMinLvl, lCutMaxLvl, lCutLvl, lCutMinFo, lCutMaxFo, lCutFo]
 
 	## Constructor
 	#
@@ -100,6 +115,8 @@ class NodeCut():
 		self.__lock = False
 		# Dictionary with node embedding
 		self.__nodeEmbedDf = None
+		# Dictionary with feature table of each circuit read from a CutStore
+		self.__cutDf = None
 		# Stores max values used to normalize features
 		self.__maxNumFanout=0
 		self.__maxNodeLevel=0
@@ -133,10 +150,22 @@ class NodeCut():
 	# \param fileName is a string defining the name of CSV file to read
 	# \param cktId defines the id of the circuit being read
 	def readCSV(self, fileName, cktId):
+		self.readDf(pd.read_csv(fileName), cktId)
+
+	## Adds a Pandas Dataframe
+	#
+	# Same as readCSV for data already loaded, e.g. a subset of the rows of a
+	# CSV file.
+	#
+	# \param self
+	# \param df is a Pandas Dataframe with columns defined by data set column name labels
+	# \param cktId defines the id of the circuit being read
+	def readDf(self, df, cktId):
 		if self.__lock:
 			raise RuntimeError("Can't read new CSV file to NodeCut that was already locked by the \"prepare\" method")
-		# Read the CSV
-		df=pd.read_csv(fileName)
+		if self.__cutDf is not None:
+			raise RuntimeError("Can't mix CSV files and CutStore files in the same NodeCut")
+		df=df.copy()
 		# Remove the gate column
 		# df=df.drop(['gate'], axis=1)
 		df[NodeCut.lCktId] = cktId
@@ -146,7 +175,36 @@ class NodeCut():
 		if self.__df is None:
 			self.__df = df
 		else:
-			self.__df = self.__df.append(df, ignore_index=True)
+			self.__df = pd.concat([self.__df, df], ignore_index=True)
+
+	## Reads a CutStore file
+	#
+	# Only the (row, label) table is added to the data set. The feature table of
+	# the circuit is kept apart and joined to the selected rows when features
+	# are collected. After reading in the store, labels are normalized.
+	#
+	# \param self
+	# \param fileName is a string defining the name of npz file to read
+	# \param cktId defines the id of the circuit being read
+	def readStore(self, fileName, cktId):
+		if self.__lock:
+			raise RuntimeError("Can't read new CutStore file to NodeCut that was already locked by the \"prepare\" method")
+		if self.__df is not None and self.__cutDf is None:
+			raise RuntimeError("Can't mix CSV files and CutStore files in the same NodeCut")
+		store=CutStore.load(fileName)
+		if self.__cutDf is None:
+			self.__cutDf = {cktId : store.featureDf()}
+		else:
+			self.__cutDf[cktId] = store.featureDf()
+		df=store.labelDf()[[NodeCut.lStoreRow, NodeCut.lCutDelay]]
+		df[NodeCut.lCktId] = cktId
+		# Normalize labels
+		if (self.train):
+			df[[NodeCut.lCutDelay]]=(df[[NodeCut.lCutDelay]]-df[[NodeCut.lCutDelay]].min())/(df[[NodeCut.lCutDelay]].max()-df[[NodeCut.lCutDelay]].min())
+		if self.__df is None:
+			self.__df = df
+		else:
+			self.__df = pd.concat([self.__df, df], ignore_index=True)
 
 	## Reads a CSV file with Node Embedding
 	#
@@ -307,6 +365,26 @@ class NodeCut():
 
 		self.__lock=True
 
+	## Joins feature tables to a data frame of CutStore rows
+	#
+	# Private method that returns df unchanged if data was read from CSV files.
+	#
+	# \param self
+	# \param df is a Pandas Dataframe with CutStore rows and labels
+	# \return Pandas Dataframe with features and labels
+	def __joinFeatures(self, df):
+		if self.__cutDf is None:
+			return df
+		joinedList=[]
+		for cktId, cktDf in df.groupby(NodeCut.lCktId, sort=False):
+			featDf=self.__cutDf[cktId].iloc[cktDf[NodeCut.lStoreRow].to_numpy(dtype=np.int64)].reset_index(drop=True)
+			featDf[NodeCut.lCktId]=cktId
+			featDf[NodeCut.lCutDelay]=cktDf[NodeCut.lCutDelay].to_numpy()
+			joinedList.append(featDf)
+		if len(joinedList)==0:
+			return pd.DataFrame(columns=CutStore.featureColumns+[NodeCut.lCktId, NodeCut.lCutDelay])
+		return pd.concat(joinedList, ignore_index=True)
+
 	## Returns a tuple of Features and Labels
 	#
 	# Private method that creates features from a data frame and defines class
@@ -317,6 +395,7 @@ class NodeCut():
 	# \param nodeEmbedDict is a dictionary with DFs of node embeddings
 	# \return tuple with list of features, list of labels, list of Node IDs and list of cut IDs
 	def __getFeatureLabelTuple(self, df, nodeEmbedDict):
+		df=self.__joinFeatures(df)
 		if self.train:
 			featureDF = df[[NodeCut.lCktId,NodeCut.lNodeId,NodeCut.lNumFanout,NodeCut.lNodeLevel,NodeCut.lNodeHasInversion,NodeCut.lChild1HasInversion,NodeCut.lChild1Level,NodeCut.lChild1Fo,NodeCut.lChild2HasInversion,NodeCut.lChild2Level,NodeCut.lChild2Fo,NodeCut.lCutTruthTable,NodeCut.lCutIsInverted,NodeCut.lCutNumLeaves,NodeCut.lCutVolume,NodeCut.lCutMinLvl,NodeCut.lCutMaxLvl,NodeCut.lCutLvl,NodeCut.lCutMinFo,NodeCut.lCutMaxFo,NodeCut.lCutFo,NodeCut.lCutIdx,NodeCut.l1id,NodeCut.l2id,NodeCut.l3id,NodeCut.l4id,NodeCut.l5id,NodeCut.lNodeRelativeLvl,NodeCut.lCutDelay]]
 		else:
@@ -422,30 +501,50 @@ class NodeCut():
 			raise RuntimeError("Object must first be prepared")
 		return self.__getFeatureLabelTuple(self.__df[self.__df[NodeCut.lDataType]==NodeCut.lDataTypeVal], self.__nodeEmbedDf)
 
-	## Plots correlation between available features and labels
+	## Yields batches of Features and Labels
+	#
+	# Features are only built (and joined to CutStore tables) for one batch at a
+	# time, so that the full feature array never needs to be held in memory.
 	#
 	# \param self
-	def plotTrainCorr(self):
-		# Bins labels (values are always between 0 and 1)
-		classBins=np.linspace(0, 1, self.__numClasses+1)
-		for featLabel in [NodeCut.lNumFanout, NodeCut.lNodeLevel, NodeCut.lNodeHasInversion, NodeCut.lChild1HasInversion, NodeCut.lChild1Level, NodeCut.lChild2HasInversion, NodeCut.lChild2Level, NodeCut.lCutIsInverted, NodeCut.lCutNumLeaves, NodeCut.lCutVolume, NodeCut.lCutMinLvl, NodeCut.lCutMaxLvl, NodeCut.lCutLvl, NodeCut.lCutMinFo, NodeCut.lCutMaxFo, NodeCut.lCutFo]:
-			# Collect binned data for NumFanout and generate yList to plot for each label class
-			xList=[]
-			yList=[]
-			sizeList=[]
-			for classIdx in range(self.__numClasses):
-				# Include 1 for last iteration
-				if classIdx+1==1:
-					df=self.__df[(self.__df[NodeCut.lDataType]==NodeCut.lDataTypeTrain) & (self.__df[NodeCut.lCutDelay]>=classBins[classIdx]) & (self.__df[NodeCut.lCutDelay]<=classBins[classIdx+1])]
-				else:
-					df=self.__df[(self.__df[NodeCut.lDataType]==NodeCut.lDataTypeTrain) & (self.__df[NodeCut.lCutDelay]>=classBins[classIdx]) & (self.__df[NodeCut.lCutDelay]<classBins[classIdx+1])]
-				df=df[featLabel].astype(float)
-				dfCut, binLabelList=pd.qcut(df,duplicates="drop",q=10,retbins=True)
-				binLabelList=binLabelList[1:]
-				binSizeList=dfCut.value_counts().tolist()
-				for binLabel, binSize in zip(binLabelList,binSizeList):
-					xList.append(classIdx)
-					yList.append(binLabel)
-					sizeList.append(binSize)
-			fig = px.scatter(x=xList,y=yList,size=sizeList,title="%s (y) vs CutDelay (x)" % featLabel)
-			fig.show()
+	# \param dataType is the data type label of points to use (lDataTypeTrain or lDataTypeVal)
+	# \param batchSize is int defining the number of data points per batch
+	# \return generator of tuples with Numpy array of reshaped features and Numpy array of labels
+	def getFeatureLabelBatches(self, dataType, batchSize):
+		if not self.__lock:
+			raise RuntimeError("Object must first be prepared")
+		df=self.__df[self.__df[NodeCut.lDataType]==dataType]
+		for start in range(0, len(df.index), batchSize):
+			featureList, labelList, idList, cutIdList = self.__getFeatureLabelTuple(df.iloc[start:start+batchSize], self.__nodeEmbedDf)
+			yield self.reshapeFeature(np.array(featureList)), np.array(labelList)
+
+	## Writes a profile of features per label class
+	#
+	# Histograms and quantiles of every feature for every class are computed
+	# in one pass over chunks of rows (see DataProfile.py) and written as
+	# reportPrefix.json and as a static reportPrefix.html page.
+	#
+	# \param self
+	# \param reportPrefix is a string with name of files to write, without extension
+	# \param dataType is optional string with type of rows to profile, None profiles all rows
+	# \param sampleFraction is optional float with fraction of rows sampled, 1 profiles all rows
+	# \param chunkSize is optional int with number of rows profiled at a time
+	# \param seed is optional int with seed of sampling
+	# \return DataProfile object
+	def profile(self, reportPrefix, dataType=lDataTypeTrain, sampleFraction=1.0, chunkSize=1000000, seed=0):
+		if dataType is not None and not self.__lock:
+			raise RuntimeError("Object must first be prepared to profile %s rows" % dataType)
+		df=self.__df if dataType is None else self.__df[self.__df[NodeCut.lDataType]==dataType]
+		numRows=len(df.index)
+		if sampleFraction < 1.0:
+			df=df.sample(frac=sampleFraction, random_state=seed)
+		dp=DataProfile(NodeCut.profileFeatures, self.__numClasses)
+		dp.setInfo("dataType", "all" if dataType is None else dataType)
+		dp.setInfo("totalRows", numRows)
+		dp.setInfo("sampleFraction", sampleFraction)
+		for start in range(0, len(df.index), chunkSize):
+			chunkDf=self.__joinFeatures(df.iloc[start:start+chunkSize])
+			dp.add(chunkDf, chunkDf[NodeCut.lCutDelay])
+		dp.writeJSON(reportPrefix + ".json")
+		dp.writeHTML(reportPrefix + ".html")
+		return dp
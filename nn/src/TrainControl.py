@@ -0,0 +1,175 @@
+## \file TrainControl.py
+#  \brief Keras callback controlling long training runs.
+#
+# TrainControl adds to a fit call:
+# * best weights on a monitored metric (val_loss by default), kept at
+#   checkPointPath and restored when training ends, with optional early
+#   stopping when the metric does not improve
+# * a wall-clock budget: training stops before an epoch that would exceed it
+# * resumable state: after every epoch the full model (including optimizer
+#   state) is saved to <checkPointPath>.state.keras and the control state to
+#   <checkPointPath>.state.json
+# * a per-epoch CSV log with training throughput (samples/s, validation time
+#   excluded) at <checkPointPath>.log.csv
+#
+# To use it:
+# * control=TrainControl(checkPointPath, numSamples, patience=5, maxMinutes=120)
+# * model=control.loadModel(resume=True) or cnn.model
+# * model.fit(..., initial_epoch=control.initialEpoch, callbacks=[control])
+#
+
+import os
+import json
+import time
+import tensorflow as tf
+
+class TrainControl(tf.keras.callbacks.Callback):
+
+	## Constructor
+	#
+	# \param self
+	# \param checkPointPath is a string with path where best weights are saved
+	# \param numSamples is int with number of training samples per epoch
+	# \param patience is int with number of epochs without improvement before stopping, 0 disables early stopping
+	# \param maxMinutes is float with wall-clock budget in minutes, 0 disables the budget
+	# \param monitor is a string with the metric used for early stopping
+	# \param minDelta is float with minimum change of monitored metric counted as improvement
+	def __init__(self, checkPointPath, numSamples, patience=0, maxMinutes=0, monitor="val_loss", minDelta=0):
+		super(TrainControl, self).__init__()
+		self.__checkPointPath=checkPointPath
+		self.__numSamples=numSamples
+		self.__patience=patience
+		self.__maxSeconds=maxMinutes*60
+		self.__monitor=monitor
+		self.__minDelta=minDelta
+		self.__statePath=checkPointPath+".state"
+		self.__logPath=checkPointPath+".log.csv"
+		# Control state, saved after every epoch
+		self.__state={"epoch" : 0, "best" : None, "wait" : 0, "elapsed" : 0.0}
+		self.__epochStart=0
+		self.__testStart=None
+		self.__runStart=0
+		self.__elapsedStart=0
+		self.__lastEpochTime=0
+		self.__stopReason=None
+
+	## Access the epoch to start from
+	#
+	# \param self
+	# \return int with number of epochs already done
+	@property
+	def initialEpoch(self):
+		return self.__state["epoch"]
+
+	## Access the reason training was stopped
+	#
+	# \param self
+	# \return string with stop reason or None if all epochs were run
+	@property
+	def stopReason(self):
+		return self.__stopReason
+
+	## Loads saved training state
+	#
+	# \param self
+	# \param resume is bool defining if saved state must be used
+	# \return compiled model with optimizer state, or None if there is nothing to resume
+	def loadModel(self, resume=True):
+		if not resume or not os.path.exists(self.__statePath+".json"):
+			return None
+		with open(self.__statePath+".json", "r") as f:
+			self.__state=json.load(f)
+		print("  Resuming training from epoch %d" % self.__state["epoch"])
+		return tf.keras.models.load_model(self.__statePath+".keras")
+
+	## Checks if monitored value improved
+	#
+	# \param self
+	# \param value is the monitored value of last epoch
+	# \return bool
+	def __improved(self, value):
+		if self.__state["best"] is None:
+			return True
+		if "acc" in self.__monitor:
+			return value > self.__state["best"]+self.__minDelta
+		return value < self.__state["best"]-self.__minDelta
+
+	## Starts the wall-clock budget and the log
+	#
+	# \param self
+	# \param logs is a dictionary with metrics, unused
+	def on_train_begin(self, logs=None):
+		self.__runStart=time.time()
+		self.__elapsedStart=self.__state["elapsed"]
+		if not os.path.exists(self.__logPath):
+			with open(self.__logPath, "w") as f:
+				f.write("epoch,seconds,samples_per_sec,loss,val_loss,accuracy,val_accuracy\n")
+
+	## Starts timing of an epoch
+	#
+	# \param self
+	# \param epoch is int with index of the epoch
+	# \param logs is a dictionary with metrics, unused
+	def on_epoch_begin(self, epoch, logs=None):
+		self.__epochStart=time.time()
+		self.__testStart=None
+
+	## Records the end of the training part of an epoch
+	#
+	# Keras validates at the end of each epoch, inside the epoch callbacks, so
+	# the training time is taken up to the first validation of the epoch.
+	#
+	# \param self
+	# \param logs is a dictionary with metrics, unused
+	def on_test_begin(self, logs=None):
+		if self.__testStart is None:
+			self.__testStart=time.time()
+
+	## Logs the epoch, keeps best weights, checks the budget and saves state
+	#
+	# \param self
+	# \param epoch is int with index of the epoch
+	# \param logs is a dictionary with metrics of the epoch
+	def on_epoch_end(self, epoch, logs=None):
+		logs=logs or {}
+		epochEnd=time.time()
+		self.__lastEpochTime=epochEnd-self.__epochStart
+		trainTime=(self.__testStart if self.__testStart is not None else epochEnd)-self.__epochStart
+		self.__state["epoch"]=epoch+1
+		self.__state["elapsed"]=self.__elapsedStart+time.time()-self.__runStart
+		# Log throughput, accuracy key changed name between TF versions
+		with open(self.__logPath, "a") as f:
+			f.write("%d,%f,%f,%s,%s,%s,%s\n" % (epoch+1, self.__lastEpochTime, self.__numSamples/max(trainTime, 1e-9),
+			        logs.get("loss"), logs.get("val_loss"), logs.get("accuracy", logs.get("acc")), logs.get("val_accuracy", logs.get("val_acc"))))
+		# Keep best weights, or last ones if metric is not reported
+		value=logs.get(self.__monitor)
+		if value is None:
+			self.model.save_weights(self.__checkPointPath)
+		elif self.__improved(value):
+			self.__state["best"]=float(value)
+			self.__state["wait"]=0
+			self.model.save_weights(self.__checkPointPath)
+		else:
+			self.__state["wait"]+=1
+			if self.__patience > 0 and self.__state["wait"] >= self.__patience:
+				self.__stopReason="no %s improvement in %d epochs" % (self.__monitor, self.__patience)
+				self.model.stop_training=True
+		# Check time budget, stopping if next epoch would not fit
+		if self.__maxSeconds > 0 and self.__state["elapsed"]+self.__lastEpochTime > self.__maxSeconds:
+			self.__stopReason="time budget of %.1f minutes" % (self.__maxSeconds/60)
+			self.model.stop_training=True
+		# Save resumable state
+		self.model.save(self.__statePath+".keras")
+		with open(self.__statePath+".json", "w") as f:
+			json.dump(self.__state, f)
+
+	## Reports why training stopped and restores best weights
+	#
+	# \param self
+	# \param logs is a dictionary with metrics, unused
+	def on_train_end(self, logs=None):
+		if self.__stopReason is not None:
+			print("  Training stopped at epoch %d: %s" % (self.__state["epoch"], self.__stopReason))
+		# Restore best weights
+		if self.__state["best"] is not None and (os.path.exists(self.__checkPointPath+".index") or os.path.exists(self.__checkPointPath)):
+			self.model.load_weights(self.__checkPointPath)
@@ -20,6 +20,8 @@ for argIdx in range(3,len(sys.argv)):
 	print("    Reading %s of cktId %d" % (sys.argv[argIdx], cktId))
 	if argIdx % 2 != 0:
 		nc.readEmbed(sys.argv[argIdx], cktId)
+	elif sys.argv[argIdx].endswith(".npz"):
+		nc.readStore(sys.argv[argIdx], cktId)
 	else:
 		nc.readCSV(sys.argv[argIdx], cktId)
 ################################################################################
@@ -11,6 +11,9 @@ nodeCutPklFile=str(sys.argv[2])
 trainingPoints=int(sys.argv[3])
 validationPoints=int(sys.argv[4])
 dataPklFile=str(sys.argv[5])
+# Optional profile of training data, written as profilePrefix.json/.html
+profilePrefix=str(sys.argv[6]) if len(sys.argv) > 6 else ""
+profileSample=float(sys.argv[7]) if len(sys.argv) > 7 else 1.0
 print("################################################################################")
 print("Starting data generation with following variables:")
 print("  numClasses       = %s" % numClasses)
@@ -18,6 +21,8 @@ print("  nodeCutPklFile   = %s" % nodeCutPklFile)
 print("  trainingPoints   = %s" % str(trainingPoints))
 print("  validationPoints = %s" % str(validationPoints))
 print("  dataPklFile      = %s" % dataPklFile)
+print("  profilePrefix    = %s" % profilePrefix)
+print("  profileSample    = %s" % str(profileSample))
 ################################################################################
 # Loads NodeCut
 print("  Loading NodeCut from %s " % nodeCutPklFile)
@@ -33,9 +38,11 @@ nc.prepare(numTrainPoints=trainingPoints, numValPoints=validationPoints, balance
 # print(tabulate(nc.nodeEmbedDf, headers='keys', tablefmt='psql'))
 
 ################################################################################
-# Plot data correlation
-# print("  Plotting training data classes correlation")
-# nc.plotTrainCorr()
+# Profile training data classes
+if profilePrefix != "":
+	print("  Profiling training data to %s.html" % profilePrefix)
+	dp = nc.profile(profilePrefix, sampleFraction=profileSample)
+	print("    Profiled %d rows" % dp.numRows)
 
 ################################################################################
 # Prepare training data
@@ -0,0 +1,30 @@
+import sys
+import os
+import json
+sys.path.append(os.path.abspath("../src"))
+from CNN import CNN
+################################################################################
+## Configs
+# Exports trained weights to be read by "ml_map -w weightFile" in ABC, which
+# scores cuts in memory instead of running steps 3 to 5 and read_cuts.
+numClasses=int(sys.argv[1])
+checkPointPath=str(sys.argv[2])
+weightFile=str(sys.argv[3])
+configFile=str(sys.argv[4]) if len(sys.argv) > 4 else ""
+print("################################################################################")
+print("Starting CNN export with following variables:")
+print("  numClasses     = %s" % str(numClasses))
+print("  checkPointPath = %s" % checkPointPath)
+print("  weightFile     = %s" % weightFile)
+print("  configFile     = %s" % configFile)
+################################################################################
+# Reloads neural network, the config must match the one used for training
+config = None
+if configFile != "":
+	with open(configFile, 'r') as f:
+		config = json.load(f)
+print("  Reloading Neural Network")
+cnn = CNN(featureShape=[15,10,1], numClasses=numClasses, config=config)
+cnn.model.load_weights(checkPointPath)
+print("  Exporting weights to %s" % weightFile)
+cnn.exportWeights(weightFile)
@@ -6,17 +6,27 @@ import tensorflow as tf
 import plotly.graph_objects as go
 sys.path.append(os.path.abspath("../src"))
 from CNN import CNN
+from TrainControl import TrainControl
 ################################################################################
 ## Configs
 dataPklFile=str(sys.argv[1])
 epochs=int(sys.argv[2])
 checkPointPath=str(sys.argv[3])
+# Optional: epochs without val_loss improvement before stopping (0 disables)
+patience=int(sys.argv[4]) if len(sys.argv) > 4 else 0
+# Optional: wall-clock budget in minutes (0 disables)
+maxMinutes=float(sys.argv[5]) if len(sys.argv) > 5 else 0
+# Optional: 1 resumes from state saved next to checkPointPath
+resume=int(sys.argv[6]) if len(sys.argv) > 6 else 0
 #optThreshold=int(sys.argv[4])
 print("################################################################################")
 print("Starting CNN generation with following variables:")
 print("  dataPklFile    = %s" % dataPklFile)
 print("  epochs         = %s" % str(epochs))
 print("  checkPointPath = %s" % checkPointPath)
+print("  patience       = %s" % str(patience))
+print("  maxMinutes     = %s" % str(maxMinutes))
+print("  resume         = %s" % str(resume))
 #print("  optThreshold   = %s" % str(optThreshold))
 ################################################################################
 # Loads data
@@ -46,8 +56,13 @@ print("    Validation classes are (%d): %s" % (len(list(valLabelNPArray)), str(o
 print("  Creating Neural Network")
 # Create CNN
 cnn = CNN(featureShape=featureShape, numClasses=numClasses)
+# Training control, reloads model with optimizer state when resuming
+control = TrainControl(checkPointPath, len(trainLabelNPArray), patience=patience, maxMinutes=maxMinutes)
+model = control.loadModel(resume=resume)
+if model is None:
+    model = cnn.model
 # Print summary
-cnn.model.summary()
+model.summary()
 ################################################################################
 # Train neural network
 print("  Training Neural Network")
@@ -57,18 +72,16 @@ for trainFeatureNP in trainFeatureNPArray:
 # print(len(trainFeatureNPArray))
 # print(trainFeatureNPArray[0])
 # print(trainLabelNPArray[0])
-# Checkpoint callback
-checkPointCallBack = tf.keras.callbacks.ModelCheckpoint(filepath=checkPointPath,
-                                                        save_weights_only=True,
-                                                        verbose=1)
-history = cnn.model.fit(trainFeatureNPArray,trainLabelNPArray,
-                        epochs=epochs, verbose=2,
-                        validation_data=(valFeatureNPArray,valLabelNPArray),
-                        callbacks=[checkPointCallBack])
+# Checkpoint, early stopping, time budget and throughput log callback
+history = model.fit(trainFeatureNPArray,trainLabelNPArray,
+                    epochs=epochs, verbose=2,
+                    initial_epoch=control.initialEpoch,
+                    validation_data=(valFeatureNPArray,valLabelNPArray),
+                    callbacks=[control])
 # Plot training info
-lossListY = history.history["loss"]
+lossListY = history.history.get("loss", [])
 lossListX = list(range(len(lossListY)))
-valLossListY = history.history["val_loss"]
+valLossListY = history.history.get("val_loss", [])
 valLossListX = list(range(len(valLossListY)))
 # fig0 = go.Figure(data=[go.Scatter(x=lossListX,y=lossListY,name="Training Loss"),
 #                        go.Scatter(x=valLossListX,y=valLossListY,name="Validation Loss")])
@@ -0,0 +1,50 @@
+import sys
+import os
+import json
+import pickle
+sys.path.append(os.path.abspath("../src"))
+from CNNSweep import CNNSweep
+################################################################################
+# Workers are spawned processes that re-import this file, so everything runs
+# under the main guard
+if __name__ == "__main__":
+	############################################################################
+	## Configs
+	dataPklFile=str(sys.argv[1])
+	epochs=int(sys.argv[2])
+	sweepConfigFile=str(sys.argv[3])
+	resultFile=str(sys.argv[4])
+	numWorkers=int(sys.argv[5]) if len(sys.argv) > 5 else 1
+	numThreads=int(sys.argv[6]) if len(sys.argv) > 6 else 1
+	print("################################################################################")
+	print("Starting CNN sweep with following variables:")
+	print("  dataPklFile     = %s" % dataPklFile)
+	print("  epochs          = %s" % str(epochs))
+	print("  sweepConfigFile = %s" % sweepConfigFile)
+	print("  resultFile      = %s" % resultFile)
+	print("  numWorkers      = %s" % str(numWorkers))
+	print("  numThreads      = %s" % str(numThreads))
+	############################################################################
+	# Loads sweep configs, a JSON list of CNN configs
+	with open(sweepConfigFile, 'r') as f:
+		configList = json.load(f)
+	print("  Read %d configs" % len(configList))
+	############################################################################
+	# Writes data once, shared by all workers through memory mapping, and again
+	# whenever the data pkl file was regenerated
+	dataDir = os.path.splitext(dataPklFile)[0] + "_sweep"
+	dataSource = CNNSweep.dataSource(dataPklFile)
+	if not CNNSweep.isPrepared(dataDir, dataSource):
+		print("  Writing shared data to %s" % dataDir)
+		with open(dataPklFile, 'rb') as f:
+			dataDict = pickle.load(f)
+		CNNSweep.prepareData(dataDict, dataDir, dataSource)
+		del dataDict
+	############################################################################
+	# Runs sweep
+	print("  Training configs")
+	sweep = CNNSweep(dataDir, epochs, numWorkers=numWorkers, numThreads=numThreads)
+	resultDf = sweep.run(configList)
+	print(resultDf.drop(columns=["config"]).to_string(index=False))
+	print("  Saving results to %s" % resultFile)
+	resultDf.to_csv(resultFile, index=False)
@@ -4,6 +4,7 @@ import pickle
 import tensorflow as tf
 sys.path.append(os.path.abspath("../src"))
 from CNN import CNN
+from CutSelect import CutSelect
 
 tf.enable_eager_execution()
 ################################################################################
@@ -56,38 +57,9 @@ inferenceList = list(tf.argmax(inferences, 1).numpy())
 # print(infCutIdList)
 
 print("File name: " + infFile)
-f = open(infFile, "w")
-nodeDict = {}
-used = 0
-notUsed = 0
-for infId, infCutId, infClass in zip(infIdList, infCutIdList, inferenceList):
-	if infClass <= 3:
-		used = used + 1
-		if infId in nodeDict:
-			nodeDict[infId].append(infCutId)
-		else:
-			nodeDict[infId] = [infCutId]
-	#notUsed = notUsed + 1
-	elif infId not in nodeDict and infClass <= 6:
-		used = used + 1
-		if infId in nodeDict:
-		 	nodeDict[infId].append(infCutId)
-		else:
-			nodeDict[infId] = [infCutId]
-			continue
-	
-	elif infId in nodeDict and len(nodeDict[infId]) == 1 and infClass <= 6:
-		used = used + 1
-		nodeDict[infId].append(infCutId)
-	notUsed = notUsed + 1 
+nodeDict, used, notUsed = CutSelect.select(infIdList, infCutIdList, inferenceList)
 print("Used " + str(used) + " cuts; total " + str(notUsed) + " cuts")
-for key in nodeDict:
-	nodeId = str(key)
-	for element in nodeDict[key]:
-		nodeId += ", " + str(element)
-	nodeId += "\n"
-	f.write("%s" % nodeId)
-f.close()
+CutSelect.write(nodeDict, infFile)
 #optThreshold = 6
 #rightInf = 0
 #totalInf = 0
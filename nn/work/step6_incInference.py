@@ -0,0 +1,63 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath("../src"))
+from NodeCut import NodeCut
+from CNN import CNN
+from CutSelect import CutSelect
+from InferenceCache import InferenceCache
+################################################################################
+## Configs
+# Replaces steps 3 to 5 after an ECO: only nodes whose signature, levels or
+# cuts (structural cut features and leaf signatures) changed since the run
+# stored in cachePklFile are featurized and inferred, classes of all other
+# cuts are taken from the cache.
+numClasses=int(sys.argv[1])
+embedFile=str(sys.argv[2])
+featFile=str(sys.argv[3])
+checkPointPath=str(sys.argv[4])
+cachePklFile=str(sys.argv[5])
+print("################################################################################")
+print("Starting incremental inference with following variables:")
+print("  numClasses     = %s" % str(numClasses))
+print("  embedFile      = %s" % embedFile)
+print("  featFile       = %s" % featFile)
+print("  checkPointPath = %s" % checkPointPath)
+print("  cachePklFile   = %s" % cachePklFile)
+################################################################################
+# Splits cuts into reused and changed nodes
+cktName = os.path.basename(featFile).split("_")
+infFile = cktName[0] + "_inf.txt"
+featDf = pd.read_csv(featFile)
+embedDf = pd.read_csv(embedFile)
+print("  Loading cache from %s " % cachePklFile)
+cache = InferenceCache.load(cachePklFile)
+reuseDf, changedDf = cache.split(featDf, embedDf)
+print("  Reusing %d cuts of %d nodes" % (len(reuseDf.index), reuseDf[NodeCut.lNodeId].nunique()))
+print("  Inferring %d cuts of %d changed nodes" % (len(changedDf.index), changedDf[NodeCut.lNodeId].nunique()))
+classSeries = pd.Series(-1, index=featDf.index, dtype=np.int64)
+classSeries[reuseDf.index] = reuseDf[InferenceCache.lClass]
+################################################################################
+# Featurizes and infers changed nodes only
+if len(changedDf.index) > 0:
+	nc=NodeCut(numClasses=numClasses, train=False)
+	nc.readEmbed(embedFile, 0)
+	nc.readDf(changedDf, 0)
+	nc.prepare(numTrainPoints=0, balanced=False)
+	featureList, labelList, idList, cutIdList = nc.getValFeatureLabelTuple()
+	infFeatureNPArray = nc.reshapeFeature(np.array(featureList))
+	print("  Reloading Neural Network")
+	cnn = CNN(featureShape=nc.getFeatureShape(), numClasses=numClasses)
+	cnn.model.load_weights(checkPointPath)
+	print("  Making inferences")
+	inferences = cnn.model.predict(infFeatureNPArray)
+	classSeries[changedDf.index] = np.argmax(inferences, 1)
+################################################################################
+# Selects cuts and saves cache for the next run
+print("File name: " + infFile)
+nodeDict, used, notUsed = CutSelect.select(featDf[NodeCut.lNodeId].tolist(), featDf[NodeCut.lCutIdx].tolist(), classSeries.tolist())
+print("Used " + str(used) + " cuts; total " + str(notUsed) + " cuts")
+CutSelect.write(nodeDict, infFile)
+print("  Saving cache to %s" % cachePklFile)
+InferenceCache.fromRun(featDf, embedDf, classSeries.tolist()).save(cachePklFile)